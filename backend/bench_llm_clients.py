@@ -0,0 +1,53 @@
+"""
+Benchmark: per-request LLM client setup overhead.
+
+Compares building a new ChatGoogleGenerativeAI client on every request (what the
+keyword, SERP-insight and blog-optimizer endpoints used to do) with borrowing
+the shared client from the LLM client registry. No network calls are made.
+
+Usage:
+    GEMINI_API_KEY=... python bench_llm_clients.py [requests]
+"""
+
+import sys
+import time
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from config import settings
+from utils.llm_clients import get_llm_client_registry
+
+
+def legacy_request() -> None:
+    """One request's worth of client setup before the registry"""
+    ChatGoogleGenerativeAI(
+        model=settings.gemini_model,
+        google_api_key=settings.gemini_api_key,
+        temperature=0.3,
+    )
+
+
+def shared_request() -> None:
+    """One request's worth of client setup with the registry"""
+    get_llm_client_registry().chat_model(temperature=0.3)
+
+
+def per_request_ms(func, requests: int) -> float:
+    """Mean wall-clock milliseconds per call, after one warm-up call"""
+    func()
+    start = time.perf_counter()
+    for _ in range(requests):
+        func()
+    return (time.perf_counter() - start) * 1000 / requests
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    before = per_request_ms(legacy_request, requests)
+    after = per_request_ms(shared_request, requests)
+
+    print(f"Requests: {requests}")
+    print(f"Before (new client per request): {before:.2f} ms/request")
+    print(f"After  (shared client registry): {after * 1000:.1f} us/request")
+    print(f"Overhead removed: {before - after:.2f} ms/request")
@@ -0,0 +1,90 @@
+"""
+Benchmark: per-page CPU of technical audit HTML extraction.
+
+Compares the previous approach (BeautifulSoup tree + one find/find_all scan per
+check) with the single-pass PageIndex used by TechnicalSEOService.
+
+Usage:
+    python bench_technical_audit.py [page_size_mb]
+"""
+
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from services.page_index import build_page_index
+
+
+def make_page(target_mb: float) -> str:
+    """Build a synthetic e-commerce listing page of roughly target_mb megabytes"""
+    head = """<html lang="en"><head><title>Shop - Product Listing</title>
+    <meta charset="utf-8"><meta name="description" content="Great products">
+    <meta name="viewport" content="width=device-width"><meta property="og:title" content="Shop">
+    <meta name="twitter:card" content="summary"><link rel="canonical" href="https://shop.example/list">
+    <style>.a{color:red}@media (max-width:600px){.a{color:blue}}</style>
+    <script type="application/ld+json">{"@type": "ItemList"}</script></head><body><h1>Products</h1>"""
+    card = """<div class="card" itemscope><h2>Product {i}</h2><h3>Details</h3>
+    <a href="/product/{i}"><img src="https://cdn.example/img/{i}.jpg" alt="Product {i}" width="300" height="300"></a>
+    <p>Lorem ipsum dolor sit amet, consectetur adipiscing elit. Sed do eiusmod tempor incididunt ut labore.</p>
+    <a href="http://legacy.example/p/{i}">Legacy link</a><span class="price">$ {i}.99</span></div>"""
+    parts = [head]
+    size = len(head)
+    i = 0
+    while size < target_mb * 1024 * 1024:
+        chunk = card.format(i=i)
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def legacy_extract(html: str):
+    """The per-check scans the audit used to run against a BeautifulSoup tree"""
+    soup = BeautifulSoup(html, "lxml")
+    soup.find("title")
+    soup.find("meta", attrs={"name": "description"})
+    for level in range(1, 7):
+        [t.get_text(strip=True) for t in soup.find_all(f"h{level}")]
+    [(i.get("alt"), i.parent.name) for i in soup.find_all("img")]
+    soup.find("link", attrs={"rel": "canonical"})
+    soup.find("meta", attrs={"name": "robots"})
+    soup.find_all("meta", property=lambda x: x and x.startswith("og:"))
+    soup.find_all("meta", attrs={"name": lambda x: x and x.startswith("twitter:")})
+    [a.get_text(strip=True) for a in soup.find_all("a", href=True)]
+    soup.find_all("img")
+    soup.find_all("script", type="application/ld+json")
+    soup.find_all(attrs={"itemscope": True})
+    soup.find_all(attrs={"typeof": True})
+    soup.find_all(src=lambda x: x and x.startswith("http://"))
+    soup.find_all(href=lambda x: x and x.startswith("http://"))
+    soup.find("meta", attrs={"name": "viewport"})
+    soup.find_all("style")
+    soup.find("meta", charset=True)
+    soup.find("meta", attrs={"name": "viewport"})
+    soup.find("html")
+    soup.find_all("link", attrs={"rel": "alternate"})
+
+
+def cpu_time(func, html: str, rounds: int = 3) -> float:
+    """Best-of-N process CPU seconds for func(html)"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.process_time()
+        func(html)
+        best = min(best, time.process_time() - start)
+    return best
+
+
+if __name__ == "__main__":
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    html = make_page(size_mb)
+    print(f"Page size: {len(html) / 1024 / 1024:.2f} MB")
+
+    before = cpu_time(legacy_extract, html)
+    after = cpu_time(build_page_index, html)
+
+    print(f"Before (BeautifulSoup + per-check scans): {before * 1000:.0f} ms CPU")
+    print(f"After  (single-pass PageIndex):           {after * 1000:.0f} ms CPU")
+    print(f"Speedup: {before / after:.1f}x")
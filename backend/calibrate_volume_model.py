@@ -0,0 +1,92 @@
+"""
+Calibrate the volume estimation model against real Keyword Planner metrics.
+
+Reads metrics either from a CSV export (columns: keyword, search_volume,
+competition_index, cpc) or, without a file argument, from the keyword_metrics
+namespace of the Redis cache that Google Ads enrichment fills. Fits the model,
+reports the fit before and after, and writes data/volume_model.json (or
+VOLUME_MODEL_PATH), which the API loads on startup.
+
+Usage:
+    python calibrate_volume_model.py [metrics.csv]
+"""
+
+import asyncio
+import csv
+import json
+import sys
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from services.volume_estimator import DEFAULT_MODEL_PATH, VolumeEstimator
+from utils.cache import KEY_PREFIX, RedisCache
+
+Row = Tuple[str, float, Optional[float], Optional[float]]
+
+
+def _optional_float(value) -> Optional[float]:
+    return float(value) if value not in (None, "") else None
+
+
+def load_csv(path: str) -> List[Row]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            (
+                row["keyword"].strip().lower(),
+                float(row["search_volume"] or 0),
+                _optional_float(row.get("competition_index")),
+                _optional_float(row.get("cpc")),
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
+async def load_redis() -> List[Row]:
+    if not settings.redis_url:
+        raise SystemExit("No CSV given and REDIS_URL is not set; nothing to calibrate on")
+    cache = RedisCache.from_url(settings.redis_url)
+    prefix = f"{KEY_PREFIX}:keyword_metrics:"
+    rows = []
+    try:
+        async for key in cache.client.scan_iter(match=f"{prefix}*", count=1000):
+            raw = await cache.client.get(key)
+            metrics = json.loads(raw) if raw else {}
+            if not metrics.get("search_volume"):
+                continue
+            # Keys are <country>_<language>_<keyword>
+            keyword = key.decode("utf-8")[len(prefix):].split("_", 2)[-1]
+            rows.append((keyword, float(metrics["search_volume"]), metrics.get("competition_index"), metrics.get("cpc")))
+    finally:
+        await cache.aclose()
+    return rows
+
+
+def log_error(estimator: VolumeEstimator, keywords: List[str], volumes: np.ndarray) -> float:
+    """Mean absolute log10 error (0.3 ~ off by a factor of 2 on average)"""
+    estimates = estimator.estimate(keywords).search_volume
+    return float(np.mean(np.abs(np.log10(estimates) - np.log10(np.maximum(volumes, 10)))))
+
+
+if __name__ == "__main__":
+    rows = load_csv(sys.argv[1]) if len(sys.argv) > 1 else asyncio.run(load_redis())
+    rows = [row for row in rows if row[0] and row[1] > 0]
+    if len(rows) < 50:
+        raise SystemExit(f"Only {len(rows)} keywords with volume data; need at least 50")
+
+    keywords = [row[0] for row in rows]
+    volumes = np.array([row[1] for row in rows])
+
+    estimator = VolumeEstimator()
+    before = log_error(estimator, keywords, volumes)
+    model = estimator.calibrate(keywords, volumes, [row[2] for row in rows], [row[3] for row in rows])
+    after = log_error(estimator, keywords, volumes)
+
+    path = settings.volume_model_path or DEFAULT_MODEL_PATH
+    model.save(path)
+
+    print(f"Keywords: {len(rows)}")
+    print(f"Mean abs log10 error before: {before:.3f}")
+    print(f"Mean abs log10 error after:  {after:.3f}")
+    print(f"Model written to {path}")
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -22,6 +22,7 @@ class Settings(BaseSettings):
     # Keyword Suggestion APIs (choose one or use fallbacks)
     dataforseo_login: Optional[str] = None
     dataforseo_password: Optional[str] = None
+    backlink_store_path: Optional[str] = None  # indexed backlink exports (default: data/backlinks.sqlite3)
     serper_api_key: Optional[str] = None
     
     # Google Ads API (for volume & competition data)
@@ -30,17 +31,85 @@ class Settings(BaseSettings):
     google_ads_client_secret: Optional[str] = None
     google_ads_refresh_token: Optional[str] = None
     google_ads_customer_id: Optional[str] = None
+    google_ads_max_concurrent_requests: int = 4  # Keyword Planner batches in flight (dedicated threads)
+    keyword_metrics_cache_ttl_seconds: int = 2592000  # 30 days; volumes are updated monthly
+    volume_model_path: Optional[str] = None  # calibrated estimation model (default: data/volume_model.json)
+    keyword_warehouse_enabled: bool = True  # keep every fetched keyword + metrics in a local SQLite store
+    keyword_warehouse_path: Optional[str] = None  # default: data/keyword_warehouse.sqlite3
+    keyword_warehouse_ttl_seconds: int = 2592000  # 30 days; older metrics are re-enriched
     
     # SERP APIs (choose one)
     serpapi_key: Optional[str] = None
     valueserpapi_key: Optional[str] = None
     
+    # SERP provider routing (across every configured SERP key)
+    serp_routing_strategy: str = "health"  # priority (serper > serpapi > valueserp) | cost | health
+    serp_provider_costs: Dict[str, float] = {"serper": 0.001, "serpapi": 0.015, "valueserp": 0.0025, "dataforseo": 0.0006}  # USD per request
+    serp_max_cost_per_request: Optional[float] = None  # skip providers above this cost
+    serp_provider_quotas: Dict[str, int] = {}  # requests left per provider; unset = unlimited
+    serp_hedge_requests: bool = True  # send a backup request when the primary exceeds its p95
+    serp_hedge_min_samples: int = 20  # successful requests before a provider's p95 is trusted
+    serp_provider_cooldown_seconds: float = 60.0  # bench a provider after auth/rate-limit errors
+    
+    # Bulk SERP analysis (/serp/analyze/batch)
+    serp_batch_task_min_keywords: int = 50  # use DataForSEO's task queue from this many uncached keywords
+    serp_batch_poll_interval_seconds: float = 5.0  # DataForSEO tasks_ready polling
+    serp_batch_task_timeout_seconds: float = 900.0  # then fetch still-queued keywords live
+    
     # Optional: Redis for caching
     redis_url: Optional[str] = None
     
     # Application Settings
     api_version: str = "v1"
     cache_ttl_seconds: int = 1800  # 30 minutes default
+    cache_max_entries: int = 10000  # In-memory cache size when Redis is not configured
+    cache_max_bytes: int = 268435456  # In-memory cache value budget (256 MB), LRU-evicted
+    
+    # LLM gateway (process-wide limits for every Gemini call)
+    llm_max_in_flight: int = 8  # concurrent LLM requests
+    llm_requests_per_minute: int = 300  # 0 = unlimited
+    llm_tokens_per_minute: int = 1000000  # 0 = unlimited
+    llm_max_attempts: int = 4  # including the first try; 429/5xx/timeouts are retried
+    llm_timeout_seconds: float = 120.0  # per attempt
+    llm_cache_ttl_seconds: int = 86400  # identical prompts reuse the response; 0 = disable
+    
+    # Keyword intent classification
+    intent_classification_concurrency: int = 4  # concurrent LLM calls per request
+    intent_cache_ttl_seconds: int = 604800  # 7 days
+    intent_local_min_confidence: float = 0.85  # local model answers above this probability
+    intent_model_min_samples: int = 50  # LLM labels needed before training the local model
+    
+    # Free autocomplete harvesting (keyword suggestions without DataForSEO/Serper)
+    autocomplete_sources: List[str] = ["google", "duckduckgo", "bing"]
+    autocomplete_concurrency_per_source: int = 10
+    autocomplete_requests_per_second: float = 40.0  # per source, shared by all requests
+    autocomplete_request_timeout_seconds: float = 3.0
+    autocomplete_max_depth: int = 2  # 1 = seed expansions only; 2 = also query each suggestion found
+    autocomplete_max_requests: int = 400  # per harvest, across sources
+    autocomplete_time_budget_seconds: float = 2.5  # per harvest
+    
+    # Shared HTTP connection pool
+    http_max_connections: int = 200
+    http_max_connections_per_host: int = 20
+    http_keepalive_expiry: float = 30.0  # seconds
+    http_dns_cache_ttl: int = 300  # seconds
+    
+    # CPU-bound parsing/audit checks (None = one worker per core, 0 = run inline)
+    process_pool_workers: Optional[int] = None
+    
+    # Broken-link checks (shared across audits)
+    link_check_concurrency_per_host: int = 4
+    link_check_delay_seconds: float = 0.1  # politeness delay per request, per host
+    link_status_cache_ttl_seconds: int = 3600
+    
+    # Image probes for the audit's image checks (per CDN host)
+    image_probe_concurrency_per_host: int = 8
+    image_probe_cache_ttl_seconds: int = 86400
+    
+    # Headless browser pool (screenshots, rendered pages)
+    browser_pool_size: int = 1  # Chromium instances
+    browser_pages_per_browser: int = 4  # max concurrent pages per browser
+    browser_blocked_resource_types: List[str] = ["font", "media"]
     
     def has_google_ads_credentials(self) -> bool:
         """Check if Google Ads API is configured"""
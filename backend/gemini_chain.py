@@ -1,65 +1,57 @@
-import os
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from PIL import Image
 import base64
 import io
 
-# Load variables from .env file
-load_dotenv()
+from utils.llm_clients import get_llm_client_registry
+from utils.llm_gateway import get_llm_gateway
 
-# Access the variables
-GEMINI_MODEL: str | None = os.getenv("GEMINI_MODEL")
-GEMINI_API_KEY: str | None = os.getenv("GEMINI_API_KEY")
+# Content generation runs a little warmer than the analysis prompts
+CONTENT_TEMPERATURE = 0.4
 
-llm = ChatGoogleGenerativeAI(
-    api_key=GEMINI_API_KEY,
-    model=GEMINI_MODEL,   # FREE MODEL
-    temperature=0.4
-)
 
+def _image_part(img: Image.Image) -> Dict[str, str]:
+    """Encode an image as an inline JPEG message part"""
+    buffered = io.BytesIO()
+    if img.mode == 'RGBA':
+        img = img.convert('RGB')
+    img.save(buffered, format="JPEG")
+    img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
 
-def generate_ai_content(prompt: str, images: List[Image.Image]):
-    """Generate AI content for product images"""
+    return {
+        "type": "image_url",
+        "image_url": f"data:image/jpeg;base64,{img_str}"
+    }
+
+
+def _product_content_message(prompt: str, images: List[Image.Image]) -> HumanMessage:
+    """Build the product-image prompt"""
     content = [{"type": "text", "text": prompt}]
 
     for img in images:
-        buffered = io.BytesIO()
-        if img.mode == 'RGBA':
-            img = img.convert('RGB')
-        img.save(buffered, format="JPEG")
-        img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
-        
-        content.append({
-            "type": "image_url",
-            "image_url": f"data:image/jpeg;base64,{img_str}"
-        })
-
-    message = HumanMessage(content=content)
-    response = llm.invoke([message])
+        content.append(_image_part(img))
 
-    return response.content
+    return HumanMessage(content=content)
 
 
-def generate_website_ai_content(
+def _website_content_message(
     user_prompt: Optional[str],
     scraped_data: Dict[str, Any],
     screenshot: Image.Image
-):
-    """Generate AI content for website analysis"""
-    
+) -> HumanMessage:
+    """Build the website-analysis prompt"""
+
     # Build the analysis prompt
     base_prompt = f"""
     You are an SEO expert analyzing a website.
-    
+
     Website Data:
     - Title: {scraped_data.get('title', 'N/A')}
     - Meta Description: {scraped_data.get('meta_description', 'N/A')}
     - Headings: {', '.join(scraped_data.get('headings', [])[:10])}
     - Text Content (first 500 chars): {scraped_data.get('text_content', '')[:500]}
-    
+
     Task:
     - Analyze the website screenshot and scraped data
     - Generate SEO-optimized recommendations
@@ -69,26 +61,59 @@ def generate_website_ai_content(
       meta_description (optimized meta description),
       suggested_keywords (array of relevant keywords),
       content_strategy (recommendations for improvement)
-    
+
     {f"Additional Instructions: {user_prompt}" if user_prompt else ""}
     """
-    
+
     # Prepare content with screenshot
-    content = [{"type": "text", "text": base_prompt}]
-    
-    # Add screenshot
-    buffered = io.BytesIO()
-    if screenshot.mode == 'RGBA':
-        screenshot = screenshot.convert('RGB')
-    screenshot.save(buffered, format="JPEG")
-    img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
-    
-    content.append({
-        "type": "image_url",
-        "image_url": f"data:image/jpeg;base64,{img_str}"
-    })
-    
-    message = HumanMessage(content=content)
-    response = llm.invoke([message])
-    
+    content = [{"type": "text", "text": base_prompt}, _image_part(screenshot)]
+
+    return HumanMessage(content=content)
+
+
+async def generate_ai_content(prompt: str, images: List[Image.Image]):
+    """Generate AI content for product images"""
+    llm = get_llm_client_registry().chat_model(CONTENT_TEMPERATURE)
+    message = _product_content_message(prompt, images)
+    response = await get_llm_gateway().ainvoke(
+        llm, [message], prompt_name="product_image_content", use_cache=False
+    )
+
+    return response.content
+
+
+def stream_ai_content(prompt: str, images: List[Image.Image]) -> AsyncIterator[str]:
+    """Stream AI content for product images as it is generated"""
+    llm = get_llm_client_registry().chat_model(CONTENT_TEMPERATURE)
+    message = _product_content_message(prompt, images)
+    return get_llm_gateway().astream(
+        llm, [message], prompt_name="product_image_content", use_cache=False
+    )
+
+
+async def generate_website_ai_content(
+    user_prompt: Optional[str],
+    scraped_data: Dict[str, Any],
+    screenshot: Image.Image
+):
+    """Generate AI content for website analysis"""
+    llm = get_llm_client_registry().chat_model(CONTENT_TEMPERATURE)
+    message = _website_content_message(user_prompt, scraped_data, screenshot)
+    response = await get_llm_gateway().ainvoke(
+        llm, [message], prompt_name="website_content", use_cache=False
+    )
+
     return response.content
+
+
+def stream_website_ai_content(
+    user_prompt: Optional[str],
+    scraped_data: Dict[str, Any],
+    screenshot: Image.Image
+) -> AsyncIterator[str]:
+    """Stream AI content for website analysis as it is generated"""
+    llm = get_llm_client_registry().chat_model(CONTENT_TEMPERATURE)
+    message = _website_content_message(user_prompt, scraped_data, screenshot)
+    return get_llm_gateway().astream(
+        llm, [message], prompt_name="website_content", use_cache=False
+    )
@@ -0,0 +1,35 @@
+"""
+Ingest backlink exports into the local backlink index.
+
+Without arguments, indexes every new or modified SEMrush JSON export in
+data/backlinks/ (what the API also does on startup). With file arguments,
+indexes those exports, each under the domain named by its file name
+(example.com.json -> example.com), replacing anything stored for that domain.
+The index is written to data/backlinks.sqlite3 (or BACKLINK_STORE_PATH).
+
+Usage:
+    python ingest_backlinks.py [export.json ...]
+"""
+
+import logging
+import sys
+import time
+
+from config import settings
+from services.backlink_store import DEFAULT_EXPORTS_DIR, DEFAULT_STORE_PATH, BacklinkStore
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    path = settings.backlink_store_path or DEFAULT_STORE_PATH
+    files = sys.argv[1:]
+    store = BacklinkStore(path, exports_dir=None)
+
+    start = time.perf_counter()
+    if files:
+        links = sum(store.ingest_file(file) for file in files)
+        print(f"Ingested {links} backlinks from {len(files)} exports")
+    else:
+        count = store.sync_directory(DEFAULT_EXPORTS_DIR)
+        print(f"Ingested {count} new or modified exports from {DEFAULT_EXPORTS_DIR}")
+    store.close()
+    print(f"Index {path} up to date in {time.perf_counter() - start:.1f}s")
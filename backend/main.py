@@ -1,18 +1,39 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from typing import List, Optional
 
 from config import settings
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 
 # Existing imports for content generation
-from gemini_chain import generate_ai_content, generate_website_ai_content
+from gemini_chain import (
+    generate_ai_content,
+    generate_website_ai_content,
+    stream_ai_content,
+    stream_website_ai_content,
+)
 from plagiarism_checker import plagiarism_check
 
 # New imports for keyword research
 from routers import keyword_router, serp_router, technical_seo_router, seo_optimizer_router, competitor_router, backlink_router
+from services.autocomplete_harvester import get_autocomplete_harvester
+from services.backlink_store import get_backlink_store, shutdown_backlink_store
+from services.intent_classifier import get_local_intent_classifier
+from services.keyword_warehouse import get_keyword_warehouse, shutdown_keyword_warehouse
+from services.serp_router import get_serp_provider_router
+from services.volume_competition import shutdown_google_ads_executor
+from utils.browser_pool import get_browser_pool
+from utils.cache import get_cache_manager
+from utils.http_client import get_http_client_registry
 from utils.image_utils import load_image_from_bytes, load_image_from_url
+from utils.llm_clients import get_llm_client_registry
+from utils.llm_gateway import get_llm_gateway
+from utils.process_pool import shutdown_process_pool
 from utils.screenshot_utils import get_website_screenshot
+from utils.single_flight import get_single_flight
+from utils.streaming import STREAM_FORMAT_PATTERN, stream_events
 from utils.web_scraper import scrape_website
 
 # Configure logging
@@ -21,6 +42,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own process-wide resources (pooled HTTP and LLM clients, cache, process pool, browsers) for the app's lifetime"""
+    http_clients = get_http_client_registry()
+    cache_manager = get_cache_manager()
+    browser_pool = get_browser_pool()
+    app.state.http_clients = http_clients
+    app.state.cache = cache_manager
+    app.state.browser_pool = browser_pool
+    logger.info(f"Shared HTTP client registry ready, cache backend: {cache_manager.backend.name}")
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        # Screenshots will retry the launch on first use
+        logger.warning(f"Browser pool not started: {e}")
+    try:
+        ingested = await get_backlink_store().sync()
+        logger.info(f"Backlink store ready ({ingested} exports ingested)")
+    except Exception as e:
+        # Lookups fall back to DataForSEO until the exports can be read
+        logger.warning(f"Backlink exports not synced: {e}")
+    try:
+        yield
+    finally:
+        # Each step runs even if an earlier one fails, so nothing is left open
+        shutdown_steps = [
+            ("browser pool", browser_pool.aclose),
+            ("LLM clients", get_llm_client_registry().aclose),
+            ("HTTP clients", http_clients.aclose),
+            ("cache", cache_manager.aclose),
+            ("process pool", shutdown_process_pool),
+            ("Google Ads executor", shutdown_google_ads_executor),
+            ("keyword warehouse", shutdown_keyword_warehouse),
+            ("backlink store", shutdown_backlink_store),
+        ]
+        for name, close in shutdown_steps:
+            try:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error closing {name}: {e}")
+        logger.info("Shared HTTP/LLM clients, cache, process pool, local stores and browsers closed")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI SEO Suite",
@@ -28,6 +95,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -54,17 +122,10 @@ app.include_router(backlink_router, prefix="/api/v1")
 # ============= Legacy Routes (Backward Compatibility) =============
 
 
-@app.post("/api/v1/generate-product-content")
-@app.post("/generate-content")
-async def generate_product_content(
-    prompt: str = Form(...),
-    images: Optional[List[UploadFile]] = File(None),
-    image_urls: Optional[str] = Form(None),  # comma-separated
-):
-    """
-    Endpoint for AI product content generation.
-    Handles both uploaded images and image URLs.
-    """
+async def _load_product_images(
+    images: Optional[List[UploadFile]], image_urls: Optional[str]
+) -> list:
+    """Collect uploaded images and image URLs (comma-separated) as PIL images"""
     pil_images = []
 
     # Handle uploaded image blobs
@@ -86,8 +147,11 @@ async def generate_product_content(
         raise HTTPException(
             status_code=400, detail="At least one image (file or URL) is required"
         )
+    return pil_images
+
 
-    seo_prompt = f"""
+def _product_seo_prompt(prompt: str) -> str:
+    return f"""
     You are an SEO expert.
 
     Task:
@@ -103,20 +167,66 @@ async def generate_product_content(
     {prompt}
     """
 
-    generated_content = generate_ai_content(seo_prompt, pil_images)
 
+def _plagiarism_summary(generated_content: str) -> dict:
     plagiarism_result = plagiarism_check(text=str(generated_content), references=[])
 
-    plagiarism = {
+    return {
         "is_unique": plagiarism_result["plagiarism_percent"] < 30,
         "plagiarism_score": plagiarism_result["plagiarism_percent"],
         "originality_score": plagiarism_result["originality_percent"],
         "sources_found": 0,
     }
 
+
+@app.post("/api/v1/generate-product-content")
+@app.post("/generate-content")
+async def generate_product_content(
+    prompt: str = Form(...),
+    images: Optional[List[UploadFile]] = File(None),
+    image_urls: Optional[str] = Form(None),  # comma-separated
+):
+    """
+    Endpoint for AI product content generation.
+    Handles both uploaded images and image URLs.
+    """
+    pil_images = await _load_product_images(images, image_urls)
+
+    generated_content = await generate_ai_content(_product_seo_prompt(prompt), pil_images)
+
+    plagiarism = _plagiarism_summary(generated_content)
+
     return {"generated_content": generated_content, "plagiarism": plagiarism}
 
 
+@app.post("/api/v1/generate-product-content/stream")
+@app.post("/generate-content/stream")
+async def generate_product_content_stream(
+    prompt: str = Form(...),
+    images: Optional[List[UploadFile]] = File(None),
+    image_urls: Optional[str] = Form(None),  # comma-separated
+    stream_format: str = Query("ndjson", pattern=STREAM_FORMAT_PATTERN),
+):
+    """
+    Streaming variant of product content generation.
+
+    Events: `content` (one per generated text chunk, in `delta`), then
+    `plagiarism`, then `done` with the complete `generated_content`.
+    """
+    pil_images = await _load_product_images(images, image_urls)
+
+    async def events():
+        parts = []
+        async for text in stream_ai_content(_product_seo_prompt(prompt), pil_images):
+            parts.append(text)
+            yield {"type": "content", "delta": text}
+        generated_content = "".join(parts)
+        yield {"type": "plagiarism", "plagiarism": _plagiarism_summary(generated_content)}
+        yield {"type": "done", "generated_content": generated_content}
+
+    return stream_events(events(), stream_format)
+
+
 @app.post("/api/v1/generate-website-content")
 async def generate_website_content(
     url: str = Form(...), prompt: Optional[str] = Form(None)
@@ -126,7 +236,8 @@ async def generate_website_content(
     Scrapes the website, captures screenshot, and uses AI for analysis.
     """
     # 1. Scrape website data
-    scraped_data = scrape_website(url)
+    # Blocking requests call; keep it off the event loop
+    scraped_data = await asyncio.to_thread(scrape_website, url)
     if "error" in scraped_data:
         raise HTTPException(
             status_code=400, detail=f"Failed to scrape website: {scraped_data['error']}"
@@ -141,17 +252,10 @@ async def generate_website_content(
         )
 
     # 3. Generate content with AI
-    generated_content = generate_website_ai_content(prompt, scraped_data, screenshot)
+    generated_content = await generate_website_ai_content(prompt, scraped_data, screenshot)
 
     # 4. Plagiarism check
-    plagiarism_result = plagiarism_check(text=str(generated_content), references=[])
-
-    plagiarism = {
-        "is_unique": plagiarism_result["plagiarism_percent"] < 30,
-        "plagiarism_score": plagiarism_result["plagiarism_percent"],
-        "originality_score": plagiarism_result["originality_percent"],
-        "sources_found": 0,
-    }
+    plagiarism = _plagiarism_summary(generated_content)
 
     return {
         "generated_content": generated_content,
@@ -160,6 +264,45 @@ async def generate_website_content(
     }
 
 
+@app.post("/api/v1/generate-website-content/stream")
+async def generate_website_content_stream(
+    url: str = Form(...),
+    prompt: Optional[str] = Form(None),
+    stream_format: str = Query("ndjson", pattern=STREAM_FORMAT_PATTERN),
+):
+    """
+    Streaming variant of website content generation.
+
+    Events: `scraped_data` as soon as the page is scraped, then `content` (one per
+    generated text chunk, in `delta`), `plagiarism`, and `done` with the complete
+    `generated_content`. A screenshot failure ends the stream with an `error` event.
+    """
+    # Blocking requests call; keep it off the event loop
+    scraped_data = await asyncio.to_thread(scrape_website, url)
+    if "error" in scraped_data:
+        raise HTTPException(
+            status_code=400, detail=f"Failed to scrape website: {scraped_data['error']}"
+        )
+
+    async def events():
+        yield {"type": "scraped_data", "scraped_data": scraped_data}
+        try:
+            screenshot = await get_website_screenshot(url)
+        except Exception as e:
+            yield {"type": "error", "error": f"Failed to capture screenshot: {str(e)}"}
+            return
+
+        parts = []
+        async for text in stream_website_ai_content(prompt, scraped_data, screenshot):
+            parts.append(text)
+            yield {"type": "content", "delta": text}
+        generated_content = "".join(parts)
+        yield {"type": "plagiarism", "plagiarism": _plagiarism_summary(generated_content)}
+        yield {"type": "done", "generated_content": generated_content}
+
+    return stream_events(events(), stream_format)
+
+
 # ============= Health Check =============
 
 
@@ -182,6 +325,7 @@ async def root():
             "keyword_suggestions": "/api/v1/keywords/suggest",
             "keyword_analysis": "/api/v1/keywords/analyze",
             "serp_analysis": "/api/v1/serp/analyze",
+            "serp_batch_analysis": "/api/v1/serp/analyze/batch",
             "technical_seo_audit": "/api/v1/technical-seo/audit",
             "seo_optimize": "/api/v1/seo/optimize",
             "generate_product_content": "/generate-product-content",
@@ -201,23 +345,30 @@ async def health_check():
         "dataforseo_configured": settings.has_dataforseo(),
     }
 
+
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for shared infrastructure (connection pools, cache, request coalescing, SERP providers, local stores, browsers)"""
+    warehouse = get_keyword_warehouse()
+    return {
+        "http_pool": get_http_client_registry().metrics(),
+        "cache": get_cache_manager().metrics(),
+        "single_flight": get_single_flight().metrics(),
+        "serp_providers": get_serp_provider_router().metrics(),
+        "autocomplete": get_autocomplete_harvester().metrics(),
+        "keyword_warehouse": await warehouse.metrics() if warehouse else None,
+        "backlink_store": await get_backlink_store().metrics(),
+        "browser_pool": get_browser_pool().metrics(),
+        "intent_classifier": get_local_intent_classifier().metrics(),
+        "llm": {**get_llm_gateway().metrics(), **get_llm_client_registry().metrics()},
+    }
+
+
 @app.get("/debug")
 async def debug():
-    from playwright.async_api import async_playwright
-    
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage"
-            ]
-        )
-        page = await browser.new_page()
+    async with get_browser_pool().page() as page:
         await page.goto("https://vercel.com")
         title = await page.title()
-        await browser.close()
         return {"title": title}
 
 if __name__ == "__main__":
@@ -75,6 +75,36 @@ If a keyword doesn't fit any cluster well, add it to "unclustered".
 )
 
 
+# ============= Cluster Labeling =============
+
+CLUSTER_LABELING_PROMPT = PromptTemplate(
+    input_variables=["clusters"],
+    template="""You are an SEO expert naming keyword clusters that were already grouped.
+
+For each cluster below (id, then a sample of its keywords), do NOT regroup keywords. Just:
+1. Assign a short descriptive name/theme
+2. Identify the dominant search intent
+3. Suggest a content strategy for that cluster
+
+Clusters:
+{clusters}
+
+Return your response as a JSON object:
+{{
+    "clusters": [
+        {{
+            "cluster_id": 1,
+            "cluster_name": "Descriptive Theme Name",
+            "intent": "INFORMATIONAL|COMMERCIAL|TRANSACTIONAL|NAVIGATIONAL",
+            "recommendation": "Brief content strategy suggestion"
+        }},
+        ...
+    ]
+}}
+"""
+)
+
+
 # ============= Difficulty Analysis =============
 
 DIFFICULTY_ANALYSIS_PROMPT = PromptTemplate(
@@ -16,9 +16,11 @@ async def analyze_backlinks(request: BacklinkAnalysisRequest):
     
     Returns:
     - Backlink summary (total links, referring domains, AS)
-    - Detailed list of backlinks (anchor text, source URL, rank)
+    - Detailed list of backlinks (anchor text, source URL, rank), filtered by
+      dofollow, rank range and anchor text and paginated with limit/offset
     
     **Data Source:**
+    - Local backlink exports (data/backlinks/, indexed on ingestion)
     - DataForSEO Backlinks API
     """
     try:
@@ -3,7 +3,7 @@ Keyword Research API Router
 Endpoints for keyword suggestions, analysis, and clustering.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from schemas.keyword_schemas import (
     KeywordSuggestionRequest,
     KeywordAnalysisRequest,
@@ -11,12 +11,15 @@ from schemas.keyword_schemas import (
     SingleKeywordMetricsRequest,
     KeywordSuggestionsResponse,
     KeywordAnalysisResponse,
-    KeywordClusterResponse
+    KeywordClusterResponse,
+    ClusteringEngine
 )
 from services.orchestrator import get_keyword_orchestrator
-from services.langchain_analysis import get_langchain_analysis_service
+from services.keyword_clustering import get_keyword_clustering_service
 from exceptions import SEOServiceError, APIKeyMissingError, APIRateLimitError
 from services.keyword_research import KeywordResearchService
+from services.keyword_warehouse import get_keyword_warehouse
+from utils.streaming import STREAM_FORMAT_PATTERN, stream_events
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,7 +36,7 @@ async def get_keyword_suggestions(request: KeywordSuggestionRequest):
     and optionally enriches them with search volume and competition data.
     
     **Data Sources:**
-    - Keyword suggestions: DataForSEO or Google Autocomplete (fallback)
+    - Keyword suggestions: DataForSEO, Serper.dev, or free autocomplete harvesting (Google, DuckDuckGo, Bing)
     - Volume/Competition: Google Ads API (if configured) or estimation
     
     **Example:**
@@ -124,7 +127,8 @@ async def analyze_keywords(request: KeywordAnalysisRequest):
             include_suggestions=request.include_suggestions,
             include_volume=request.include_volume,
             include_serp=request.include_serp,
-            include_clustering=request.include_clustering
+            include_clustering=request.include_clustering,
+            use_cache=request.use_cache
         )
         
         return KeywordAnalysisResponse(**result)
@@ -152,15 +156,56 @@ async def analyze_keywords(request: KeywordAnalysisRequest):
         )
 
 
+@router.post("/analyze/stream")
+async def analyze_keywords_stream(
+    request: KeywordAnalysisRequest,
+    stream_format: str = Query("ndjson", pattern=STREAM_FORMAT_PATTERN, description="'ndjson' or 'sse'"),
+):
+    """
+    Streaming variant of `/analyze`.
+    
+    Emits each part of the analysis as soon as its stage finishes instead of
+    waiting for the slowest AI call:
+    - `keywords`: keyword metrics (volume, competition, CPC)
+    - `intents`, `serp_analysis`, `difficulty`, `clusters`
+    - `recommendations`: one event per chunk of AI recommendation text (`delta`)
+    - `done`: the complete analysis, same shape as the `/analyze` response
+    
+    Failures after the stream has started are reported as an `error` event.
+    """
+    orchestrator = get_keyword_orchestrator()
+    
+    async def events():
+        async for event in orchestrator.analyze_keyword_complete_stream(
+            seed_keyword=request.seed_keyword,
+            language=request.language,
+            country=request.country,
+            limit=request.limit,
+            include_suggestions=request.include_suggestions,
+            include_volume=request.include_volume,
+            include_serp=request.include_serp,
+            include_clustering=request.include_clustering,
+            use_cache=request.use_cache
+        ):
+            if event["type"] == "done":
+                event = {"type": "done", "analysis": KeywordAnalysisResponse(**event["analysis"])}
+            yield event
+    
+    return stream_events(events(), stream_format)
+
+
 @router.post("/cluster", response_model=KeywordClusterResponse)
 async def cluster_keywords(request: KeywordClusterRequest):
     """
-    Cluster keywords into semantic groups using AI.
+    Cluster keywords into semantic groups.
     
-    This endpoint uses LangChain + Gemini to group keywords based on:
-    - Semantic similarity
-    - Search intent alignment
-    - Topic relevance
+    Engines:
+    - **local**: TF-IDF over word and character n-grams (plus SERP overlap when
+      `serp_urls` is given) with agglomerative/k-means clustering. No LLM calls,
+      handles 10k+ keywords in seconds.
+    - **llm** (default): LangChain + Gemini groups the keywords (max 200 keywords)
+    - **hybrid**: local grouping, then one LLM call names each cluster and
+      writes its recommendation
     
     **Example:**
     ```json
@@ -172,10 +217,19 @@ async def cluster_keywords(request: KeywordClusterRequest):
             "rank tracker",
             "content optimization"
         ],
-        "num_clusters": 3
+        "num_clusters": 3,
+        "engine": "hybrid"
     }
     ```
     """
+    if request.engine == ClusteringEngine.LLM and (
+        len(request.keywords) > 200 or (request.num_clusters or 0) > 20
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The llm engine supports at most 200 keywords and 20 clusters; use the local or hybrid engine"
+        )
+    
     try:
         from schemas.keyword_schemas import KeywordMetrics
         
@@ -185,11 +239,12 @@ async def cluster_keywords(request: KeywordClusterRequest):
             for kw in request.keywords
         ]
         
-        # Cluster with AI
-        langchain_service = get_langchain_analysis_service()
-        clusters = await langchain_service.cluster_keywords(
+        clustering_service = get_keyword_clustering_service()
+        clusters = await clustering_service.cluster(
             keyword_metrics,
-            num_clusters=request.num_clusters
+            num_clusters=request.num_clusters,
+            engine=request.engine,
+            serp_urls=request.serp_urls
         )
         
         # Find unclustered keywords
@@ -290,3 +345,50 @@ async def get_free_google_suggestions(q: str):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch free keyword suggestions: {str(e)}"
         )
+
+
+@router.get("/warehouse/search", response_model=KeywordSuggestionsResponse)
+async def search_keyword_warehouse(
+    q: str = Query(..., min_length=1, max_length=200, description="Text to search for"),
+    mode: str = Query("prefix", pattern="^(prefix|substring)$", description="'prefix' or 'substring'"),
+    language: str = "en",
+    country: str = "us",
+    limit: int = Query(20, ge=1, le=1000),
+    fresh_only: bool = Query(False, description="Only keywords whose metrics are within the warehouse TTL")
+):
+    """
+    Search every keyword fetched so far for a locale, highest volume first.
+    
+    Answers from the local keyword warehouse only; no external API is called.
+    
+    **Example:**
+    ```
+    GET /api/v1/keywords/warehouse/search?q=seo+to&mode=prefix&limit=20
+    ```
+    """
+    warehouse = get_keyword_warehouse()
+    if warehouse is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Keyword warehouse is disabled"
+        )
+    
+    try:
+        rows = await warehouse.search(
+            q, language, country, mode=mode, limit=limit, fresh_only=fresh_only
+        )
+    except Exception as e:
+        logger.error(f"Error searching keyword warehouse: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search keyword warehouse: {str(e)}"
+        )
+    
+    suggestions = [row.to_suggestion() for row in rows]
+    return KeywordSuggestionsResponse(
+        seed_keyword=q,
+        total_suggestions=len(suggestions),
+        suggestions=suggestions,
+        data_sources=["keyword_warehouse"],
+        cached=True
+    )
@@ -3,9 +3,10 @@ SEO Blog Optimizer Router
 Endpoints for analyzing and optimizing blog posts.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from schemas.seo_optimizer_schemas import SEOOptimizeRequest, SEOOptimizeResponse, InternalLinkRequest, InternalLinkResponse
 from services.seo_optimizer import get_seo_optimizer_service
+from utils.streaming import STREAM_FORMAT_PATTERN, stream_events
 
 router = APIRouter(prefix="/seo", tags=["SEO Blog Optimizer"])
 
@@ -31,6 +32,23 @@ async def optimize_blog_post(request: SEOOptimizeRequest):
         )
 
 
+@router.post("/optimize/stream")
+async def optimize_blog_post_stream(
+    request: SEOOptimizeRequest,
+    stream_format: str = Query("ndjson", pattern=STREAM_FORMAT_PATTERN, description="'ndjson' or 'sse'"),
+):
+    """
+    Streaming variant of `/optimize`.
+
+    Events, in order:
+    - `metrics`: seo_score, metrics and recommendations (no LLM involved)
+    - `ai_insights`: one event per chunk of AI insight text (`delta`)
+    - `done`: the complete `ai_insights` text
+    """
+    service = get_seo_optimizer_service()
+    return stream_events(service.optimize_article_stream(request), stream_format)
+
+
 @router.post("/internal-links", response_model=InternalLinkResponse)
 async def get_internal_link_suggestions(request: InternalLinkRequest):
     """
@@ -6,6 +6,7 @@ Endpoints for SERP analysis and competitor mining.
 from fastapi import APIRouter, HTTPException, status
 from schemas.serp_schemas import (
     SERPAnalysisRequest,
+    BatchSERPAnalysisRequest,
     CompetitorAnalysisRequest,
     SERPAnalysisResponse,
     CompetitorAnalysisResponse,
@@ -13,6 +14,8 @@ from schemas.serp_schemas import (
 )
 from services.orchestrator import get_keyword_orchestrator
 from services.serp_analysis import SERPAnalysisService
+from services.serp_batch import get_serp_batch_service
+from utils.streaming import stream_events
 from exceptions import SEOServiceError, APIKeyMissingError
 from collections import defaultdict
 from typing import List
@@ -56,7 +59,8 @@ async def analyze_serp(request: SERPAnalysisRequest):
         result = await orchestrator.analyze_serp_with_insights(
             keyword=request.keyword,
             language=request.language,
-            country=request.country
+            country=request.country,
+            use_cache=request.use_cache
         )
         
         return result["serp_analysis"]
@@ -79,6 +83,33 @@ async def analyze_serp(request: SERPAnalysisRequest):
         )
 
 
+@router.post("/analyze/batch")
+async def analyze_serp_batch(request: BatchSERPAnalysisRequest):
+    """
+    Fetch SERPs for many keywords (rank tracking), streaming each as it arrives.
+    
+    Keywords are deduplicated and cached SERPs are streamed first. The rest use the
+    providers' bulk APIs where configured (DataForSEO task queue for large batches,
+    Serper.dev batch queries), otherwise a bounded fan-out (`max_concurrency`)
+    across the configured SERP providers. No AI insights are generated.
+    
+    **Example:**
+    ```json
+    {
+        "keywords": ["best seo tools", "seo audit checklist"],
+        "country": "us",
+        "max_concurrency": 10
+    }
+    ```
+    
+    Streams newline-delimited JSON (`application/x-ndjson`) or server-sent events
+    (`text/event-stream`): one `result` (or `error`) event per unique keyword, then a
+    `summary` event with throughput, API calls and per-keyword API cost.
+    """
+    service = get_serp_batch_service()
+    return stream_events(service.analyze_batch(request), request.stream_format)
+
+
 @router.post("/competitors", response_model=CompetitorAnalysisResponse)
 async def analyze_competitors(request: CompetitorAnalysisRequest):
     """
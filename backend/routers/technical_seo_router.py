@@ -7,12 +7,16 @@ import logging
 
 from fastapi import APIRouter, HTTPException, status
 from schemas.technical_seo_schemas import (
+    BatchAuditRequest,
     QuickAuditRequest,
     QuickAuditResponse,
+    SiteCrawlRequest,
     TechnicalSEOAuditRequest,
     TechnicalSEOAuditResponse,
 )
+from services.site_crawler import get_site_crawler_service
 from services.technical_seo_service import get_technical_seo_service
+from utils.streaming import stream_events
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +70,31 @@ async def perform_full_audit(request: TechnicalSEOAuditRequest):
         )
 
 
+@router.post("/audit/batch")
+async def perform_batch_audit(request: BatchAuditRequest):
+    """
+    Audit many URLs in one call, streaming each result as soon as it is ready.
+
+    URLs are processed by a bounded worker pool (`max_concurrency`) sharing the
+    pooled HTTP client. A failing URL produces an inline `error` event instead
+    of failing the batch; every event carries the URL's `index` in the request.
+
+    **Example:**
+    ```json
+    {
+        "urls": ["https://example.com", "https://example.org"],
+        "max_concurrency": 10,
+        "stream_format": "ndjson"
+    }
+    ```
+
+    Streams newline-delimited JSON (`application/x-ndjson`) or server-sent events
+    (`text/event-stream`), ending with a `summary` event.
+    """
+    service = get_technical_seo_service()
+    return stream_events(service.audit_batch(request), request.stream_format)
+
+
 @router.post("/quick-audit", response_model=QuickAuditResponse)
 async def perform_quick_audit(request: QuickAuditRequest):
     """
@@ -101,6 +130,32 @@ async def perform_quick_audit(request: QuickAuditRequest):
         )
 
 
+@router.post("/crawl")
+async def crawl_site(request: SiteCrawlRequest):
+    """
+    Crawl a whole site and audit every page.
+
+    Pages are discovered from the sitemap (if enabled) and by following internal
+    links from the seed URL, honoring robots.txt and the page budget.
+
+    **Example:**
+    ```json
+    {
+        "url": "https://example.com",
+        "max_pages": 200,
+        "max_concurrency": 5
+    }
+    ```
+
+    Streams newline-delimited JSON (or server-sent events with
+    `"stream_format": "sse"`): one `page` (or `error`) event per URL as it
+    finishes, followed by a final `summary` event with duplicate titles/meta
+    descriptions, orphan pages, canonical loops and the average score.
+    """
+    service = get_site_crawler_service()
+    return stream_events(service.crawl(request), request.stream_format)
+
+
 @router.get("/audit/{url:path}")
 async def audit_url_get(url: str):
     """
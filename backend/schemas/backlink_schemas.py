@@ -9,6 +9,11 @@ class BacklinkAnalysisRequest(BaseModel):
     target: str = Field(..., description="Domain or URL to analyze (e.g., 'example.com' or 'https://example.com/page')")
     mode: str = Field("domain", description="Analysis mode: 'domain', 'subdomain', or 'url'")
     limit: int = Field(100, ge=1, le=1000, description="Number of backlinks to fetch")
+    offset: int = Field(0, ge=0, description="Number of matching backlinks to skip (for pagination)")
+    dofollow: Optional[bool] = Field(None, description="Only dofollow (true) or only nofollow (false) links")
+    min_rank: Optional[int] = Field(None, ge=0, le=100, description="Minimum rank of the source page (0-100)")
+    max_rank: Optional[int] = Field(None, ge=0, le=100, description="Maximum rank of the source page (0-100)")
+    anchor_contains: Optional[str] = Field(None, min_length=1, max_length=200, description="Only links whose anchor text contains this (case-insensitive)")
 
 
 # ============= Response Schemas =============
@@ -42,5 +47,6 @@ class BacklinkAnalysisResponse(BaseModel):
     target: str
     summary: BacklinkSummary
     backlinks: List[BacklinkItem]
+    total_matching: Optional[int] = Field(None, description="Backlinks matching the filters across all pages, when known")
     cached: bool = False
     data_source: str = "dataforseo"
@@ -21,6 +21,13 @@ class DifficultyLevel(str, Enum):
     VERY_HARD = "very_hard"
 
 
+class ClusteringEngine(str, Enum):
+    """How keywords are grouped into clusters"""
+    LOCAL = "local"
+    LLM = "llm"
+    HYBRID = "hybrid"
+
+
 class CompetitionLevel(str, Enum):
     """Google Ads competition level"""
     LOW = "low"
@@ -34,7 +41,7 @@ class CompetitionLevel(str, Enum):
 class KeywordSuggestionRequest(BaseModel):
     """Request for keyword suggestions"""
     seed_keyword: str = Field(..., min_length=1, max_length=200, description="Seed keyword to generate suggestions from")
-    limit: int = Field(20, ge=1, le=100, description="Maximum number of suggestions to return")
+    limit: int = Field(20, ge=1, le=1000, description="Maximum number of suggestions to return")
     language: str = Field("en", description="Language code (ISO 639-1)")
     country: str = Field("us", description="Country code (ISO 3166-1 alpha-2)")
 
@@ -49,12 +56,15 @@ class KeywordAnalysisRequest(BaseModel):
     language: str = Field("en", description="Language code")
     country: str = Field("us", description="Country code")
     limit: int = Field(20, ge=1, le=100, description="Max suggestions")
+    use_cache: bool = Field(True, description="Reuse cached AI responses for identical prompts (set false to force a fresh analysis)")
 
 
 class KeywordClusterRequest(BaseModel):
     """Request for keyword clustering"""
-    keywords: List[str] = Field(..., min_items=2, max_items=200, description="Keywords to cluster")
-    num_clusters: Optional[int] = Field(None, ge=2, le=20, description="Number of clusters (auto if None)")
+    keywords: List[str] = Field(..., min_items=2, max_items=20000, description="Keywords to cluster (max 200 with the llm engine)")
+    num_clusters: Optional[int] = Field(None, ge=2, le=500, description="Number of clusters (auto if None; max 20 with the llm engine)")
+    engine: ClusteringEngine = Field(ClusteringEngine.LLM, description="llm (LLM groups keywords, default), local (no LLM) or hybrid (local grouping, LLM names clusters)")
+    serp_urls: Optional[Dict[str, List[str]]] = Field(None, description="Top-ranking URLs per keyword; keywords sharing URLs cluster together")
 
 
 class SingleKeywordMetricsRequest(BaseModel):
@@ -75,6 +85,7 @@ class KeywordSuggestion(BaseModel):
     cpc: Optional[float] = Field(None, ge=0, description="Cost per click in USD")
     trend: Optional[str] = None  # e.g., "rising", "stable", "falling"
     source: str = Field("api", description="Data source (api, google_ads, etc.)")
+    metrics_source: Optional[str] = Field(None, description="Where volume/competition/CPC came from: google_ads, estimate or the suggestion source")
 
 
 class KeywordMetrics(BaseModel):
@@ -87,6 +98,7 @@ class KeywordMetrics(BaseModel):
     
     # AI-powered analysis
     intent: Optional[SearchIntent] = SearchIntent.UNKNOWN
+    intent_source: Optional[str] = Field(None, description="Which path classified the intent: lexicon, model, cache or llm")
     difficulty: Optional[DifficultyLevel] = None
     difficulty_score: Optional[float] = Field(None, ge=0, le=100)
     
@@ -124,6 +136,8 @@ class KeywordAnalysisResponse(BaseModel):
     insights: Optional[Dict[str, Any]] = Field(None, description="AI-generated insights and recommendations")
     total_keywords: int
     data_sources: List[str]
+    stage_timings: Optional[Dict[str, Dict[str, Any]]] = Field(None, description="Per-stage status and timings (ms) of the analysis pipeline")
+    intent_sources: Optional[Dict[str, int]] = Field(None, description="Number of keywords whose intent came from each path (lexicon, model, cache, llm)")
     cached: bool = False
 
 
@@ -14,6 +14,7 @@ class SEOOptimizeRequest(BaseModel):
     keyword: str = Field(..., description="The target keyword to optimize for")
     title: Optional[str] = Field(None, description="The article title")
     meta_description: Optional[str] = Field(None, description="The meta description")
+    use_cache: bool = Field(True, description="Reuse cached AI responses for identical prompts (set false to force a fresh analysis)")
 
 
 class SEOMetrics(BaseModel):
@@ -42,6 +43,7 @@ class InternalLinkRequest(BaseModel):
     """Request for internal link suggestions"""
     article: str = Field(..., description="The article content to analyze")
     existing_titles: List[str] = Field(..., description="List of existing blog post titles to match against")
+    use_cache: bool = Field(True, description="Reuse cached AI responses for identical prompts (set false to force a fresh analysis)")
 
 
 class SuggestedLink(BaseModel):
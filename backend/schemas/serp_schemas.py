@@ -26,6 +26,27 @@ class SERPAnalysisRequest(BaseModel):
     country: str = Field("us", description="Country code")
     device: str = Field("desktop", description="Device type: desktop, mobile, tablet")
     num_results: int = Field(10, ge=1, le=100, description="Number of organic results to fetch")
+    use_cache: bool = Field(True, description="Reuse cached AI responses for identical prompts (set false to force a fresh analysis)")
+
+
+class BatchSERPAnalysisRequest(BaseModel):
+    """Request for SERPs of many keywords, streamed as they arrive"""
+    keywords: List[str] = Field(
+        ..., min_length=1, max_length=5000,
+        description="Keywords to fetch SERPs for (duplicates are fetched once)"
+    )
+    language: str = Field("en", description="Language code")
+    country: str = Field("us", description="Country code")
+    device: str = Field("desktop", description="Device type: desktop, mobile, tablet")
+    num_results: int = Field(10, ge=1, le=100, description="Number of organic results to fetch")
+    max_concurrency: int = Field(
+        10, ge=1, le=50, description="Provider requests in flight at once"
+    )
+    use_cache: bool = Field(True, description="Serve keywords with a cached SERP from the cache (set false to refetch all)")
+    stream_format: str = Field(
+        "ndjson", pattern="^(ndjson|sse)$",
+        description="Stream format: 'ndjson' or 'sse' (server-sent events)",
+    )
 
 
 class CompetitorAnalysisRequest(BaseModel):
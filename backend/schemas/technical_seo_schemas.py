@@ -202,8 +202,11 @@ class ImageSizeIssue(BaseModel):
     """Image with size issues"""
 
     src: str = Field(..., description="Image source URL")
-    width: Optional[int] = Field(None, description="Image width in pixels")
-    height: Optional[int] = Field(None, description="Image height in pixels")
+    width: Optional[int] = Field(None, description="Declared width attribute in pixels")
+    height: Optional[int] = Field(None, description="Declared height attribute in pixels")
+    intrinsic_width: Optional[int] = Field(None, description="Actual image width in pixels")
+    intrinsic_height: Optional[int] = Field(None, description="Actual image height in pixels")
+    format: Optional[str] = Field(None, description="Image format (JPEG, PNG, WEBP, AVIF, ...)")
     file_size_kb: Optional[float] = Field(
         None, description="File size in KB if available"
     )
@@ -220,6 +223,17 @@ class ImageSizeCheck(BaseModel):
     images_without_dimensions: List[str] = Field(
         default_factory=list, description="Images missing width/height attributes"
     )
+    images_probed: int = Field(0, description="Unique image URLs measured")
+    total_image_weight_kb: Optional[float] = Field(
+        None, description="Combined size of images whose size is known"
+    )
+    dimension_mismatches: List[ImageSizeIssue] = Field(
+        default_factory=list,
+        description="Images much larger than their declared display size",
+    )
+    legacy_format_images: List[str] = Field(
+        default_factory=list, description="Raster images not served as WebP/AVIF"
+    )
     status: SEOStatus = Field(..., description="Image size status")
     recommendations: List[str] = Field(
         default_factory=list, description="Improvement suggestions"
@@ -341,6 +355,9 @@ class TechnicalSEOAuditRequest(BaseModel):
     max_links_to_check: int = Field(
         50, ge=1, le=100, description="Maximum links to check for broken status"
     )
+    check_all_links: bool = Field(
+        False, description="Check every unique internal link (ignores max_links_to_check)"
+    )
     timeout_seconds: int = Field(
         30, ge=5, le=120, description="Request timeout in seconds"
     )
@@ -446,3 +463,107 @@ class AuditHistoryResponse(BaseModel):
     url: str
     total_audits: int
     audits: List[TechnicalSEOAuditResponse]
+
+
+# ============= Site Crawl Schemas =============
+
+
+class SiteCrawlRequest(BaseModel):
+    """Request for a site-wide technical SEO crawl"""
+
+    url: str = Field(..., description="Seed URL to start crawling from")
+    use_sitemap: bool = Field(
+        True, description="Seed the frontier from robots.txt sitemaps or /sitemap.xml"
+    )
+    sitemap_url: Optional[str] = Field(
+        None, description="Explicit sitemap URL (overrides discovery)"
+    )
+    respect_robots: bool = Field(True, description="Honor robots.txt rules")
+    max_pages: int = Field(
+        100, ge=1, le=10000, description="Maximum number of pages to audit"
+    )
+    max_concurrency: int = Field(
+        5, ge=1, le=20, description="Concurrent page fetches against the host"
+    )
+    check_broken_links: bool = Field(
+        False, description="Check links for broken status on every page"
+    )
+    max_links_to_check: int = Field(
+        50, ge=1, le=100, description="Maximum links to check per page"
+    )
+    check_all_links: bool = Field(
+        False, description="Check every unique internal link on each page"
+    )
+    timeout_seconds: int = Field(
+        30, ge=5, le=120, description="Per-page request timeout in seconds"
+    )
+    stream_format: str = Field(
+        "ndjson", pattern="^(ndjson|sse)$",
+        description="Stream format: 'ndjson' or 'sse' (server-sent events)",
+    )
+
+
+class CrawledPageSummary(BaseModel):
+    """Compact per-page record kept for the site-level rollup"""
+
+    url: str
+    final_url: str
+    title: Optional[str] = None
+    meta_description: Optional[str] = None
+    canonical: Optional[str] = None
+    overall_score: int = 0
+    inbound_links: int = Field(0, description="Links to this page from other crawled pages")
+    from_sitemap: bool = False
+
+
+class SiteCrawlSummary(BaseModel):
+    """Site-level rollup emitted at the end of a crawl"""
+
+    seed_url: str
+    pages_crawled: int = 0
+    pages_failed: int = 0
+    blocked_by_robots: int = 0
+    budget_exhausted: bool = Field(
+        False, description="Whether more pages were discovered than max_pages allowed"
+    )
+    average_score: Optional[float] = None
+    duplicate_titles: Dict[str, List[str]] = Field(
+        default_factory=dict, description="Title -> pages sharing it"
+    )
+    duplicate_meta_descriptions: Dict[str, List[str]] = Field(
+        default_factory=dict, description="Meta description -> pages sharing it"
+    )
+    orphan_pages: List[str] = Field(
+        default_factory=list, description="Crawled pages no other crawled page links to"
+    )
+    canonical_loops: List[List[str]] = Field(
+        default_factory=list, description="Chains of canonical tags that point back on themselves"
+    )
+    crawl_time_seconds: float = 0.0
+
+
+class BatchAuditRequest(BaseModel):
+    """Request to audit many URLs, streaming results as they finish"""
+
+    urls: List[str] = Field(
+        ..., min_length=1, max_length=5000, description="URLs to audit"
+    )
+    check_broken_links: bool = Field(
+        False, description="Whether to check each page for broken links"
+    )
+    max_links_to_check: int = Field(
+        50, ge=1, le=100, description="Maximum links to check per page"
+    )
+    check_all_links: bool = Field(
+        False, description="Check every unique internal link on each page"
+    )
+    timeout_seconds: int = Field(
+        30, ge=5, le=120, description="Request timeout per page in seconds"
+    )
+    max_concurrency: int = Field(
+        10, ge=1, le=50, description="Number of pages audited in parallel"
+    )
+    stream_format: str = Field(
+        "ndjson", pattern="^(ndjson|sse)$",
+        description="Stream format: 'ndjson' or 'sse' (server-sent events)",
+    )
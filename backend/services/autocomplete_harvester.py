@@ -0,0 +1,303 @@
+"""
+Autocomplete Suggestion Harvester
+Collects real search suggestions for a seed from the free autocomplete endpoints
+(Google, DuckDuckGo, Bing), queried concurrently.
+
+The seed is expanded "alphabet soup" style: the seed itself, seed + a-z / 0-9,
+question words before it and connecting words after it. Suggestions are
+normalized and deduplicated, then each new suggestion is queried in turn
+(breadth-first) up to the configured depth. A request budget, a time budget and
+per-source rate limits (shared by every request in the process) keep the harvest
+bounded and polite.
+"""
+
+import asyncio
+import logging
+import re
+import string
+import time
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+
+from config import settings
+from schemas.keyword_schemas import KeywordSuggestion
+from utils.http_client import HTTPClientRegistry, get_http_client_registry
+
+logger = logging.getLogger(__name__)
+
+QUESTION_PREFIXES = [
+    "how", "what", "why", "when", "where", "which", "who", "can", "is", "are", "does",
+]
+CONNECTOR_SUFFIXES = ["for", "with", "without", "vs", "near", "like", "to", "and"]
+
+
+def normalize_suggestion(text: str) -> str:
+    """Dedup key: NFKC, lowercase, single spaces, no surrounding quotes/punctuation"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = re.sub(r"\s+", " ", text)
+    return text.strip(string.whitespace + string.punctuation.replace("#", "").replace("+", ""))
+
+
+def expand_seed(seed: str) -> List[str]:
+    """Alphabet-soup expansions of a seed (the seed itself first)"""
+    queries = [seed]
+    queries += [f"{seed} {char}" for char in string.ascii_lowercase + string.digits]
+    queries += [f"{word} {seed}" for word in QUESTION_PREFIXES]
+    queries += [f"{seed} {word}" for word in CONNECTOR_SUFFIXES]
+    return queries
+
+
+def _parse_opensearch(data: Any) -> List[str]:
+    # OpenSearch suggestions: [query, [suggestion, ...], ...]
+    if isinstance(data, list) and len(data) > 1 and isinstance(data[1], list):
+        return [text for text in data[1] if isinstance(text, str)]
+    return []
+
+
+def _parse_duckduckgo(data: Any) -> List[str]:
+    # [{"phrase": "keyword"}, ...]
+    if isinstance(data, list):
+        return [item.get("phrase") for item in data if isinstance(item, dict) and item.get("phrase")]
+    return []
+
+
+class _Source:
+    """One autocomplete endpoint: URL, query parameters and response parser"""
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        params: Callable[[str, str, str], Dict[str, str]],
+        parse: Callable[[Any], List[str]],
+    ):
+        self.name = name
+        self.url = url
+        self.params = params
+        self.parse = parse
+
+
+SOURCES: Dict[str, _Source] = {
+    "google": _Source(
+        "google_autocomplete",
+        "http://suggestqueries.google.com/complete/search",
+        lambda query, language, country: {"client": "firefox", "q": query, "hl": language, "gl": country},
+        _parse_opensearch,
+    ),
+    "duckduckgo": _Source(
+        "duckduckgo_autocomplete",
+        "https://duckduckgo.com/ac/",
+        lambda query, language, country: {"q": query, "kl": f"{country}-{language}"},
+        _parse_duckduckgo,
+    ),
+    "bing": _Source(
+        "bing_autocomplete",
+        "https://api.bing.com/osjson.aspx",
+        lambda query, language, country: {"query": query, "mkt": f"{language}-{country.upper()}"},
+        _parse_opensearch,
+    ),
+}
+
+
+class _SourceLimiter:
+    """Concurrency cap plus minimum spacing between requests to one source"""
+
+    def __init__(self, concurrency: int, requests_per_second: float):
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        if self.interval:
+            # Reserve the next slot synchronously, then wait for it
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            if slot > now:
+                try:
+                    await asyncio.sleep(slot - now)
+                except asyncio.CancelledError:
+                    self._semaphore.release()
+                    raise
+        self.requests += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._semaphore.release()
+
+
+class _Found:
+    """A harvested suggestion: normalized text, first source, how often it came back"""
+
+    def __init__(self, text: str, source: str, order: int):
+        self.text = text
+        self.source = source
+        self.order = order
+        self.hits = 1
+
+
+class AutocompleteHarvester:
+    """
+    Breadth-first autocomplete harvesting across all free sources.
+
+    Usage:
+        suggestions = await get_autocomplete_harvester().harvest("seo tools")
+    """
+
+    def __init__(
+        self,
+        http_clients: Optional[HTTPClientRegistry] = None,
+        sources: Optional[List[str]] = None,
+        concurrency_per_source: int = 10,
+        requests_per_second: float = 40.0,
+        request_timeout_seconds: float = 3.0,
+    ):
+        self.http_clients = http_clients or get_http_client_registry()
+        self.sources = [name for name in (sources or list(SOURCES)) if name in SOURCES]
+        self.request_timeout_seconds = request_timeout_seconds
+        self._limiters = {
+            name: _SourceLimiter(concurrency_per_source, requests_per_second)
+            for name in self.sources
+        }
+
+    async def harvest(
+        self,
+        seed: str,
+        language: str = "en",
+        country: str = "us",
+        max_depth: int = 2,
+        max_requests: int = 400,
+        max_suggestions: int = 1000,
+        time_budget_seconds: float = 2.5,
+    ) -> List[KeywordSuggestion]:
+        """
+        Harvest suggestions for a seed.
+
+        Args:
+            seed: Seed keyword
+            language: Language code
+            country: Country code
+            max_depth: 1 = alphabet-soup expansions of the seed only; each further
+                level queries the suggestions found on the previous one
+            max_requests: Total autocomplete requests across all sources
+            max_suggestions: Stop once this many unique suggestions are found
+            time_budget_seconds: Stop issuing requests after this long
+
+        Returns:
+            Unique suggestions, most frequently returned first
+        """
+        session = self.http_clients.aiohttp_session()
+        deadline = time.monotonic() + time_budget_seconds
+        seed_key = normalize_suggestion(seed)
+        found: Dict[str, _Found] = {}
+        queried = set()
+        requests_left = max_requests
+
+        level = expand_seed(seed_key)
+        for depth in range(max_depth):
+            queries = [query for query in dict.fromkeys(level) if query not in queried]
+            jobs = [(query, source) for query in queries for source in self.sources][:requests_left]
+            remaining_time = deadline - time.monotonic()
+            if not jobs or remaining_time <= 0:
+                break
+            requests_left -= len(jobs)
+            queried.update(query for query, _ in jobs)
+
+            tasks = {
+                asyncio.ensure_future(self._fetch(session, source, query, language, country)): source
+                for query, source in jobs
+            }
+            done, pending = await asyncio.wait(tasks, timeout=remaining_time)
+            for task in pending:
+                task.cancel()
+
+            new_terms = []
+            for task in done:
+                source = tasks[task]
+                for text in task.result():
+                    key = normalize_suggestion(text)
+                    if not key or key == seed_key:
+                        continue
+                    if key in found:
+                        found[key].hits += 1
+                    else:
+                        found[key] = _Found(key, SOURCES[source].name, len(found))
+                        new_terms.append(key)
+
+            logger.info(
+                f"Autocomplete depth {depth + 1} for '{seed}': {len(jobs)} requests, "
+                f"{len(new_terms)} new suggestions ({len(found)} total)"
+            )
+            if len(found) >= max_suggestions or requests_left <= 0:
+                break
+            level = new_terms
+
+        ranked = sorted(found.values(), key=lambda item: (-item.hits, item.order))
+        return [
+            KeywordSuggestion(keyword=item.text, source=item.source)
+            for item in ranked[:max_suggestions]
+        ]
+
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        source: str,
+        query: str,
+        language: str,
+        country: str,
+    ) -> List[str]:
+        """One autocomplete request; failures are counted and return no suggestions"""
+        spec = SOURCES[source]
+        limiter = self._limiters[source]
+        try:
+            async with limiter:
+                async with session.get(
+                    spec.url,
+                    params=spec.params(query, language, country),
+                    timeout=aiohttp.ClientTimeout(total=self.request_timeout_seconds),
+                ) as response:
+                    if response.status != 200:
+                        limiter.errors += 1
+                        return []
+                    # Skip MIME validation (Google answers with text/javascript)
+                    data = await response.json(content_type=None)
+            return spec.parse(data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            limiter.errors += 1
+            logger.debug(f"{source} autocomplete failed for '{query}': {e}")
+            return []
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            name: {"requests": limiter.requests, "errors": limiter.errors}
+            for name, limiter in self._limiters.items()
+        }
+
+
+# Global harvester instance (rate limits are per process, not per request)
+_autocomplete_harvester: Optional[AutocompleteHarvester] = None
+
+
+def get_autocomplete_harvester() -> AutocompleteHarvester:
+    """
+    Get or create the process-wide autocomplete harvester.
+
+    Returns:
+        AutocompleteHarvester instance
+    """
+    global _autocomplete_harvester
+    if _autocomplete_harvester is None:
+        _autocomplete_harvester = AutocompleteHarvester(
+            sources=settings.autocomplete_sources,
+            concurrency_per_source=settings.autocomplete_concurrency_per_source,
+            requests_per_second=settings.autocomplete_requests_per_second,
+            request_timeout_seconds=settings.autocomplete_request_timeout_seconds,
+        )
+    return _autocomplete_harvester
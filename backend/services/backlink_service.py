@@ -2,6 +2,10 @@ import aiohttp
 import asyncio
 from typing import List, Optional, Dict, Any
 from config import settings
+from utils.cache import get_cache_manager
+from utils.http_client import HTTPClientRegistry, PooledSessionMixin, get_http_client_registry
+from utils.single_flight import get_single_flight
+from services.backlink_store import BacklinkStore, get_backlink_store
 from exceptions import APIKeyMissingError, APIRequestError, APIRateLimitError
 from schemas.backlink_schemas import (
     BacklinkAnalysisRequest,
@@ -14,25 +18,22 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class BacklinkService:
+class BacklinkService(PooledSessionMixin):
     """
     Service for fetching backlink data using DataForSEO Backlinks API.
+    Targets with a local export (see services/backlink_store.py) are served
+    from the indexed local store instead.
     """
     
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.cache: Dict[str, BacklinkAnalysisResponse] = {}
-        
-    async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-            
+    def __init__(
+        self,
+        http_clients: Optional[HTTPClientRegistry] = None,
+        store: Optional[BacklinkStore] = None
+    ):
+        self.http_clients = http_clients or get_http_client_registry()
+        self.store = store or get_backlink_store()
+        self.cache = get_cache_manager().namespace("backlinks", BacklinkAnalysisResponse)
+
     async def analyze_backlinks(self, request: BacklinkAnalysisRequest) -> BacklinkAnalysisResponse:
         """
         Analyze backlinks for a given target.
@@ -43,109 +44,58 @@ class BacklinkService:
         Returns:
             Complete backlink analysis response
         """
-        cache_key = f"{request.target}_{request.mode}_{request.limit}"
+        # 1. Local exports, filtered and paginated by the index
+        try:
+            local = await self.store.query(request)
+        except Exception as e:
+            logger.error(f"Error querying local backlink store: {e}")
+            local = None
+        if local is not None:
+            logger.info(f"Returning local backlink data for: {request.target}")
+            return local
+        
+        cache_key = "_".join(str(part) for part in (
+            request.target, request.mode, request.limit, request.offset, request.dofollow,
+            request.min_rank, request.max_rank, request.anchor_contains
+        ))
         
         # Check cache
-        if cache_key in self.cache:
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
             logger.info(f"Returning cached backlink analysis for: {request.target}")
-            cached = self.cache[cache_key]
             cached.cached = True
             return cached
             
-        # 1. Try Local Data
-        local_data = await self._load_local_data(request.target)
-        if local_data:
-            logger.info(f"Returning local backlink data for: {request.target}")
-            result = self._map_local_data_to_response(local_data, request.target)
-            self.cache[cache_key] = result
-            return result
+        # Identical lookups already running share that call's result
+        return await get_single_flight().do(
+            "backlinks", cache_key, lambda: self._fetch_backlinks(cache_key, request)
+        )
 
+    async def _fetch_backlinks(
+        self, cache_key: str, request: BacklinkAnalysisRequest
+    ) -> BacklinkAnalysisResponse:
+        """Fetch backlinks from the first available source and cache them"""
         # Try DataForSEO if configured
         if settings.has_dataforseo():
             try:
                 result = await self._get_dataforseo_backlinks(request)
-                self.cache[cache_key] = result
+                await self.cache.set(cache_key, result)
                 return result
             except Exception as e:
                 logger.error(f"DataForSEO Backlinks API error: {e}")
         
-        # No DataForSEO or error - return mock data for demonstration
+        # No DataForSEO or error - return mock data for demonstration. Not cached:
+        # the shared cache would serve it to every worker as real data
         logger.warning("Returning mock backlink data.")
-        result = self._create_mock_backlink_response(request.target)
-        self.cache[cache_key] = result
-        return result
-
-    async def _load_local_data(self, target: str) -> Optional[Dict[str, Any]]:
-        """Check if a local JSON file exists for the domain"""
-        import os
-        import json
-        
-        # Clean target for filename
-        clean_target = target.replace("https://", "").replace("http://", "").strip("/")
-        
-        variations = [
-            clean_target,
-            f"www.{clean_target}" if not clean_target.startswith("www.") else clean_target.replace("www.", ""),
-        ]
-        
-        # Determine data directory (backend/data/backlinks)
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        data_dir = os.path.join(os.path.dirname(current_dir), "data", "backlinks")
-        
-        for var in variations:
-            file_path = os.path.join(data_dir, f"{var}.json")
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                    # Support SEMrush wrapper
-                    if "data" in data and isinstance(data["data"], dict):
-                        return data["data"]
-                    return data
-                except Exception as e:
-                    logger.error(f"Error loading local backlink file {file_path}: {e}")
-        return None
+        return self._create_mock_backlink_response(request)
 
-    def _map_local_data_to_response(self, data: Dict[str, Any], target: str) -> BacklinkAnalysisResponse:
-        """Map raw JSON data (SEMrush format) to our response model"""
-        overview = data.get("backlinks_overview", {})
-        summary = BacklinkSummary(
-            total_backlinks=overview.get("total", 0),
-            referring_domains=overview.get("domains_num", 0),
-            referring_ips=overview.get("ips_num", 0),
-            dofollow_percent=overview.get("dofollow_percent", 0.0),
-            rank=overview.get("ascore", 0)
-        )
-        
-        backlinks = []
-        for item in data.get("backlinks_list", []):
-            backlinks.append(BacklinkItem(
-                url_from=item.get("link", ""),
-                url_to=item.get("target_link", f"https://{target}/"),
-                title=item.get("link_title", "Untitled"),
-                anchor=item.get("anchor", ""),
-                rank=item.get("page_score", 0),
-                is_dofollow=not item.get("nofollow", False),
-                is_broken=item.get("lostlink", False)
-            ))
-            
-        return BacklinkAnalysisResponse(
-            target=target,
-            summary=summary,
-            backlinks=backlinks,
-            data_source="local_file"
-        )
-        
     async def _get_dataforseo_backlinks(self, request: BacklinkAnalysisRequest) -> BacklinkAnalysisResponse:
         """Fetch backlink data from DataForSEO"""
-        if not self.session:
-            raise RuntimeError("Session not initialized. Use async context manager.")
-            
         # 1. Fetch Summary
         summary = await self._fetch_summary(request.target, request.mode)
         
         # 2. Fetch Detailed Links
-        links = await self._fetch_links(request.target, request.mode, request.limit)
+        links = await self._fetch_links(request)
         
         return BacklinkAnalysisResponse(
             target=request.target,
@@ -171,14 +121,27 @@ class BacklinkService:
             data = await response.json()
             return self._parse_summary_response(data)
             
-    async def _fetch_links(self, target: str, mode: str, limit: int) -> List[BacklinkItem]:
-        """Fetch detailed links from DataForSEO"""
+    async def _fetch_links(self, request: BacklinkAnalysisRequest) -> List[BacklinkItem]:
+        """Fetch one page of detailed links from DataForSEO, filtered server-side"""
         url = "https://api.dataforseo.com/v3/backlinks/links/live"
         auth = aiohttp.BasicAuth(login=settings.dataforseo_login, password=settings.dataforseo_password)
         
+        mode = request.mode
         dfseo_mode = "as_domain" if mode == "domain" else ("as_subdomain" if mode == "subdomain" else "as_url")
         
-        payload = [{"target": target, "mode": dfseo_mode, "limit": limit, "order_by": ["rank,desc"]}]
+        task = {
+            "target": request.target,
+            "mode": dfseo_mode,
+            "limit": request.limit,
+            "offset": request.offset,
+            "order_by": ["rank,desc"],
+            # Ranks on the same 0-100 scale as local exports and min_rank/max_rank
+            "rank_scale": "one_hundred",
+        }
+        filters = self._dataforseo_filters(request)
+        if filters:
+            task["filters"] = filters
+        payload = [task]
         
         async with self.session.post(url, json=payload, auth=auth) as response:
             if response.status != 200:
@@ -187,6 +150,25 @@ class BacklinkService:
             data = await response.json()
             return self._parse_links_response(data)
             
+    def _dataforseo_filters(self, request: BacklinkAnalysisRequest) -> List[Any]:
+        """DataForSEO filter expression for the request's filters"""
+        conditions = []
+        if request.dofollow is not None:
+            conditions.append(["dofollow", "=", request.dofollow])
+        if request.min_rank is not None:
+            conditions.append(["rank", ">=", request.min_rank])
+        if request.max_rank is not None:
+            conditions.append(["rank", "<=", request.max_rank])
+        if request.anchor_contains:
+            conditions.append(["anchor", "like", f"%{request.anchor_contains}%"])
+        
+        filters: List[Any] = []
+        for condition in conditions:
+            if filters:
+                filters.append("and")
+            filters.append(condition)
+        return filters
+    
     def _parse_summary_response(self, data: Dict[str, Any]) -> BacklinkSummary:
         """Parse DataForSEO summary response"""
         try:
@@ -227,8 +209,9 @@ class BacklinkService:
             logger.error(f"Error parsing links: {e}")
         return items
         
-    def _create_mock_backlink_response(self, target: str) -> BacklinkAnalysisResponse:
-        """Create mock data for demonstration"""
+    def _create_mock_backlink_response(self, request: BacklinkAnalysisRequest) -> BacklinkAnalysisResponse:
+        """Create mock data for demonstration (filtered and paginated like real data)"""
+        target = request.target
         summary = BacklinkSummary(
             total_backlinks=1250,
             referring_domains=450,
@@ -272,10 +255,20 @@ class BacklinkService:
             )
         ]
         
+        anchor = (request.anchor_contains or "").lower()
+        backlinks = [
+            link for link in backlinks
+            if (request.dofollow is None or link.is_dofollow == request.dofollow)
+            and (request.min_rank is None or link.rank >= request.min_rank)
+            and (request.max_rank is None or link.rank <= request.max_rank)
+            and anchor in (link.anchor or "").lower()
+        ]
+        
         return BacklinkAnalysisResponse(
             target=target,
             summary=summary,
-            backlinks=backlinks,
+            backlinks=backlinks[request.offset:request.offset + request.limit],
+            total_matching=len(backlinks),
             data_source="mock"
         )
 
@@ -0,0 +1,368 @@
+"""
+Local Backlink Store
+Indexed store for backlink exports (SEMrush JSON) dropped into data/backlinks/.
+
+Exports are ingested once into SQLite (data/backlinks.sqlite3) instead of being
+parsed on every request: one row per backlink, indexed by target domain and
+rank, plus the export's overview per domain. Queries filter (dofollow, rank
+range, anchor text) and paginate in SQL, so a request only ever materializes
+the page it returns.
+
+Files in data/backlinks/ are synced on app startup. While the app runs, a
+lookup re-ingests its target's export if the file changed, and a target with no
+stored export triggers a re-scan of the directory (at most every
+EXPORTS_RESCAN_SECONDS), so exports dropped in later are picked up without a
+restart. Large exports can be ingested ahead of time with
+`python ingest_backlinks.py`. All SQLite work runs on one dedicated thread.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from config import settings
+from schemas.backlink_schemas import (
+    BacklinkAnalysisRequest,
+    BacklinkAnalysisResponse,
+    BacklinkItem,
+    BacklinkSummary,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DEFAULT_EXPORTS_DIR = os.path.join(_DATA_DIR, "backlinks")
+DEFAULT_STORE_PATH = os.path.join(_DATA_DIR, "backlinks.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS targets (
+    domain TEXT PRIMARY KEY,
+    total_backlinks INTEGER NOT NULL,
+    referring_domains INTEGER NOT NULL,
+    referring_ips INTEGER NOT NULL,
+    dofollow_percent REAL NOT NULL,
+    rank INTEGER NOT NULL,
+    links_stored INTEGER NOT NULL,
+    source_file TEXT,
+    source_mtime REAL,
+    ingested_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS backlinks (
+    id INTEGER PRIMARY KEY,
+    domain TEXT NOT NULL,
+    url_from TEXT NOT NULL,
+    url_to TEXT NOT NULL,
+    title TEXT,
+    anchor TEXT,
+    rank INTEGER NOT NULL,
+    is_dofollow INTEGER NOT NULL,
+    is_broken INTEGER NOT NULL,
+    first_seen TEXT,
+    last_seen TEXT
+);
+-- Anchor is included so filtered counts are answered from the index alone
+CREATE INDEX IF NOT EXISTS backlinks_domain_rank ON backlinks (domain, rank DESC, anchor);
+CREATE INDEX IF NOT EXISTS backlinks_domain_dofollow_rank ON backlinks (domain, is_dofollow, rank DESC, anchor);
+"""
+
+# Minimum gap between directory re-scans triggered by lookups of unknown targets
+EXPORTS_RESCAN_SECONDS = 30.0
+
+_ITEM_COLUMNS = "url_from, url_to, title, anchor, rank, is_dofollow, is_broken, first_seen, last_seen"
+
+
+def target_domain(target: str) -> str:
+    """Store key for a target: host without scheme, "www." or trailing slash"""
+    domain = target.strip().lower()
+    for scheme in ("https://", "http://"):
+        if domain.startswith(scheme):
+            domain = domain[len(scheme):]
+    domain = domain.strip("/")
+    return domain[4:] if domain.startswith("www.") else domain
+
+
+def _export_rows(domain: str, data: Dict[str, Any]) -> Tuple[tuple, List[tuple]]:
+    """Target and backlink rows from a SEMrush export"""
+    overview = data.get("backlinks_overview", {})
+    target = (
+        domain,
+        overview.get("total", 0),
+        overview.get("domains_num", 0),
+        overview.get("ips_num", 0),
+        overview.get("dofollow_percent", 0.0),
+        overview.get("ascore", 0),
+    )
+    links = [
+        (
+            domain,
+            item.get("link", ""),
+            item.get("target_link", f"https://{domain}/"),
+            item.get("link_title", "Untitled"),
+            item.get("anchor", ""),
+            item.get("page_score", 0),
+            0 if item.get("nofollow", False) else 1,
+            1 if item.get("lostlink", False) else 0,
+            item.get("first_seen"),
+            item.get("last_seen"),
+        )
+        for item in data.get("backlinks_list", [])
+    ]
+    return target, links
+
+
+class BacklinkStore:
+    """
+    SQLite-backed backlink index keyed by target domain.
+
+    Usage:
+        response = await get_backlink_store().query(request)  # None if not stored
+    """
+
+    def __init__(self, path: str, exports_dir: Optional[str] = DEFAULT_EXPORTS_DIR):
+        self.path = path
+        self.exports_dir = exports_dir
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backlink-store")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_scan = 0.0
+        self.queries = 0
+        self.hits = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Only ever called on the store thread (or synchronously by the ingest script)
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Access is serialized (store thread or the ingest script), never concurrent
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(self._connection()))
+
+    def ingest_file(self, path: str, domain: Optional[str] = None) -> int:
+        """
+        Ingest one export (synchronous), replacing what was stored for its domain.
+
+        Args:
+            path: SEMrush JSON export, optionally wrapped in {"data": {...}}
+            domain: Target domain (default: the name of the .json file)
+
+        Returns:
+            Number of backlinks stored (0 for exports without backlink data)
+        """
+        name = os.path.basename(path)
+        if domain is None:
+            if not name.endswith(".json"):
+                raise ValueError(f"Cannot tell the domain of {path}: expected <domain>.json")
+            domain = name[: -len(".json")]
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # Support SEMrush wrapper
+        if "data" in data and isinstance(data["data"], dict):
+            data = data["data"]
+        if "backlinks_overview" not in data and "backlinks_list" not in data:
+            logger.warning(f"No backlink data in {path}, skipping")
+            return 0
+
+        domain = target_domain(domain)
+        target, links = _export_rows(domain, data)
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM backlinks WHERE domain = ?", (domain,))
+            conn.executemany(
+                f"INSERT INTO backlinks (domain, {_ITEM_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                links,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO targets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*target, len(links), os.path.abspath(path), os.path.getmtime(path), time.time()),
+            )
+        logger.info(f"Ingested {len(links)} backlinks for {domain} from {path}")
+        return len(links)
+
+    def sync_directory(self, exports_dir: str) -> int:
+        """Ingest exports that are new or modified since their last ingestion (synchronous)"""
+        self._last_scan = time.monotonic()
+        if not os.path.isdir(exports_dir):
+            return 0
+        conn = self._connection()
+        ingested = dict(conn.execute("SELECT source_file, source_mtime FROM targets").fetchall())
+        count = 0
+        for name in sorted(os.listdir(exports_dir)):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.abspath(os.path.join(exports_dir, name))
+            if ingested.get(path) == os.path.getmtime(path):
+                continue
+            try:
+                if self.ingest_file(path):
+                    count += 1
+            except Exception as e:
+                logger.error(f"Error ingesting backlink export {path}: {e}")
+        return count
+
+    async def sync(self) -> int:
+        """Ingest new or modified exports from the exports directory (on app startup)"""
+        if not self.exports_dir:
+            return 0
+        return await self._run(lambda conn: self.sync_directory(self.exports_dir))
+
+    def _refresh(self, conn: sqlite3.Connection, domain: str) -> None:
+        """Pick up export changes for a target before it is queried (store thread)"""
+        row = conn.execute(
+            "SELECT source_file, source_mtime FROM targets WHERE domain = ?", (domain,)
+        ).fetchone()
+        if row is None:
+            if self.exports_dir and time.monotonic() - self._last_scan >= EXPORTS_RESCAN_SECONDS:
+                self.sync_directory(self.exports_dir)
+            return
+
+        source_file, source_mtime = row
+        if not source_file:
+            return
+        try:
+            mtime = os.path.getmtime(source_file)
+        except OSError:
+            # The export was removed: stop serving it
+            with conn:
+                conn.execute("DELETE FROM backlinks WHERE domain = ?", (domain,))
+                conn.execute("DELETE FROM targets WHERE domain = ?", (domain,))
+            logger.info(f"Backlink export for {domain} removed, dropped it from the store")
+            return
+        if mtime != source_mtime:
+            try:
+                self.ingest_file(source_file, domain)
+            except Exception as e:
+                logger.error(f"Error re-ingesting backlink export {source_file}: {e}")
+
+    async def query(self, request: BacklinkAnalysisRequest) -> Optional[BacklinkAnalysisResponse]:
+        """
+        One page of stored backlinks for the request's target, best rank first.
+
+        Returns:
+            The response, or None when the target has no stored export
+        """
+        domain = target_domain(request.target)
+        where = ["domain = ?"]
+        params: List[Any] = [domain]
+        if request.dofollow is not None:
+            where.append("is_dofollow = ?")
+            params.append(1 if request.dofollow else 0)
+        if request.min_rank is not None:
+            where.append("rank >= ?")
+            params.append(request.min_rank)
+        if request.max_rank is not None:
+            where.append("rank <= ?")
+            params.append(request.max_rank)
+        if request.anchor_contains:
+            where.append("instr(lower(anchor), ?) > 0")
+            params.append(request.anchor_contains.lower())
+        filtered = len(where) > 1
+        condition = " AND ".join(where)
+
+        def query(conn: sqlite3.Connection):
+            self._refresh(conn, domain)
+            target = conn.execute(
+                "SELECT total_backlinks, referring_domains, referring_ips, dofollow_percent, rank, links_stored "
+                "FROM targets WHERE domain = ?",
+                (domain,),
+            ).fetchone()
+            if target is None:
+                return None
+            matching = target[-1]
+            if filtered:
+                matching = conn.execute(f"SELECT COUNT(*) FROM backlinks WHERE {condition}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {_ITEM_COLUMNS} FROM backlinks WHERE {condition} "
+                f"ORDER BY rank DESC, id LIMIT ? OFFSET ?",
+                (*params, request.limit, request.offset),
+            ).fetchall()
+            return target, matching, rows
+
+        self.queries += 1
+        result = await self._run(query)
+        if result is None:
+            return None
+        self.hits += 1
+
+        (total, domains_num, ips_num, dofollow_percent, rank, _), matching, rows = result
+        return BacklinkAnalysisResponse(
+            target=request.target,
+            summary=BacklinkSummary(
+                total_backlinks=total,
+                referring_domains=domains_num,
+                referring_ips=ips_num,
+                dofollow_percent=dofollow_percent,
+                rank=rank,
+            ),
+            backlinks=[
+                BacklinkItem(
+                    url_from=url_from,
+                    url_to=url_to,
+                    title=title,
+                    anchor=anchor,
+                    rank=link_rank,
+                    is_dofollow=bool(is_dofollow),
+                    is_broken=bool(is_broken),
+                    first_seen=first_seen,
+                    last_seen=last_seen,
+                )
+                for url_from, url_to, title, anchor, link_rank, is_dofollow, is_broken, first_seen, last_seen in rows
+            ],
+            total_matching=matching,
+            data_source="local_file",
+        )
+
+    async def metrics(self) -> Dict[str, Any]:
+        targets, links = await self._run(lambda conn: conn.execute(
+            "SELECT (SELECT COUNT(*) FROM targets), (SELECT COUNT(*) FROM backlinks)"
+        ).fetchone())
+        return {"targets": targets, "backlinks": links, "queries": self.queries, "hits": self.hits}
+
+    def close(self) -> None:
+        def close_connection() -> None:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        self._executor.submit(close_connection).result()
+        self._executor.shutdown(wait=True)
+
+
+# Global store instance (one connection and thread per process)
+_backlink_store: Optional[BacklinkStore] = None
+
+
+def get_backlink_store() -> BacklinkStore:
+    """
+    Get or create the process-wide backlink store.
+
+    Returns:
+        BacklinkStore instance
+    """
+    global _backlink_store
+    if _backlink_store is None:
+        _backlink_store = BacklinkStore(settings.backlink_store_path or DEFAULT_STORE_PATH)
+    return _backlink_store
+
+
+def shutdown_backlink_store() -> None:
+    """Close the store connection and its thread (called on app shutdown)"""
+    global _backlink_store
+    if _backlink_store is not None:
+        _backlink_store.close()
+        _backlink_store = None
@@ -4,6 +4,8 @@ import re
 from typing import List, Dict, Any
 from schemas.competitor_schemas import CompetitorRequest, CompetitorResponse, CompetitorMetrics
 from urllib.parse import urlparse
+from utils.http_client import get_http_client_registry
+from utils.process_pool import run_cpu_bound
 
 class CompetitorAnalyzerService:
     @staticmethod
@@ -12,16 +14,32 @@ class CompetitorAnalyzerService:
         keyword = request.keyword.lower()
         
         try:
-            async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                }
-                response = await client.get(url_str, headers=headers)
-                response.raise_for_status()
-                html_content = response.text
+            client = get_http_client_registry().httpx_client()
+            headers = {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+            }
+            response = await client.get(url_str, headers=headers, timeout=15.0, follow_redirects=True)
+            response.raise_for_status()
+            html_content = response.text
         except httpx.RequestError as e:
             raise Exception(f"Failed to fetch competitor page: {str(e)}")
         
+        # Parse and measure in the process pool so large pages don't block the event loop
+        metrics = await run_cpu_bound(
+            CompetitorAnalyzerService._extract_metrics, html_content, url_str, keyword
+        )
+
+        insights = CompetitorAnalyzerService._generate_insights(metrics, keyword)
+
+        return CompetitorResponse(
+            url=url_str,
+            keyword=keyword,
+            metrics=metrics,
+            insights=insights
+        )
+
+    @staticmethod
+    def _extract_metrics(html_content: str, url_str: str, keyword: str) -> CompetitorMetrics:
         soup = BeautifulSoup(html_content, 'html.parser')
         
         # Remove script and style elements
@@ -76,14 +94,7 @@ class CompetitorAnalyzerService:
             external_links=external_links
         )
 
-        insights = CompetitorAnalyzerService._generate_insights(metrics, keyword)
-
-        return CompetitorResponse(
-            url=url_str,
-            keyword=keyword,
-            metrics=metrics,
-            insights=insights
-        )
+        return metrics
 
     @staticmethod
     def _generate_insights(metrics: CompetitorMetrics, keyword: str) -> List[str]:
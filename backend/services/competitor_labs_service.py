@@ -2,6 +2,9 @@ import aiohttp
 import asyncio
 from typing import List, Optional, Dict, Any
 from config import settings
+from utils.cache import get_cache_manager
+from utils.http_client import HTTPClientRegistry, PooledSessionMixin, get_http_client_registry
+from utils.single_flight import get_single_flight
 from schemas.competitor_schemas import (
     DomainOverview,
     RankedKeyword,
@@ -14,18 +17,10 @@ import json
 
 logger = logging.getLogger(__name__)
 
-class CompetitorLabsService:
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.cache: Dict[str, DomainIntelligenceResponse] = {}
-
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+class CompetitorLabsService(PooledSessionMixin):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
+        self.http_clients = http_clients or get_http_client_registry()
+        self.cache = get_cache_manager().namespace("domain_intelligence", DomainIntelligenceResponse)
 
     async def analyze_domain(self, domain: str) -> DomainIntelligenceResponse:
         """
@@ -36,15 +31,23 @@ class CompetitorLabsService:
         3. Mock data (fallback)
         """
         cache_key = domain
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached
 
+        # Identical lookups already running share that call's result
+        return await get_single_flight().do(
+            "domain_intelligence", cache_key, lambda: self._fetch_domain(cache_key, domain)
+        )
+
+    async def _fetch_domain(self, cache_key: str, domain: str) -> DomainIntelligenceResponse:
+        """Build domain intelligence from the first available source and cache it"""
         # 1. Try Local Data
         local_data = await self._load_local_data(domain)
         if local_data:
             logger.info(f"Using local competitor data for: {domain}")
             result = self._map_local_data_to_response(local_data, domain)
-            self.cache[cache_key] = result
+            await self.cache.set(cache_key, result)
             return result
 
         # 2. Try DataForSEO if configured
@@ -52,22 +55,18 @@ class CompetitorLabsService:
             try:
                 logger.info(f"Fetching live DataForSEO Labs data for: {domain}")
                 result = await self._get_dataforseo_domain_intelligence(domain)
-                self.cache[cache_key] = result
+                await self.cache.set(cache_key, result)
                 return result
             except Exception as e:
                 logger.error(f"DataForSEO Labs API error: {e}")
 
-        # 3. Fallback to Mock Data
+        # 3. Fallback to Mock Data (not cached, so a transient API error isn't
+        # served from the shared cache as real data)
         logger.info(f"Generating mock competitor data for: {domain}")
-        result = self._create_mock_response(domain)
-        self.cache[cache_key] = result
-        return result
+        return self._create_mock_response(domain)
 
     async def _get_dataforseo_domain_intelligence(self, domain: str) -> DomainIntelligenceResponse:
         """Fetch real-time data from DataForSEO Labs API"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-
         auth = aiohttp.BasicAuth(settings.dataforseo_login, settings.dataforseo_password)
         base_url = "https://api.dataforseo.com/v3/dataforseo_labs"
         
@@ -0,0 +1,199 @@
+"""
+Image Probe
+Measures page images for the technical audit: file size, format and intrinsic
+pixel dimensions. Each image is probed with one small ranged GET - the total
+size comes from Content-Range/Content-Length and PIL reads the dimensions from
+the header bytes - and results are cached per image URL across audits.
+"""
+
+import asyncio
+import io
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from PIL import Image
+
+from config import settings
+from utils.cache import get_cache_manager
+from utils.http_client import HTTPClientRegistry, get_http_client_registry
+from utils.url_utils import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Formats that don't need converting to WebP/AVIF
+MODERN_FORMATS = {"WEBP", "AVIF"}
+# Vector/icon formats where WebP/AVIF advice doesn't apply
+NON_RASTER_FORMATS = {"SVG", "ICO"}
+
+_CONTENT_RANGE_TOTAL = re.compile(r"/\s*(\d+)\s*$")
+
+# Fallback when PIL can't identify the sampled bytes
+_CONTENT_TYPE_FORMATS = {
+    "image/jpeg": "JPEG",
+    "image/jpg": "JPEG",
+    "image/png": "PNG",
+    "image/gif": "GIF",
+    "image/webp": "WEBP",
+    "image/avif": "AVIF",
+    "image/bmp": "BMP",
+    "image/tiff": "TIFF",
+    "image/x-icon": "ICO",
+    "image/vnd.microsoft.icon": "ICO",
+}
+
+
+@dataclass
+class ImageProbeResult:
+    """What we learned about an image without downloading all of it"""
+
+    file_size_bytes: Optional[int] = None
+    format: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def is_modern_format(self) -> bool:
+        return self.format in MODERN_FORMATS
+
+    @property
+    def is_raster(self) -> bool:
+        return self.format is not None and self.format not in NON_RASTER_FORMATS
+
+
+class ImageProber:
+    """
+    Probes image URLs with ranged GETs, caching results and limiting
+    concurrent requests per (CDN) host.
+    """
+
+    # Enough for PIL to find the dimensions of nearly all JPEG/PNG/GIF/WebP/AVIF files
+    HEADER_BYTES = 16384
+    TIMEOUT = 5
+    ERROR_CACHE_TTL = 300
+
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
+        self.http_clients = http_clients or get_http_client_registry()
+        self.cache = get_cache_manager().namespace(
+            "image_probe", ImageProbeResult, settings.image_probe_cache_ttl_seconds
+        )
+        self.per_host_limit = settings.image_probe_concurrency_per_host
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    async def probe(self, url: str, headers: Optional[Dict[str, str]] = None) -> ImageProbeResult:
+        """
+        Probe a single image.
+
+        Args:
+            url: Absolute image URL
+            headers: Request headers (e.g. User-Agent)
+
+        Returns:
+            ImageProbeResult (from cache when probed recently)
+        """
+        key = normalize_url(url)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._probe(key, url, headers or {}))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def probe_many(
+        self, urls: List[str], headers: Optional[Dict[str, str]] = None
+    ) -> List[ImageProbeResult]:
+        """Probe several images; results are returned in input order"""
+        return await asyncio.gather(*(self.probe(url, headers) for url in urls))
+
+    async def _probe(self, key: str, url: str, headers: Dict[str, str]) -> ImageProbeResult:
+        host = urlparse(key).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+
+        request_headers = {
+            **headers,
+            # Ask for what a modern browser accepts, so content-negotiating CDNs
+            # report the format real visitors get
+            "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
+            "Range": f"bytes=0-{self.HEADER_BYTES - 1}",
+        }
+        client = self.http_clients.httpx_client("audit", verify=False)
+
+        async with semaphore:
+            try:
+                async with client.stream(
+                    "GET", url, headers=request_headers, timeout=self.TIMEOUT, follow_redirects=True
+                ) as response:
+                    if response.status_code >= 400:
+                        result = ImageProbeResult(error=f"HTTP {response.status_code}")
+                    else:
+                        data = bytearray()
+                        async for chunk in response.aiter_bytes():
+                            data.extend(chunk)
+                            if len(data) >= self.HEADER_BYTES:
+                                break
+                        result = self._describe(response, bytes(data))
+                ttl = None
+            except Exception as e:
+                logger.debug(f"Image probe failed for {url}: {e}")
+                result = ImageProbeResult(error=str(e) or type(e).__name__)
+                ttl = self.ERROR_CACHE_TTL
+
+        await self.cache.set(key, result, ttl)
+        return result
+
+    @staticmethod
+    def _describe(response, data: bytes) -> ImageProbeResult:
+        """Build a probe result from the response headers and leading bytes"""
+        size = None
+        content_range = response.headers.get("Content-Range")
+        if response.status_code == 206 and content_range:
+            match = _CONTENT_RANGE_TOTAL.search(content_range)
+            if match:
+                size = int(match.group(1))
+        elif response.headers.get("Content-Length"):
+            size = int(response.headers["Content-Length"])
+
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        result = ImageProbeResult(file_size_bytes=size)
+
+        if content_type == "image/svg+xml" or data.lstrip()[:5] in (b"<?xml", b"<svg "):
+            result.format = "SVG"
+            return result
+
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                result.format = image.format
+                result.width, result.height = image.size
+        except Exception:
+            # Header didn't fit in the sampled bytes or the format is unknown to PIL;
+            # fall back to the declared content type for the format
+            result.format = _CONTENT_TYPE_FORMATS.get(content_type)
+        return result
+
+
+# Global image prober instance
+_image_prober: Optional[ImageProber] = None
+
+
+def get_image_prober() -> ImageProber:
+    """
+    Get or create the shared image prober.
+
+    Returns:
+        ImageProber instance
+    """
+    global _image_prober
+    if _image_prober is None:
+        _image_prober = ImageProber()
+    return _image_prober
@@ -0,0 +1,198 @@
+"""
+Local Intent Classifier
+Fast path in front of the LLM for search-intent classification.
+
+1. Modifier lexicon: keywords containing an unambiguous modifier ("buy", "near me",
+   "how to", "vs", "best", "login", ...) are answered immediately.
+2. Learned model: a small TF-IDF + logistic regression model trained on the intents
+   the LLM has already returned, including ones served from the intent cache, so a
+   fresh worker relearns from cached labels. It only answers when its probability
+   clears settings.intent_local_min_confidence.
+
+Anything else is left to the LLM, whose answers become new training labels.
+"""
+
+import asyncio
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from schemas.keyword_schemas import SearchIntent
+from utils.process_pool import run_cpu_bound
+
+logger = logging.getLogger(__name__)
+
+
+class IntentSource:
+    """Which path produced an intent"""
+
+    LEXICON = "lexicon"
+    MODEL = "model"
+    CACHE = "cache"
+    LLM = "llm"
+
+
+@dataclass
+class IntentPrediction:
+    """An intent and where it came from"""
+
+    intent: SearchIntent
+    source: str
+    confidence: Optional[float] = None
+
+
+INTENT_LEXICON: Dict[SearchIntent, List[str]] = {
+    SearchIntent.TRANSACTIONAL: [
+        # Bare "order" / "shop" are ambiguous ("order of operations", "shop vac reviews")
+        r"\bbuy\b", r"\bpurchase\b", r"\border (now|online)\b", r"\bprices?\b", r"\bpricing\b",
+        r"\bcheap(est)?\b", r"\bdiscounts?\b", r"\bcoupons?\b", r"\bpromo codes?\b",
+        r"\bdeals?\b", r"\bfor sale\b", r"\bnear me\b", r"\bdownload\b",
+        r"\bfree trial\b", r"\bsubscribe\b", r"\bhire\b", r"\bshop online\b",
+    ],
+    SearchIntent.COMMERCIAL: [
+        r"\bbest\b", r"\btop\s+\d+\b", r"\bvs\.?\b", r"\bversus\b", r"\breviews?\b",
+        r"\bcompar(e|ison)\b", r"\balternatives?\b", r"\bpros and cons\b",
+    ],
+    SearchIntent.INFORMATIONAL: [
+        r"^(how|what|why|when|where|who|which|can|does|do|is|are)\b", r"\bhow to\b",
+        r"\bguide\b", r"\btutorial\b", r"\bexamples?\b", r"\bmeaning\b",
+        r"\bdefinition\b", r"\bideas\b", r"\btips\b", r"\bsteps\b",
+    ],
+    SearchIntent.NAVIGATIONAL: [
+        r"\blog\s?in\b", r"\bsign\s?in\b", r"\bofficial (site|website)\b",
+        r"\.(com|org|net|io|co)\b", r"\bcustomer (service|support)\b", r"\bwebsite\b",
+    ],
+}
+
+_COMPILED_LEXICON: List[Tuple[SearchIntent, re.Pattern]] = [
+    (intent, re.compile("|".join(patterns)))
+    for intent, patterns in INTENT_LEXICON.items()
+]
+
+# Confidence reported for a single unambiguous lexicon match
+LEXICON_CONFIDENCE = 0.95
+
+
+def _train_intent_model(texts: List[str], labels: List[str]):
+    """Fit the TF-IDF + logistic regression model (runs in the process pool)"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+
+    model = make_pipeline(
+        TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True),
+        LogisticRegression(max_iter=1000, class_weight="balanced"),
+    )
+    model.fit(texts, labels)
+    return model
+
+
+class LocalIntentClassifier:
+    """Lexicon + learned model answering high-confidence intent lookups locally"""
+
+    MAX_LABELS = 20000
+    # Retrain after this many new LLM labels
+    RETRAIN_EVERY = 100
+
+    def __init__(self):
+        self.min_confidence = settings.intent_local_min_confidence
+        self.min_samples = settings.intent_model_min_samples
+        self._labels: "OrderedDict[str, str]" = OrderedDict()
+        self._new_labels = 0
+        self._model = None
+        self._training: Optional[asyncio.Task] = None
+
+    def predict(self, keyword: str) -> Optional[IntentPrediction]:
+        """
+        Classify a normalized keyword locally.
+
+        Returns:
+            IntentPrediction, or None when the keyword should go to the LLM
+        """
+        matched = [intent for intent, pattern in _COMPILED_LEXICON if pattern.search(keyword)]
+        if len(matched) == 1:
+            return IntentPrediction(matched[0], IntentSource.LEXICON, LEXICON_CONFIDENCE)
+        return None
+
+    async def predict_with_model(self, keywords: List[str]) -> Dict[str, IntentPrediction]:
+        """
+        Classify keywords with the learned model, keeping only confident answers.
+        Inference runs in a worker thread so large batches don't stall the event loop.
+
+        Returns:
+            Mapping of keyword to IntentPrediction for the confident ones
+        """
+        model = self._model
+        if model is None or not keywords:
+            return {}
+
+        predictions = {}
+        classes = model.classes_
+        probabilities_per_keyword = await asyncio.to_thread(model.predict_proba, keywords)
+        for keyword, probabilities in zip(keywords, probabilities_per_keyword):
+            best = probabilities.argmax()
+            if probabilities[best] >= self.min_confidence:
+                predictions[keyword] = IntentPrediction(
+                    SearchIntent(classes[best]), IntentSource.MODEL, round(float(probabilities[best]), 3)
+                )
+        return predictions
+
+    def learn(self, labels: Dict[str, SearchIntent]) -> None:
+        """
+        Record LLM labels - fresh answers or ones served from the intent cache - and
+        retrain in the background when enough are new. Feeding cache hits back in lets
+        each worker rebuild its model after a restart without new LLM calls.
+        """
+        for keyword, intent in labels.items():
+            if intent == SearchIntent.UNKNOWN:
+                continue
+            previous = self._labels.pop(keyword, None)
+            self._labels[keyword] = intent.value
+            # A label seen again (e.g. a repeat cache hit) is no reason to retrain
+            if previous != intent.value:
+                self._new_labels += 1
+        while len(self._labels) > self.MAX_LABELS:
+            self._labels.popitem(last=False)
+
+        ready = (
+            len(self._labels) >= self.min_samples
+            and len(set(self._labels.values())) >= 2
+            and (self._model is None or self._new_labels >= self.RETRAIN_EVERY)
+        )
+        if ready and (self._training is None or self._training.done()):
+            self._new_labels = 0
+            self._training = asyncio.ensure_future(self._retrain())
+
+    async def _retrain(self) -> None:
+        texts, labels = list(self._labels.keys()), list(self._labels.values())
+        try:
+            self._model = await run_cpu_bound(_train_intent_model, texts, labels)
+            logger.info(f"Retrained local intent model on {len(texts)} LLM labels")
+        except Exception as e:
+            logger.warning(f"Local intent model training failed: {e}")
+
+    def metrics(self) -> Dict[str, object]:
+        return {
+            "labels": len(self._labels),
+            "model_trained": self._model is not None,
+        }
+
+
+# Global classifier instance (labels accumulate across requests)
+_local_intent_classifier: Optional[LocalIntentClassifier] = None
+
+
+def get_local_intent_classifier() -> LocalIntentClassifier:
+    """
+    Get or create the shared local intent classifier.
+
+    Returns:
+        LocalIntentClassifier instance
+    """
+    global _local_intent_classifier
+    if _local_intent_classifier is None:
+        _local_intent_classifier = LocalIntentClassifier()
+    return _local_intent_classifier
@@ -0,0 +1,248 @@
+"""
+Keyword Clustering Service
+Groups keywords locally (TF-IDF over word and character n-grams, plus SERP-overlap
+similarity when top-ranking URLs are known) so clustering scales to 10k+ keywords
+without an LLM. Engines:
+
+- local:  grouping, naming and intent all computed locally
+- llm:    the LLM groups the keywords (original behaviour, prompt-size bound)
+- hybrid: grouped locally, then the LLM names each cluster and writes its
+          recommendation in one small batched call
+"""
+
+import logging
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from schemas.keyword_schemas import ClusteringEngine, KeywordCluster, KeywordMetrics, SearchIntent
+from services.intent_classifier import get_local_intent_classifier
+from utils.process_pool import run_cpu_bound
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LocalClusteringResult:
+    """Picklable output of the clustering worker"""
+
+    # Cluster index per keyword, in input order
+    labels: List[int]
+    # Index of the keyword closest to each cluster's centroid
+    representatives: List[int]
+    # Most characteristic terms of each cluster
+    top_terms: List[List[str]]
+
+
+# Above this many keywords, agglomerative clustering (O(n^2) memory) gives way to k-means
+AGGLOMERATIVE_MAX_KEYWORDS = 2000
+LSA_COMPONENTS = 100
+SERP_WEIGHT = 1.0
+
+
+def auto_cluster_count(n: int) -> int:
+    """Default cluster count when the caller doesn't pick one"""
+    return max(2, min(n // 5, int(math.sqrt(n)) + 1, 200)) if n >= 4 else 1
+
+
+def cluster_keyword_texts(
+    keywords: List[str],
+    num_clusters: int,
+    serp_urls: Optional[List[List[str]]] = None,
+) -> LocalClusteringResult:
+    """
+    Cluster keyword strings (runs in the process pool).
+
+    Args:
+        keywords: Keyword strings
+        num_clusters: Number of clusters to produce
+        serp_urls: Top-ranking URLs per keyword (same order), if known
+
+    Returns:
+        LocalClusteringResult
+    """
+    import numpy as np
+    from scipy import sparse
+    from sklearn.cluster import AgglomerativeClustering, MiniBatchKMeans
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import normalize
+
+    n = len(keywords)
+    num_clusters = max(1, min(num_clusters, n))
+
+    # Keep 1-character tokens ("a", "x", "3"); the default pattern drops them
+    word_vectorizer = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, token_pattern=r"(?u)\b\w+\b")
+    char_vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(3, 5), sublinear_tf=True)
+    try:
+        word_matrix = word_vectorizer.fit_transform(keywords)
+        terms = word_vectorizer.get_feature_names_out()
+    except ValueError:
+        # No word tokens at all (e.g. only punctuation): the character block alone
+        word_matrix = sparse.csr_matrix((n, 0))
+        terms = np.array([], dtype=object)
+    blocks = [word_matrix, char_vectorizer.fit_transform(keywords)]
+
+    if serp_urls and any(serp_urls):
+        # Keywords that share ranking URLs target the same page; a normalized
+        # keyword x URL incidence block makes that overlap part of the cosine
+        url_index: Dict[str, int] = {}
+        rows, cols = [], []
+        for row, urls in enumerate(serp_urls):
+            for url in set(urls or []):
+                rows.append(row)
+                cols.append(url_index.setdefault(url, len(url_index)))
+        serp_matrix = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(n, len(url_index))
+        )
+        blocks.append(normalize(serp_matrix) * SERP_WEIGHT)
+
+    features = normalize(sparse.hstack(blocks).tocsr())
+
+    # Latent semantic space: denser, smaller and groups near-synonymous n-grams
+    components = min(LSA_COMPONENTS, features.shape[1] - 1, n - 1)
+    if components >= 2:
+        vectors = TruncatedSVD(n_components=components, random_state=0).fit_transform(features)
+    else:
+        vectors = features.toarray()
+    vectors = normalize(vectors)
+
+    if num_clusters == 1:
+        labels = np.zeros(n, dtype=int)
+    elif n <= AGGLOMERATIVE_MAX_KEYWORDS:
+        labels = AgglomerativeClustering(n_clusters=num_clusters, linkage="ward").fit_predict(vectors)
+    else:
+        labels = MiniBatchKMeans(
+            n_clusters=num_clusters, random_state=0, n_init=3, batch_size=2048
+        ).fit_predict(vectors)
+
+    representatives, top_terms = [], []
+    cluster_ids = sorted(set(labels.tolist()))
+    remap = {cluster_id: i for i, cluster_id in enumerate(cluster_ids)}
+    for cluster_id in cluster_ids:
+        members = np.flatnonzero(labels == cluster_id)
+        centroid = vectors[members].mean(axis=0)
+        representatives.append(int(members[np.argmax(vectors[members] @ centroid)]))
+        weights = np.asarray(word_matrix[members].mean(axis=0)).ravel()
+        picked: List[str] = []
+        for i in weights.argsort()[::-1][:20]:
+            # Skip terms overlapping one already picked ("seo" after "seo tools")
+            if weights[i] > 0 and not any(terms[i] in p or p in terms[i] for p in picked):
+                picked.append(terms[i])
+            if len(picked) == 3:
+                break
+        top_terms.append(picked)
+
+    return LocalClusteringResult(
+        labels=[remap[label] for label in labels.tolist()],
+        representatives=representatives,
+        top_terms=top_terms,
+    )
+
+
+class KeywordClusteringService:
+    """Dispatches keyword clustering to the local engine, the LLM, or both"""
+
+    def __init__(self, langchain_service=None):
+        # Only the llm/hybrid engines need the LLM, so create it lazily
+        self._langchain_service = langchain_service
+
+    @property
+    def langchain_service(self):
+        if self._langchain_service is None:
+            from services.langchain_analysis import get_langchain_analysis_service
+
+            self._langchain_service = get_langchain_analysis_service()
+        return self._langchain_service
+
+    async def cluster(
+        self,
+        keywords: List[KeywordMetrics],
+        num_clusters: Optional[int] = None,
+        engine: ClusteringEngine = ClusteringEngine.LLM,
+        serp_urls: Optional[Dict[str, List[str]]] = None,
+    ) -> List[KeywordCluster]:
+        """
+        Cluster keywords into semantic groups.
+
+        Args:
+            keywords: List of KeywordMetrics objects
+            num_clusters: Number of clusters (auto-determined if None)
+            engine: local, llm or hybrid
+            serp_urls: Optional mapping of keyword to its top-ranking URLs
+
+        Returns:
+            List of KeywordCluster objects
+        """
+        # Identical keywords belong to one cluster, so cluster each text once,
+        # keeping the first occurrence in input order
+        seen = set()
+        unique = []
+        for kw in keywords:
+            if kw.keyword not in seen:
+                seen.add(kw.keyword)
+                unique.append(kw)
+        keywords = unique
+        if not keywords:
+            return []
+
+        if engine == ClusteringEngine.LLM:
+            return await self.langchain_service.cluster_keywords(keywords, num_clusters)
+
+        texts = [kw.keyword for kw in keywords]
+        serp = [serp_urls.get(text, []) for text in texts] if serp_urls else None
+        result: LocalClusteringResult = await run_cpu_bound(
+            cluster_keyword_texts, texts, num_clusters or auto_cluster_count(len(texts)), serp
+        )
+        clusters = self._build_clusters(keywords, result)
+        logger.info(f"Clustered {len(keywords)} keywords locally into {len(clusters)} clusters")
+
+        if engine == ClusteringEngine.HYBRID:
+            clusters = await self.langchain_service.label_clusters(clusters)
+        return clusters
+
+    @staticmethod
+    def _build_clusters(
+        keywords: List[KeywordMetrics], result: LocalClusteringResult
+    ) -> List[KeywordCluster]:
+        members: Dict[int, List[KeywordMetrics]] = {}
+        for kw, label in zip(keywords, result.labels):
+            members.setdefault(label, []).append(kw)
+
+        local_intents = get_local_intent_classifier()
+        clusters = []
+        for cluster_id in sorted(members):
+            cluster_keywords = members[cluster_id]
+            volumes = [kw.search_volume for kw in cluster_keywords if kw.search_volume]
+            # Highest-volume keyword leads; otherwise the one nearest the centroid
+            primary = (
+                max(cluster_keywords, key=lambda kw: kw.search_volume or 0).keyword
+                if volumes
+                else keywords[result.representatives[cluster_id]].keyword
+            )
+
+            intents = Counter(
+                kw.intent if kw.intent and kw.intent != SearchIntent.UNKNOWN
+                else getattr(local_intents.predict(kw.keyword.lower()), "intent", None)
+                for kw in cluster_keywords
+            )
+            intents.pop(None, None)
+
+            terms = result.top_terms[cluster_id]
+            clusters.append(
+                KeywordCluster(
+                    cluster_id=cluster_id + 1,
+                    cluster_name=" / ".join(terms).title() if terms else primary.title(),
+                    primary_keyword=primary,
+                    keywords=[kw.keyword for kw in cluster_keywords],
+                    intent=intents.most_common(1)[0][0] if intents else SearchIntent.UNKNOWN,
+                    avg_search_volume=sum(volumes) // len(volumes) if volumes else None,
+                )
+            )
+        return clusters
+
+
+def get_keyword_clustering_service() -> KeywordClusteringService:
+    """Factory function to create service instance"""
+    return KeywordClusteringService()
@@ -7,6 +7,10 @@ import aiohttp
 import asyncio
 from typing import List, Optional, Dict, Any
 from config import settings
+from utils.cache import get_cache_manager
+from utils.http_client import HTTPClientRegistry, PooledSessionMixin, get_http_client_registry
+from utils.single_flight import get_single_flight
+from services.autocomplete_harvester import get_autocomplete_harvester
 from exceptions import APIKeyMissingError, APIRequestError, APIRateLimitError
 from schemas.keyword_schemas import KeywordSuggestion, CompetitionLevel
 import logging
@@ -14,26 +18,16 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class KeywordSuggestionService:
+class KeywordSuggestionService(PooledSessionMixin):
     """
     Service for fetching keyword suggestions from free APIs.
     Currently supports DataForSEO free tier (can add more sources).
     """
     
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.cache: Dict[str, List[KeywordSuggestion]] = {}
-        
-    async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-    
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
+        self.http_clients = http_clients or get_http_client_registry()
+        self.cache = get_cache_manager().namespace("keyword_suggestions", List[KeywordSuggestion])
+
     async def get_suggestions(
         self,
         seed_keyword: str,
@@ -56,10 +50,29 @@ class KeywordSuggestionService:
         cache_key = f"{seed_keyword}_{language}_{country}_{limit}"
         
         # Check cache first
-        if cache_key in self.cache:
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
             logger.info(f"Returning cached suggestions for: {seed_keyword}")
-            return self.cache[cache_key][:limit]
+            return cached[:limit]
+        
+        # Identical lookups already running share that call's result
+        suggestions = await get_single_flight().do(
+            "keyword_suggestions",
+            cache_key,
+            lambda: self._fetch_suggestions(cache_key, seed_keyword, limit, language, country),
+        )
         
+        return suggestions[:limit]
+    
+    async def _fetch_suggestions(
+        self,
+        cache_key: str,
+        seed_keyword: str,
+        limit: int,
+        language: str,
+        country: str
+    ) -> List[KeywordSuggestion]:
+        """Fetch suggestions from the first source that returns any and cache them"""
         suggestions = []
         
         # Try DataForSEO if configured
@@ -82,12 +95,14 @@ class KeywordSuggestionService:
         
         # Fallback to free alternatives if needed
         if not suggestions:
-            suggestions = await self._get_fallback_suggestions(seed_keyword, limit)
+            suggestions = await self._get_fallback_suggestions(
+                seed_keyword, limit, language, country
+            )
         
         # Cache results
-        self.cache[cache_key] = suggestions
+        await self.cache.set(cache_key, suggestions)
         
-        return suggestions[:limit]
+        return suggestions
     
     async def _get_dataforseo_suggestions(
         self,
@@ -100,9 +115,6 @@ class KeywordSuggestionService:
         Fetch suggestions from DataForSEO API.
         Uses Google Keyword Suggestions endpoint.
         """
-        if not self.session:
-            raise RuntimeError("Session not initialized. Use async context manager.")
-        
         url = "https://api.dataforseo.com/v3/keywords_data/google/keywords_for_keywords/live"
         
         auth = aiohttp.BasicAuth(
@@ -136,54 +148,24 @@ class KeywordSuggestionService:
     async def _get_fallback_suggestions(
         self,
         seed_keyword: str,
-        limit: int
+        limit: int,
+        language: str = "en",
+        country: str = "us"
     ) -> List[KeywordSuggestion]:
         """
-        Fallback method using free autocomplete suggestions (Google and DuckDuckGo).
-        This provides a good variety of keywords without requiring API keys.
+        Fallback method using free autocomplete suggestions (Google, DuckDuckGo, Bing).
+        The harvester queries all sources concurrently with alphabet-soup expansions,
+        so this provides hundreds of real keywords without requiring API keys.
         """
-        suggestions_map = {} # Use dict to avoid duplicates
-        
-        # 1. Try Google Autocomplete
-        try:
-            google_url = "http://suggestqueries.google.com/complete/search"
-            params = {"client": "firefox", "q": seed_keyword}
-            
-            if not self.session:
-                raise RuntimeError("Session not initialized")
-                
-            async with self.session.get(google_url, params=params) as response:
-                if response.status == 200:
-                    # Use content_type=None to skip MIME type validation (handles text/javascript etc)
-                    data = await response.json(content_type=None)
-                    if len(data) > 1 and isinstance(data[1], list):
-                        for text in data[1]:
-                            if text not in suggestions_map:
-                                suggestions_map[text] = KeywordSuggestion(
-                                    keyword=text, source="google_autocomplete"
-                                )
-        except Exception as e:
-            logger.warning(f"Google fallback failed: {e}")
-            
-        # 2. Try DuckDuckGo Autocomplete (another great free source)
-        try:
-            ddg_url = "https://duckduckgo.com/ac/"
-            params = {"q": seed_keyword}
-            
-            async with self.session.get(ddg_url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json(content_type=None)
-                    # DDG returns list of dicts: [{"phrase": "keyword"}, ...]
-                    for item in data:
-                        text = item.get("phrase")
-                        if text and text not in suggestions_map:
-                            suggestions_map[text] = KeywordSuggestion(
-                                keyword=text, source="duckduckgo_autocomplete"
-                            )
-        except Exception as e:
-            logger.warning(f"DuckDuckGo fallback failed: {e}")
-        
-        suggestions = list(suggestions_map.values())
+        suggestions = await get_autocomplete_harvester().harvest(
+            seed_keyword,
+            language=language,
+            country=country,
+            max_depth=settings.autocomplete_max_depth,
+            max_requests=settings.autocomplete_max_requests,
+            max_suggestions=limit,
+            time_budget_seconds=settings.autocomplete_time_budget_seconds,
+        )
         
         # If still short on results, generate simple variations
         if len(suggestions) < 10:
@@ -241,9 +223,6 @@ class KeywordSuggestionService:
         Fetch keyword suggestions from Serper.dev API.
         Uses the 'Search' endpoint specifically for related queries.
         """
-        if not self.session:
-            raise RuntimeError("Session not initialized")
-            
         url = "https://google.serper.dev/search"
         headers = {
             "X-API-KEY": settings.serper_api_key,
@@ -329,15 +308,20 @@ class KeywordSuggestionService:
     
     def _get_location_code(self, country: str) -> int:
         """Map country code to DataForSEO location code"""
-        # Common location codes for DataForSEO
-        location_map = {
-            "us": 2840,  # United States
-            "uk": 2826,  # United Kingdom
-            "ca": 2124,  # Canada
-            "au": 2036,  # Australia
-            "in": 2356,  # India
-        }
-        return location_map.get(country.lower(), 2840)  # Default to US
+        return dataforseo_location_code(country)
+
+
+def dataforseo_location_code(country: str) -> int:
+    """Map country code to DataForSEO location code"""
+    # Common location codes for DataForSEO
+    location_map = {
+        "us": 2840,  # United States
+        "uk": 2826,  # United Kingdom
+        "ca": 2124,  # Canada
+        "au": 2036,  # Australia
+        "in": 2356,  # India
+    }
+    return location_map.get(country.lower(), 2840)  # Default to US
 
 
 # Singleton instance factory
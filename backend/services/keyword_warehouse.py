@@ -0,0 +1,405 @@
+"""
+Keyword Warehouse
+Local store of every keyword the API has seen, keyed by locale, so metrics from
+DataForSEO, Serper, Google Ads and the volume model outlive the request that
+fetched them.
+
+Backed by SQLite (stdlib) in data/keyword_warehouse.sqlite3:
+- one row per (locale, keyword) with volume, competition, CPC, intent,
+  difficulty, source and the time the metrics were fetched,
+- a B-tree on (locale, keyword) for point lookups and prefix ranges,
+- an FTS5 trigram index for substring search.
+
+Writes merge: a row only takes new metrics from an upsert that carries metrics,
+and intent/difficulty from analyses that produced them. Rows whose metrics are
+older than the TTL are stale, and so are model estimates once Google Ads is
+configured; the orchestrator re-enriches only those.
+
+All SQLite work runs on one dedicated thread (one connection, serialized), so
+the event loop never blocks on disk.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from config import settings
+from schemas.keyword_schemas import CompetitionLevel, KeywordMetrics, KeywordSuggestion, SearchIntent
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_WAREHOUSE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "keyword_warehouse.sqlite3"
+)
+
+SEARCH_MODES = ("prefix", "substring")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keywords (
+    id INTEGER PRIMARY KEY,
+    locale TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    search_volume INTEGER,
+    competition TEXT,
+    competition_score REAL,
+    cpc REAL,
+    source TEXT,
+    metrics_source TEXT,
+    fetched_at REAL,
+    intent TEXT,
+    difficulty TEXT,
+    difficulty_score REAL,
+    updated_at REAL NOT NULL,
+    UNIQUE (locale, keyword)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS keywords_fts USING fts5(
+    keyword, content='keywords', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS keywords_ai AFTER INSERT ON keywords BEGIN
+    INSERT INTO keywords_fts (rowid, keyword) VALUES (new.id, new.keyword);
+END;
+CREATE TRIGGER IF NOT EXISTS keywords_ad AFTER DELETE ON keywords BEGIN
+    INSERT INTO keywords_fts (keywords_fts, rowid, keyword) VALUES ('delete', old.id, old.keyword);
+END;
+"""
+
+_COLUMNS = (
+    "keyword, search_volume, competition, competition_score, cpc, source, "
+    "metrics_source, fetched_at, intent, difficulty, difficulty_score"
+)
+
+# Metrics columns only move forward together, from an upsert that carries metrics
+_UPSERT = f"""
+INSERT INTO keywords (locale, {_COLUMNS}, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL, NULL, ?)
+ON CONFLICT (locale, keyword) DO UPDATE SET
+    search_volume = CASE WHEN excluded.fetched_at IS NULL THEN search_volume ELSE excluded.search_volume END,
+    competition = CASE WHEN excluded.fetched_at IS NULL THEN competition ELSE excluded.competition END,
+    competition_score = CASE WHEN excluded.fetched_at IS NULL THEN competition_score ELSE excluded.competition_score END,
+    cpc = CASE WHEN excluded.fetched_at IS NULL THEN cpc ELSE excluded.cpc END,
+    metrics_source = CASE WHEN excluded.fetched_at IS NULL THEN metrics_source ELSE excluded.metrics_source END,
+    fetched_at = COALESCE(excluded.fetched_at, fetched_at),
+    source = COALESCE(source, excluded.source),
+    updated_at = excluded.updated_at
+"""
+
+_RECORD_ANALYSIS = """
+INSERT INTO keywords (locale, keyword, intent, difficulty, difficulty_score, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (locale, keyword) DO UPDATE SET
+    intent = COALESCE(excluded.intent, intent),
+    difficulty = COALESCE(excluded.difficulty, difficulty),
+    difficulty_score = COALESCE(excluded.difficulty_score, difficulty_score),
+    updated_at = excluded.updated_at
+"""
+
+# Keeps each lookup statement under SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+
+
+def locale_key(language: str, country: str) -> str:
+    return f"{language.lower()}-{country.lower()}"
+
+
+def normalize_keyword(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
+
+
+@dataclass
+class WarehouseRow:
+    """A stored keyword with its metrics and AI analysis"""
+
+    keyword: str
+    search_volume: Optional[int]
+    competition: Optional[str]
+    competition_score: Optional[float]
+    cpc: Optional[float]
+    source: Optional[str]
+    metrics_source: Optional[str]
+    fetched_at: Optional[float]
+    intent: Optional[str]
+    difficulty: Optional[str]
+    difficulty_score: Optional[float]
+
+    def to_suggestion(self) -> KeywordSuggestion:
+        return KeywordSuggestion(
+            keyword=self.keyword,
+            search_volume=self.search_volume,
+            competition=CompetitionLevel(self.competition) if self.competition else CompetitionLevel.UNKNOWN,
+            competition_score=self.competition_score,
+            cpc=self.cpc,
+            source=self.source or "keyword_warehouse",
+            metrics_source=self.metrics_source,
+        )
+
+    def apply_to(self, suggestion: KeywordSuggestion) -> KeywordSuggestion:
+        """Copy the stored metrics onto a suggestion"""
+        suggestion.search_volume = self.search_volume
+        suggestion.competition = CompetitionLevel(self.competition) if self.competition else CompetitionLevel.UNKNOWN
+        suggestion.competition_score = self.competition_score
+        suggestion.cpc = self.cpc
+        suggestion.metrics_source = self.metrics_source
+        return suggestion
+
+
+class KeywordWarehouse:
+    """
+    SQLite-backed keyword store with prefix and substring search.
+
+    Usage:
+        warehouse = get_keyword_warehouse()
+        rows = await warehouse.lookup(["seo tools"], "en", "us")
+        hits = await warehouse.search("seo", "en", "us", mode="prefix", limit=20)
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 2592000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="keyword-warehouse")
+        self._conn: Optional[sqlite3.Connection] = None
+        self.lookups = 0
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.searches = 0
+        self.rows_written = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Only ever called on the warehouse thread
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(self._connection()))
+
+    def is_fresh(self, row: WarehouseRow, accept_estimates: bool = True, now: Optional[float] = None) -> bool:
+        """Whether a row's metrics can be served without re-enrichment"""
+        if row.fetched_at is None:
+            return False
+        if not accept_estimates and row.metrics_source == "estimate":
+            return False
+        return (now or time.time()) - row.fetched_at < self.ttl_seconds
+
+    async def lookup(
+        self,
+        keywords: Sequence[str],
+        language: str = "en",
+        country: str = "us",
+        accept_estimates: bool = True,
+    ) -> Dict[str, WarehouseRow]:
+        """
+        Stored rows for the given keywords (fresh or not), keyed by normalized text.
+
+        accept_estimates only affects the fresh/stale counters; use is_fresh()
+        with the same flag to decide what to re-enrich.
+        """
+        texts = list(dict.fromkeys(normalize_keyword(k) for k in keywords))
+        if not texts:
+            return {}
+        locale = locale_key(language, country)
+
+        def query(conn: sqlite3.Connection) -> List[tuple]:
+            rows = []
+            for i in range(0, len(texts), _LOOKUP_CHUNK):
+                chunk = texts[i:i + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows += conn.execute(
+                    f"SELECT {_COLUMNS} FROM keywords WHERE locale = ? AND keyword IN ({placeholders})",
+                    (locale, *chunk),
+                ).fetchall()
+            return rows
+
+        found = {row[0]: WarehouseRow(*row) for row in await self._run(query)}
+        now = time.time()
+        fresh = sum(1 for row in found.values() if self.is_fresh(row, accept_estimates, now))
+        self.lookups += len(texts)
+        self.fresh_hits += fresh
+        self.stale_hits += len(found) - fresh
+        return found
+
+    async def upsert(
+        self,
+        suggestions: Sequence[KeywordSuggestion],
+        language: str = "en",
+        country: str = "us",
+    ) -> None:
+        """Store suggestions; ones carrying a search volume also refresh the row's metrics"""
+        if not suggestions:
+            return
+        locale = locale_key(language, country)
+        now = time.time()
+        params = []
+        for kw in suggestions:
+            has_metrics = kw.search_volume is not None
+            params.append((
+                locale,
+                normalize_keyword(kw.keyword),
+                kw.search_volume,
+                kw.competition.value if has_metrics and kw.competition else None,
+                kw.competition_score,
+                kw.cpc,
+                kw.source,
+                (kw.metrics_source or kw.source) if has_metrics else None,
+                now if has_metrics else None,
+                now,
+            ))
+        await self._write(_UPSERT, params)
+
+    async def record_analysis(
+        self,
+        keywords: Sequence[KeywordMetrics],
+        language: str = "en",
+        country: str = "us",
+    ) -> None:
+        """Store the intent and difficulty an analysis produced (metrics are left alone)"""
+        locale = locale_key(language, country)
+        now = time.time()
+        params = [
+            (
+                locale,
+                normalize_keyword(kw.keyword),
+                kw.intent.value if kw.intent and kw.intent != SearchIntent.UNKNOWN else None,
+                kw.difficulty.value if kw.difficulty else None,
+                kw.difficulty_score,
+                now,
+            )
+            for kw in keywords
+            if (kw.intent and kw.intent != SearchIntent.UNKNOWN) or kw.difficulty
+        ]
+        if params:
+            await self._write(_RECORD_ANALYSIS, params)
+
+    async def _write(self, statement: str, params: List[tuple]) -> None:
+        def write(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.executemany(statement, params)
+
+        await self._run(write)
+        self.rows_written += len(params)
+
+    async def search(
+        self,
+        query: str,
+        language: str = "en",
+        country: str = "us",
+        mode: str = "prefix",
+        limit: int = 20,
+        fresh_only: bool = False,
+        accept_estimates: bool = True,
+    ) -> List[WarehouseRow]:
+        """
+        Keywords starting with (prefix) or containing (substring) the query,
+        highest search volume first.
+
+        Args:
+            query: Text to match (normalized like stored keywords)
+            mode: "prefix" or "substring"
+            limit: Maximum number of rows
+            fresh_only: Only rows whose metrics are within the TTL
+            accept_estimates: With fresh_only, whether model estimates count as fresh
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown warehouse search mode: {mode}")
+        text = normalize_keyword(query)
+        if not text:
+            return []
+        locale = locale_key(language, country)
+
+        where = ["k.locale = ?"]
+        params: List[Any] = [locale]
+        if fresh_only:
+            where.append("k.fetched_at >= ?")
+            params.append(time.time() - self.ttl_seconds)
+            if not accept_estimates:
+                where.append("k.metrics_source IS NOT 'estimate'")
+
+        if mode == "prefix":
+            # Range scan on the (locale, keyword) index
+            source = "keywords k"
+            where += ["k.keyword >= ?", "k.keyword < ?"]
+            params += [text, text + "\U0010ffff"]
+        elif len(text) >= 3:
+            source = "keywords_fts f JOIN keywords k ON k.id = f.rowid"
+            where.insert(0, "keywords_fts MATCH ?")
+            params.insert(0, '"' + text.replace('"', '""') + '"')
+        else:
+            # Too short for trigrams: scan the locale
+            source = "keywords k"
+            where.append("instr(k.keyword, ?) > 0")
+            params.append(text)
+
+        columns = ", ".join(f"k.{column.strip()}" for column in _COLUMNS.split(","))
+        statement = (
+            f"SELECT {columns} FROM {source} WHERE {' AND '.join(where)} "
+            f"ORDER BY COALESCE(k.search_volume, -1) DESC, k.keyword LIMIT ?"
+        )
+        params.append(limit)
+
+        rows = await self._run(lambda conn: conn.execute(statement, params).fetchall())
+        self.searches += 1
+        return [WarehouseRow(*row) for row in rows]
+
+    async def metrics(self) -> Dict[str, Any]:
+        rows = await self._run(lambda conn: conn.execute("SELECT COUNT(*) FROM keywords").fetchone()[0])
+        return {
+            "rows": rows,
+            "lookups": self.lookups,
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "searches": self.searches,
+            "rows_written": self.rows_written,
+        }
+
+    def close(self) -> None:
+        def close_connection() -> None:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        self._executor.submit(close_connection).result()
+        self._executor.shutdown(wait=True)
+
+
+# Global warehouse instance (one connection and writer thread per process)
+_keyword_warehouse: Optional[KeywordWarehouse] = None
+
+
+def get_keyword_warehouse() -> Optional[KeywordWarehouse]:
+    """
+    Get or create the process-wide keyword warehouse.
+
+    Returns:
+        KeywordWarehouse instance, or None when the warehouse is disabled
+    """
+    global _keyword_warehouse
+    if not settings.keyword_warehouse_enabled:
+        return None
+    if _keyword_warehouse is None:
+        _keyword_warehouse = KeywordWarehouse(
+            settings.keyword_warehouse_path or DEFAULT_WAREHOUSE_PATH,
+            ttl_seconds=settings.keyword_warehouse_ttl_seconds,
+        )
+    return _keyword_warehouse
+
+
+def shutdown_keyword_warehouse() -> None:
+    """Close the warehouse connection and its thread (called on app shutdown)"""
+    global _keyword_warehouse
+    if _keyword_warehouse is not None:
+        _keyword_warehouse.close()
+        _keyword_warehouse = None
@@ -6,14 +6,23 @@ Handles intent classification, clustering, difficulty analysis, and recommendati
 
 import json
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
 from config import settings
+from services.intent_classifier import (
+    IntentPrediction,
+    IntentSource,
+    get_local_intent_classifier,
+)
+from utils.cache import get_cache_manager
+from utils.llm_clients import get_llm_client_registry
+from utils.llm_gateway import get_llm_gateway
 from schemas.keyword_schemas import (
     KeywordMetrics, KeywordCluster, SearchIntent, DifficultyLevel
 )
 from prompts.keyword_prompts import (
     INTENT_CLASSIFICATION_PROMPT,
     KEYWORD_CLUSTERING_PROMPT,
+    CLUSTER_LABELING_PROMPT,
     DIFFICULTY_ANALYSIS_PROMPT,
     RECOMMENDATION_PROMPT,
     CONTENT_GAP_PROMPT
@@ -29,22 +38,24 @@ class LangChainAnalysisService:
     This service does NOT fetch keyword data - it analyzes existing data.
     """
     
+    # Keywords per intent-classification LLM call
+    INTENT_CHUNK_SIZE = 25
+    # Keywords shown per cluster when asking the LLM to name it
+    CLUSTER_LABEL_SAMPLE = 12
+    
     def __init__(self):
         self.llm = None
         self._init_llm()
+        self.gateway = get_llm_gateway()
+        self.intent_cache = get_cache_manager().namespace(
+            "keyword_intent", SearchIntent, settings.intent_cache_ttl_seconds
+        )
     
     def _init_llm(self):
-        """Initialize LangChain LLM with Gemini"""
+        """Get the shared Gemini client (created once per process)"""
         try:
-            from langchain_google_genai import ChatGoogleGenerativeAI
-            
-            self.llm = ChatGoogleGenerativeAI(
-                model=settings.gemini_model,
-                google_api_key=settings.gemini_api_key,
-                temperature=0.3,  # Lower temperature for more consistent analysis
-                convert_system_message_to_human=True
-            )
-            logger.info(f"LangChain LLM initialized with model: {settings.gemini_model}")
+            # Lower temperature for more consistent analysis
+            self.llm = get_llm_client_registry().chat_model(temperature=0.3)
             
         except ImportError:
             logger.error("langchain-google-genai not installed")
@@ -53,40 +64,142 @@ class LangChainAnalysisService:
             logger.error(f"Failed to initialize LangChain LLM: {e}")
             raise
     
-    async def classify_intent(self, keywords: List[str]) -> Dict[str, SearchIntent]:
+    async def classify_intent(
+        self,
+        keywords: List[str],
+        language: str = "en",
+        country: str = "us"
+    ) -> Dict[str, SearchIntent]:
         """
         Classify search intent for a list of keywords.
         
         Args:
             keywords: List of keyword strings
+            language: Language code (part of the cache key)
+            country: Country code (part of the cache key)
             
         Returns:
             Dictionary mapping keyword to SearchIntent
         """
+        predictions = await self.classify_intent_detailed(keywords, language, country)
+        return {kw: prediction.intent for kw, prediction in predictions.items()}
+    
+    async def classify_intent_detailed(
+        self,
+        keywords: List[str],
+        language: str = "en",
+        country: str = "us"
+    ) -> Dict[str, IntentPrediction]:
+        """
+        Classify search intent, reporting which path answered each keyword.
+        
+        Keywords are resolved in order of cost: the local modifier lexicon, the
+        intent cache (per normalized keyword, locale and model), the local model
+        trained on earlier LLM answers, and finally the LLM - in fixed-size
+        chunks that run concurrently - for whatever is still unresolved.
+        
+        Args:
+            keywords: List of keyword strings
+            language: Language code (part of the cache key)
+            country: Country code (part of the cache key)
+            
+        Returns:
+            Dictionary mapping keyword to IntentPrediction
+        """
         if not keywords:
             return {}
         
+        locale = f"{language}-{country}".lower()
+        normalized = {kw: self._normalize_keyword(kw) for kw in keywords}
+        local = get_local_intent_classifier()
+        
+        predictions: Dict[str, IntentPrediction] = {}
+        lexicon_misses: List[str] = []
+        for norm in dict.fromkeys(normalized.values()):
+            prediction = local.predict(norm)
+            if prediction is not None:
+                predictions[norm] = prediction
+            else:
+                lexicon_misses.append(norm)
+        
+        # One batched lookup (a single MGET on Redis) instead of a round trip per keyword
+        cache_keys = {self._intent_cache_key(norm, locale): norm for norm in lexicon_misses}
+        cached = await self.intent_cache.get_many(list(cache_keys))
+        for cache_key, intent in cached.items():
+            predictions[cache_keys[cache_key]] = IntentPrediction(intent, IntentSource.CACHE)
+        # Cached answers are earlier LLM labels; train on them too
+        local.learn({cache_keys[cache_key]: intent for cache_key, intent in cached.items()})
+        unresolved = [norm for norm in lexicon_misses if norm not in predictions]
+        
+        predictions.update(await local.predict_with_model(unresolved))
+        misses = [norm for norm in unresolved if norm not in predictions]
+        
+        if misses:
+            chunks = [
+                misses[i:i + self.INTENT_CHUNK_SIZE]
+                for i in range(0, len(misses), self.INTENT_CHUNK_SIZE)
+            ]
+            semaphore = asyncio.Semaphore(settings.intent_classification_concurrency)
+            
+            async def run_chunk(chunk: List[str]) -> Dict[str, SearchIntent]:
+                async with semaphore:
+                    return await self._classify_intent_chunk(chunk)
+            
+            logger.info(
+                f"Classifying {len(misses)} of {len(normalized)} keywords with the LLM "
+                f"in {len(chunks)} chunks ({len(predictions)} answered locally or cached)"
+            )
+            llm_intents: Dict[str, SearchIntent] = {}
+            for chunk_result in await asyncio.gather(*(run_chunk(c) for c in chunks)):
+                llm_intents.update(chunk_result)
+            
+            for norm, intent in llm_intents.items():
+                predictions[norm] = IntentPrediction(intent, IntentSource.LLM)
+            # Don't cache failures; they'll be retried next time
+            await self.intent_cache.set_many({
+                self._intent_cache_key(norm, locale): intent
+                for norm, intent in llm_intents.items()
+                if intent != SearchIntent.UNKNOWN
+            })
+            local.learn(llm_intents)
+        
+        unknown = IntentPrediction(SearchIntent.UNKNOWN, IntentSource.LLM)
+        return {
+            kw: predictions.get(norm, unknown)
+            for kw, norm in normalized.items()
+        }
+    
+    async def _classify_intent_chunk(self, keywords: List[str]) -> Dict[str, SearchIntent]:
+        """
+        Classify one chunk of (normalized) keywords with a single LLM call.
+        
+        Returns:
+            Dictionary mapping each keyword in the chunk to its SearchIntent
+        """
         # Format keywords for prompt
         keywords_text = "\n".join([f"- {kw}" for kw in keywords])
         
         # Create chain
         chain = INTENT_CLASSIFICATION_PROMPT | self.llm
         
-        # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: chain.invoke({"keywords": keywords_text})
-        )
-        
-        # Parse response
         try:
+            response = await self.gateway.ainvoke(
+                chain,
+                {"keywords": keywords_text},
+                prompt_name="intent_classification",
+                # Intents are already cached per keyword
+                use_cache=False
+            )
+            
+            # Parse response
             result = self._parse_json_response(response.content)
             
-            intent_map = {}
+            intent_map = {kw: SearchIntent.UNKNOWN for kw in keywords}
             for classification in result.get("classifications", []):
-                keyword = classification.get("keyword")
-                intent_str = classification.get("intent", "UNKNOWN").upper()
+                keyword = self._normalize_keyword(str(classification.get("keyword", "")))
+                if keyword not in intent_map:
+                    continue
+                intent_str = str(classification.get("intent", "UNKNOWN")).upper()
                 
                 # Map to enum
                 try:
@@ -99,14 +212,23 @@ class LangChainAnalysisService:
             return intent_map
             
         except Exception as e:
-            logger.error(f"Error parsing intent classification: {e}")
+            logger.error(f"Error classifying intent chunk of {len(keywords)} keywords: {e}")
             # Return default intents
             return {kw: SearchIntent.UNKNOWN for kw in keywords}
     
+    @staticmethod
+    def _normalize_keyword(keyword: str) -> str:
+        """Lowercase and collapse whitespace so equivalent keywords share a cache entry"""
+        return " ".join(keyword.lower().split())
+    
+    def _intent_cache_key(self, normalized_keyword: str, locale: str) -> str:
+        return f"{settings.gemini_model}:{locale}:{normalized_keyword}"
+    
     async def cluster_keywords(
         self,
         keywords: List[KeywordMetrics],
-        num_clusters: Optional[int] = None
+        num_clusters: Optional[int] = None,
+        use_cache: bool = True
     ) -> List[KeywordCluster]:
         """
         Cluster keywords into semantic groups.
@@ -114,6 +236,7 @@ class LangChainAnalysisService:
         Args:
             keywords: List of KeywordMetrics objects
             num_clusters: Number of clusters (auto-determined if None)
+            use_cache: Reuse a cached LLM response for an identical prompt
             
         Returns:
             List of KeywordCluster objects
@@ -134,14 +257,14 @@ class LangChainAnalysisService:
         # Create chain
         chain = KEYWORD_CLUSTERING_PROMPT | self.llm
         
-        # Run in executor
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: chain.invoke({
+        response = await self.gateway.ainvoke(
+            chain,
+            {
                 "keywords": keywords_text,
                 "num_clusters": num_clusters
-            })
+            },
+            prompt_name="keyword_clustering",
+            use_cache=use_cache
         )
         
         # Parse response
@@ -183,12 +306,70 @@ class LangChainAnalysisService:
             logger.error(f"Error parsing keyword clusters: {e}")
             return []
     
+    async def label_clusters(
+        self,
+        clusters: List[KeywordCluster],
+        use_cache: bool = True
+    ) -> List[KeywordCluster]:
+        """
+        Name already-grouped clusters and write their recommendations
+        in a single LLM call (keeps locally computed names on failure).
+        
+        Args:
+            clusters: Clusters produced by the local clustering engine
+            use_cache: Reuse a cached LLM response for an identical prompt
+            
+        Returns:
+            The same clusters with AI names, intents and recommendations
+        """
+        if not clusters:
+            return clusters
+        
+        # A sample of each cluster is enough to name it and keeps the prompt small
+        clusters_text = "\n".join([
+            f"{cluster.cluster_id}. {', '.join(cluster.keywords[:self.CLUSTER_LABEL_SAMPLE])}"
+            for cluster in clusters
+        ])
+        
+        # Create chain
+        chain = CLUSTER_LABELING_PROMPT | self.llm
+        
+        try:
+            response = await self.gateway.ainvoke(
+                chain,
+                {"clusters": clusters_text},
+                prompt_name="cluster_labeling",
+                use_cache=use_cache
+            )
+            result = self._parse_json_response(response.content)
+        except Exception as e:
+            logger.error(f"Error labeling keyword clusters: {e}")
+            return clusters
+        
+        labels = {
+            str(label.get("cluster_id")): label
+            for label in result.get("clusters", [])
+        }
+        for cluster in clusters:
+            label = labels.get(str(cluster.cluster_id))
+            if not label:
+                continue
+            cluster.cluster_name = label.get("cluster_name") or cluster.cluster_name
+            cluster.recommendation = label.get("recommendation")
+            try:
+                cluster.intent = SearchIntent[str(label.get("intent", "")).upper()]
+            except KeyError:
+                pass
+        
+        return clusters
+    
     async def analyze_difficulty(
         self,
         keyword: str,
         serp_features: List[str],
         competition_score: Optional[float] = None,
-        search_volume: Optional[int] = None
+        search_volume: Optional[int] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Analyze ranking difficulty for a keyword.
@@ -198,6 +379,7 @@ class LangChainAnalysisService:
             serp_features: List of SERP features present
             competition_score: Competition score (0-1)
             search_volume: Monthly search volume
+            use_cache: Reuse a cached LLM response for an identical prompt
             
         Returns:
             Dictionary with difficulty analysis
@@ -208,16 +390,16 @@ class LangChainAnalysisService:
         # Create chain
         chain = DIFFICULTY_ANALYSIS_PROMPT | self.llm
         
-        # Run in executor
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: chain.invoke({
+        response = await self.gateway.ainvoke(
+            chain,
+            {
                 "keyword": keyword,
                 "serp_features": features_text,
                 "competition_score": competition_score or "N/A",
                 "search_volume": search_volume or "N/A"
-            })
+            },
+            prompt_name="difficulty_analysis",
+            use_cache=use_cache
         )
         
         # Parse response
@@ -237,7 +419,9 @@ class LangChainAnalysisService:
         self,
         keyword_data: List[KeywordMetrics],
         clusters: List[KeywordCluster],
-        serp_insights: Optional[Dict[str, Any]] = None
+        serp_insights: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
+        on_delta: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Generate strategic recommendations based on keyword analysis.
@@ -246,6 +430,9 @@ class LangChainAnalysisService:
             keyword_data: List of analyzed keywords
             clusters: Keyword clusters
             serp_insights: Optional SERP analysis insights
+            use_cache: Reuse a cached LLM response for an identical prompt
+            on_delta: If given, the response is streamed and each text chunk
+                is passed to this callback as it arrives
             
         Returns:
             Dictionary with strategic recommendations
@@ -266,20 +453,28 @@ class LangChainAnalysisService:
         # Create chain
         chain = RECOMMENDATION_PROMPT | self.llm
         
-        # Run in executor
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: chain.invoke({
-                "keyword_data": keywords_summary,
-                "clusters": clusters_summary,
-                "serp_insights": serp_summary
-            })
-        )
+        variables = {
+            "keyword_data": keywords_summary,
+            "clusters": clusters_summary,
+            "serp_insights": serp_summary
+        }
+        if on_delta is None:
+            response = await self.gateway.ainvoke(
+                chain, variables, prompt_name="recommendations", use_cache=use_cache
+            )
+            content = response.content
+        else:
+            parts = []
+            async for text in self.gateway.astream(
+                chain, variables, prompt_name="recommendations", use_cache=use_cache
+            ):
+                parts.append(text)
+                on_delta(text)
+            content = "".join(parts)
         
         # Parse response
         try:
-            result = self._parse_json_response(response.content)
+            result = self._parse_json_response(content)
             return result
         except Exception as e:
             logger.error(f"Error parsing recommendations: {e}")
@@ -289,7 +484,8 @@ class LangChainAnalysisService:
         self,
         keyword: str,
         competitor_titles: List[str],
-        competitor_snippets: List[str]
+        competitor_snippets: List[str],
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Analyze content gaps based on competitor SERP data.
@@ -298,6 +494,7 @@ class LangChainAnalysisService:
             keyword: Target keyword
             competitor_titles: Titles from top-ranking pages
             competitor_snippets: Snippets from top-ranking pages
+            use_cache: Reuse a cached LLM response for an identical prompt
             
         Returns:
             Dictionary with content gap analysis
@@ -308,15 +505,15 @@ class LangChainAnalysisService:
         # Create chain
         chain = CONTENT_GAP_PROMPT | self.llm
         
-        # Run in executor
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: chain.invoke({
+        response = await self.gateway.ainvoke(
+            chain,
+            {
                 "keyword": keyword,
                 "competitor_titles": titles_text,
                 "competitor_snippets": snippets_text
-            })
+            },
+            prompt_name="content_gaps",
+            use_cache=use_cache
         )
         
         # Parse response
@@ -347,6 +544,18 @@ class LangChainAnalysisService:
         return json.loads(content)
 
 
+# Global service instance (stateless; the LLM client is shared)
+_langchain_analysis_service: Optional[LangChainAnalysisService] = None
+
+
 def get_langchain_analysis_service() -> LangChainAnalysisService:
-    """Factory function to create service instance"""
-    return LangChainAnalysisService()
+    """
+    Get or create the shared analysis service.
+    
+    Returns:
+        LangChainAnalysisService instance
+    """
+    global _langchain_analysis_service
+    if _langchain_analysis_service is None:
+        _langchain_analysis_service = LangChainAnalysisService()
+    return _langchain_analysis_service
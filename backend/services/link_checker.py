@@ -0,0 +1,126 @@
+"""
+Link Checker
+Shared broken-link prober for technical audits. Results are cached per normalized
+URL across audits (sites repeat the same header/footer links on every page), and
+requests are throttled per host so crawl-mode audits stay polite.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from config import settings
+from utils.cache import get_cache_manager
+from utils.http_client import HTTPClientRegistry, get_http_client_registry
+from utils.url_utils import normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LinkStatus:
+    """Outcome of probing a link"""
+
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def is_broken(self) -> bool:
+        return self.error is not None or (self.status_code or 0) >= 400
+
+
+class LinkChecker:
+    """
+    Checks link status with HEAD (falling back to GET), caching results and
+    limiting concurrent requests per host.
+    """
+
+    # Network errors are often transient, so don't remember them for long
+    ERROR_CACHE_TTL = 300
+
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
+        self.http_clients = http_clients or get_http_client_registry()
+        self.cache = get_cache_manager().namespace(
+            "link_status", LinkStatus, settings.link_status_cache_ttl_seconds
+        )
+        self.per_host_limit = settings.link_check_concurrency_per_host
+        self.delay = settings.link_check_delay_seconds
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Probes currently running, so concurrent audits share one request per URL
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    async def check(self, url: str, headers: Optional[Dict[str, str]] = None) -> LinkStatus:
+        """
+        Get the status of a single link.
+
+        Args:
+            url: Absolute URL to probe
+            headers: Request headers (e.g. User-Agent)
+
+        Returns:
+            LinkStatus (from cache when the URL was probed recently)
+        """
+        key = normalize_url(url)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._probe(key, url, headers or {}))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def check_many(
+        self, urls: List[str], headers: Optional[Dict[str, str]] = None
+    ) -> List[LinkStatus]:
+        """Check several links; results are returned in input order"""
+        return await asyncio.gather(*(self.check(url, headers) for url in urls))
+
+    async def _probe(self, key: str, url: str, headers: Dict[str, str]) -> LinkStatus:
+        host = urlparse(key).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+
+        client = self.http_clients.httpx_client("audit", verify=False)
+        async with semaphore:
+            try:
+                response = await client.head(url, headers=headers, timeout=10, follow_redirects=True)
+                if response.status_code >= 400:
+                    # Some servers reject HEAD; confirm with GET
+                    response = await client.get(url, headers=headers, timeout=10, follow_redirects=True)
+                status = LinkStatus(status_code=response.status_code)
+                ttl = None
+            except Exception as e:
+                logger.debug(f"Link check failed for {url}: {e}")
+                status = LinkStatus(error=str(e) or type(e).__name__)
+                ttl = self.ERROR_CACHE_TTL
+            finally:
+                if self.delay:
+                    # Politeness delay: hold the host slot a little after each request
+                    await asyncio.sleep(self.delay)
+
+        await self.cache.set(key, status, ttl)
+        return status
+
+
+# Global link checker instance
+_link_checker: Optional[LinkChecker] = None
+
+
+def get_link_checker() -> LinkChecker:
+    """
+    Get or create the shared link checker.
+
+    Returns:
+        LinkChecker instance
+    """
+    global _link_checker
+    if _link_checker is None:
+        _link_checker = LinkChecker()
+    return _link_checker
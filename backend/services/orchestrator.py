@@ -4,11 +4,14 @@ Coordinates multiple services to provide complete keyword analysis workflows.
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+from collections import Counter
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 from services.keyword_suggestion import KeywordSuggestionService
 from services.volume_competition import VolumeCompetitionService
 from services.serp_analysis import SERPAnalysisService
-from services.langchain_analysis import LangChainAnalysisService
+from services.langchain_analysis import get_langchain_analysis_service
+from services.keyword_warehouse import get_keyword_warehouse, normalize_keyword
+from services.pipeline import Pipeline, PipelineStage, StageResult, StageStatus
 from schemas.keyword_schemas import (
     KeywordSuggestion, KeywordMetrics, KeywordCluster,
     SearchIntent, DifficultyLevel
@@ -26,11 +29,77 @@ class KeywordOrchestrator:
     2. Enrich with volume/competition (Google Ads)
     3. Analyze SERP (SERP APIs)
     4. AI analysis (LangChain + Gemini)
+    
+    Every keyword and its metrics are kept in the local keyword warehouse;
+    enrichment only calls out for keywords whose stored metrics are missing or
+    stale, and suggestion-only requests are answered from it when it already
+    holds enough fresh related keywords.
+    
+    Stages run as a dependency graph: SERP fetch starts immediately, and intent
+    classification, difficulty analysis and clustering run concurrently once
+    their inputs are ready.
     """
     
+    # Per-stage timeouts (seconds); timed-out optional stages fall back to partial results
+    STAGE_TIMEOUTS = {
+        "suggestions": 30,
+        "volume": 30,
+        "intent": 45,
+        "serp": 30,
+        "difficulty": 30,
+        "clustering": 60,
+        "recommendations": 60,
+    }
+    
     def __init__(self):
         self.volume_service = VolumeCompetitionService()
-        self.langchain_service = LangChainAnalysisService()
+        self.langchain_service = get_langchain_analysis_service()
+        self.warehouse = get_keyword_warehouse()
+    
+    def _accept_estimates(self) -> bool:
+        # Stored model estimates are good enough only while there is nothing better to fetch
+        return self.volume_service.google_ads_client is None
+    
+    async def _enrich_keywords(
+        self,
+        suggestions: List[KeywordSuggestion],
+        language: str,
+        country: str
+    ) -> List[KeywordSuggestion]:
+        """Enrich with volume/competition, reusing fresh warehouse metrics and storing new ones"""
+        if self.warehouse is None:
+            return await self.volume_service.enrich_keywords(suggestions, language, country)
+        
+        accept_estimates = self._accept_estimates()
+        try:
+            stored = await self.warehouse.lookup(
+                [kw.keyword for kw in suggestions], language, country, accept_estimates
+            )
+        except Exception as e:
+            logger.warning(f"Keyword warehouse lookup failed: {e}")
+            stored = {}
+        
+        stale = []
+        for kw in suggestions:
+            row = stored.get(normalize_keyword(kw.keyword))
+            if row is not None and self.warehouse.is_fresh(row, accept_estimates):
+                row.apply_to(kw)
+            else:
+                stale.append(kw)
+        
+        if stale:
+            logger.info(f"Keyword warehouse: {len(suggestions) - len(stale)} fresh, enriching {len(stale)}")
+            await self.volume_service.enrich_keywords(stale, language, country)
+            await self._store_keywords(stale, language, country)
+        return suggestions
+    
+    async def _store_keywords(self, suggestions: List[KeywordSuggestion], language: str, country: str) -> None:
+        if self.warehouse is None:
+            return
+        try:
+            await self.warehouse.upsert(suggestions, language, country)
+        except Exception as e:
+            logger.warning(f"Keyword warehouse write failed: {e}")
     
     async def analyze_keyword_complete(
         self,
@@ -41,7 +110,10 @@ class KeywordOrchestrator:
         include_suggestions: bool = True,
         include_volume: bool = True,
         include_serp: bool = True,
-        include_clustering: bool = True
+        include_clustering: bool = True,
+        use_cache: bool = True,
+        on_stage_done: Optional[Callable[[StageResult], None]] = None,
+        on_recommendation_delta: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Complete keyword analysis pipeline.
@@ -55,6 +127,9 @@ class KeywordOrchestrator:
             include_volume: Whether to fetch volume/competition data
             include_serp: Whether to analyze SERP
             include_clustering: Whether to cluster keywords with AI
+            use_cache: Reuse cached LLM responses for identical prompts
+            on_stage_done: Called with each stage's result as soon as it finishes
+            on_recommendation_delta: Called with recommendation text as it streams
             
         Returns:
             Complete analysis with keywords, clusters, and insights
@@ -62,94 +137,159 @@ class KeywordOrchestrator:
         logger.info(f"Starting complete analysis for: {seed_keyword}")
         
         # Step 1: Get keyword suggestions
-        suggestions = []
-        if include_suggestions:
+        async def get_suggestions(inputs: Dict[str, Any]) -> List[KeywordSuggestion]:
+            if not include_suggestions:
+                # Just analyze the seed keyword
+                return [KeywordSuggestion(keyword=seed_keyword, source="seed")]
             async with KeywordSuggestionService() as suggestion_service:
                 suggestions = await suggestion_service.get_suggestions(
                     seed_keyword, limit, language, country
                 )
-                logger.info(f"Found {len(suggestions)} keyword suggestions")
-        else:
-            # Just analyze the seed keyword
-            suggestions = [KeywordSuggestion(keyword=seed_keyword, source="seed")]
+            logger.info(f"Found {len(suggestions)} keyword suggestions")
+            return suggestions
         
         # Step 2: Enrich with volume and competition data
-        if include_volume:
-            suggestions = await self.volume_service.enrich_keywords(
-                suggestions, language, country
+        async def enrich_volume(inputs: Dict[str, Any]) -> List[KeywordSuggestion]:
+            suggestions = await self._enrich_keywords(
+                inputs["suggestions"], language, country
             )
             logger.info("Enriched keywords with volume/competition data")
+            return suggestions
         
         # Step 3: Convert to KeywordMetrics for AI analysis
-        keyword_metrics = [
-            KeywordMetrics(
-                keyword=kw.keyword,
-                search_volume=kw.search_volume,
-                competition=kw.competition,
-                competition_score=kw.competition_score,
-                cpc=kw.cpc
-            )
-            for kw in suggestions
-        ]
+        async def build_metrics(inputs: Dict[str, Any]) -> List[KeywordMetrics]:
+            return [
+                KeywordMetrics(
+                    keyword=kw.keyword,
+                    search_volume=kw.search_volume,
+                    competition=kw.competition,
+                    competition_score=kw.competition_score,
+                    cpc=kw.cpc
+                )
+                for kw in inputs["volume"]
+            ]
         
         # Step 4: Classify intent with AI
-        keyword_texts = [kw.keyword for kw in keyword_metrics]
-        intent_map = await self.langchain_service.classify_intent(keyword_texts)
-        
-        # Apply intents to metrics
-        for kw in keyword_metrics:
-            kw.intent = intent_map.get(kw.keyword, SearchIntent.UNKNOWN)
-        
-        logger.info("Classified keyword intents with AI")
+        async def classify_intent(inputs: Dict[str, Any]) -> Dict[str, SearchIntent]:
+            keyword_texts = [kw.keyword for kw in inputs["metrics"]]
+            predictions = await self.langchain_service.classify_intent_detailed(
+                keyword_texts, language, country
+            )
+            intent_map = {kw: p.intent for kw, p in predictions.items()}
+            
+            # Apply intents to metrics
+            for kw in inputs["metrics"]:
+                prediction = predictions.get(kw.keyword)
+                kw.intent = prediction.intent if prediction else SearchIntent.UNKNOWN
+                kw.intent_source = prediction.source if prediction else None
+            
+            logger.info("Classified keyword intents with AI")
+            return intent_map
         
-        # Step 5: Analyze SERP for seed keyword (optional)
-        serp_data = None
-        if include_serp:
+        # Step 5: Analyze SERP for seed keyword (only needs the seed, starts immediately)
+        async def fetch_serp(inputs: Dict[str, Any]) -> SERPAnalysisResponse:
             async with SERPAnalysisService() as serp_service:
                 serp_data = await serp_service.analyze_serp(
                     seed_keyword, language, country
                 )
-                logger.info("Analyzed SERP data")
-                
-                # Extract SERP features for difficulty analysis
-                serp_features = [f.feature_type.value for f in serp_data.features]
-                
-                # Analyze difficulty for seed keyword
-                seed_kw_metrics = next(
-                    (kw for kw in keyword_metrics if kw.keyword == seed_keyword),
-                    None
-                )
-                
-                if seed_kw_metrics:
-                    difficulty_analysis = await self.langchain_service.analyze_difficulty(
-                        seed_keyword,
-                        serp_features,
-                        seed_kw_metrics.competition_score,
-                        seed_kw_metrics.search_volume
-                    )
-                    
-                    # Apply difficulty to seed keyword
-                    difficulty_level_str = difficulty_analysis.get("difficulty_level", "MEDIUM")
-                    try:
-                        seed_kw_metrics.difficulty = DifficultyLevel[difficulty_level_str]
-                    except KeyError:
-                        seed_kw_metrics.difficulty = DifficultyLevel.MEDIUM
-                    
-                    seed_kw_metrics.difficulty_score = difficulty_analysis.get("difficulty_score", 50)
-        
-        # Step 6: Cluster keywords with AI
-        clusters = []
-        if include_clustering and len(keyword_metrics) >= 2:
-            clusters = await self.langchain_service.cluster_keywords(keyword_metrics)
+            logger.info("Analyzed SERP data")
+            return serp_data
+        
+        # Step 6: Analyze difficulty for seed keyword
+        async def analyze_difficulty(inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            serp_data = inputs["serp"]
+            if serp_data is None:
+                return None
+            
+            seed_kw_metrics = next(
+                (kw for kw in inputs["metrics"] if kw.keyword == seed_keyword),
+                None
+            )
+            if not seed_kw_metrics:
+                return None
+            
+            # Extract SERP features for difficulty analysis
+            serp_features = [f.feature_type.value for f in serp_data.features]
+            
+            difficulty_analysis = await self.langchain_service.analyze_difficulty(
+                seed_keyword,
+                serp_features,
+                seed_kw_metrics.competition_score,
+                seed_kw_metrics.search_volume,
+                use_cache=use_cache
+            )
+            
+            # Apply difficulty to seed keyword
+            difficulty_level_str = difficulty_analysis.get("difficulty_level", "MEDIUM")
+            try:
+                seed_kw_metrics.difficulty = DifficultyLevel[difficulty_level_str]
+            except KeyError:
+                seed_kw_metrics.difficulty = DifficultyLevel.MEDIUM
+            
+            seed_kw_metrics.difficulty_score = difficulty_analysis.get("difficulty_score", 50)
+            return difficulty_analysis
+        
+        # Step 7: Cluster keywords with AI
+        async def cluster(inputs: Dict[str, Any]) -> List[KeywordCluster]:
+            keyword_metrics = inputs["metrics"]
+            if len(keyword_metrics) < 2:
+                return []
+            clusters = await self.langchain_service.cluster_keywords(
+                keyword_metrics, use_cache=use_cache
+            )
             logger.info(f"Created {len(clusters)} keyword clusters")
+            return clusters
         
-        # Step 7: Generate strategic recommendations
-        insights = await self.langchain_service.generate_recommendations(
-            keyword_metrics,
-            clusters,
-            serp_insights={"serp_features": serp_data.features if serp_data else []}
-        )
-        logger.info("Generated strategic recommendations")
+        # Step 8: Generate strategic recommendations
+        async def recommend(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            serp_data = inputs["serp"]
+            insights = await self.langchain_service.generate_recommendations(
+                inputs["metrics"],
+                inputs["clustering"],
+                serp_insights={"serp_features": serp_data.features if serp_data else []},
+                use_cache=use_cache,
+                on_delta=on_recommendation_delta
+            )
+            logger.info("Generated strategic recommendations")
+            return insights
+        
+        timeouts = self.STAGE_TIMEOUTS
+        pipeline = Pipeline([
+            PipelineStage("suggestions", get_suggestions, timeout=timeouts["suggestions"], required=True),
+            PipelineStage(
+                "volume", enrich_volume, ("suggestions",),
+                timeout=timeouts["volume"], enabled=include_volume,
+                fallback=lambda inputs: inputs["suggestions"]
+            ),
+            PipelineStage("metrics", build_metrics, ("volume",), required=True),
+            PipelineStage(
+                "intent", classify_intent, ("metrics",),
+                timeout=timeouts["intent"], fallback=lambda inputs: {}
+            ),
+            PipelineStage("serp", fetch_serp, timeout=timeouts["serp"], enabled=include_serp),
+            PipelineStage(
+                "difficulty", analyze_difficulty, ("serp", "metrics"),
+                timeout=timeouts["difficulty"], enabled=include_serp
+            ),
+            PipelineStage(
+                "clustering", cluster, ("metrics",),
+                timeout=timeouts["clustering"], enabled=include_clustering,
+                fallback=lambda inputs: []
+            ),
+            PipelineStage(
+                "recommendations", recommend, ("metrics", "intent", "serp", "clustering"),
+                timeout=timeouts["recommendations"],
+                fallback=lambda inputs: {"overall_strategy": "Unable to generate recommendations"}
+            ),
+        ])
+        results = await pipeline.run(on_stage_done)
+        
+        keyword_metrics = results["metrics"].value
+        if self.warehouse is not None:
+            try:
+                await self.warehouse.record_analysis(keyword_metrics, language, country)
+            except Exception as e:
+                logger.warning(f"Keyword warehouse write failed: {e}")
         
         # Compile results
         data_sources = ["keyword_suggestion"]
@@ -162,14 +302,79 @@ class KeywordOrchestrator:
         return {
             "seed_keyword": seed_keyword,
             "keywords": keyword_metrics,
-            "clusters": clusters,
-            "serp_analysis": serp_data,
-            "insights": insights,
+            "clusters": results["clustering"].value,
+            "serp_analysis": results["serp"].value,
+            "insights": results["recommendations"].value,
             "total_keywords": len(keyword_metrics),
             "data_sources": data_sources,
+            "stage_timings": {name: result.timing() for name, result in results.items()},
+            "intent_sources": dict(Counter(
+                kw.intent_source for kw in keyword_metrics if kw.intent_source
+            )),
             "cached": False
         }
     
+    async def analyze_keyword_complete_stream(self, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run analyze_keyword_complete, yielding partial results as they are ready.
+        
+        Accepts the same keyword arguments. Events, in the order stages finish:
+        `keywords` (volume/competition metrics), `intents`, `serp_analysis`,
+        `difficulty`, `clusters`, `recommendations` (one per streamed text chunk,
+        in `delta`), and finally `done` with the complete analysis.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        def on_stage_done(result: StageResult) -> None:
+            # Build the event now: later stages keep mutating the stage values
+            queue.put_nowait(("stage", self._stage_event(result)))
+        
+        def on_recommendation_delta(text: str) -> None:
+            queue.put_nowait(("delta", text))
+        
+        async def run() -> Dict[str, Any]:
+            try:
+                return await self.analyze_keyword_complete(
+                    **kwargs,
+                    on_stage_done=on_stage_done,
+                    on_recommendation_delta=on_recommendation_delta
+                )
+            finally:
+                queue.put_nowait(("end", None))
+        
+        task = asyncio.ensure_future(run())
+        try:
+            while True:
+                kind, item = await queue.get()
+                if kind == "end":
+                    break
+                if kind == "delta":
+                    yield {"type": "recommendations", "delta": item}
+                    continue
+                if item is not None:
+                    yield item
+            yield {"type": "done", "analysis": await task}
+        finally:
+            task.cancel()
+    
+    @staticmethod
+    def _stage_event(result: StageResult) -> Optional[Dict[str, Any]]:
+        """Streaming event for a finished pipeline stage (None for internal stages)"""
+        if result.status == StageStatus.SKIPPED:
+            return None
+        if result.name == "metrics":
+            # Snapshot: the intent and difficulty stages fill these objects in later
+            return {"type": "keywords", "keywords": [kw.model_copy() for kw in result.value or []]}
+        if result.name == "intent":
+            return {"type": "intents", "intents": result.value}
+        if result.name == "serp":
+            return {"type": "serp_analysis", "serp_analysis": result.value}
+        if result.name == "difficulty":
+            return {"type": "difficulty", "difficulty": result.value}
+        if result.name == "clustering":
+            return {"type": "clusters", "clusters": result.value}
+        return None
+    
     async def get_keyword_suggestions_only(
         self,
         seed_keyword: str,
@@ -184,6 +389,27 @@ class KeywordOrchestrator:
         """
         logger.info(f"Getting suggestions for: {seed_keyword}")
         
+        # Answer from the warehouse when it already holds enough fresh related keywords
+        if enrich_with_volume and self.warehouse is not None:
+            try:
+                rows = await self.warehouse.search(
+                    seed_keyword, language, country, mode="substring", limit=limit + 1,
+                    fresh_only=True, accept_estimates=self._accept_estimates()
+                )
+            except Exception as e:
+                logger.warning(f"Keyword warehouse search failed: {e}")
+                rows = []
+            seed = normalize_keyword(seed_keyword)
+            local = [row.to_suggestion() for row in rows if row.keyword != seed][:limit]
+            if len(local) >= limit:
+                return {
+                    "seed_keyword": seed_keyword,
+                    "total_suggestions": len(local),
+                    "suggestions": local,
+                    "data_sources": ["keyword_warehouse"],
+                    "cached": True
+                }
+        
         # Get suggestions
         async with KeywordSuggestionService() as suggestion_service:
             suggestions = await suggestion_service.get_suggestions(
@@ -192,9 +418,11 @@ class KeywordOrchestrator:
         
         # Optionally enrich with volume
         if enrich_with_volume:
-            suggestions = await self.volume_service.enrich_keywords(
+            suggestions = await self._enrich_keywords(
                 suggestions, language, country
             )
+        else:
+            await self._store_keywords(suggestions, language, country)
         
         data_sources = ["keyword_suggestion"]
         if enrich_with_volume:
@@ -212,7 +440,8 @@ class KeywordOrchestrator:
         self,
         keyword: str,
         language: str = "en",
-        country: str = "us"
+        country: str = "us",
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Analyze SERP with AI-powered content gap analysis.
@@ -230,7 +459,7 @@ class KeywordOrchestrator:
             
             # AI content gap analysis
             content_gaps = await self.langchain_service.analyze_content_gaps(
-                keyword, titles, snippets
+                keyword, titles, snippets, use_cache=use_cache
             )
             
             # Add insights to SERP data
@@ -0,0 +1,183 @@
+"""
+Page Index
+Single-pass, SAX-style extraction of everything the technical audit needs from
+an HTML document. lxml's parser calls back into PageIndexBuilder for each tag,
+so no DOM tree is built and the document is walked exactly once.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+
+@dataclass
+class ImageInfo:
+    """An <img> element's audit-relevant attributes"""
+
+    src: str
+    data_src: str
+    alt: Optional[str]
+    width: Optional[str]
+    height: Optional[str]
+    parent: Optional[str]
+
+
+@dataclass
+class PageIndex:
+    """Compact, picklable summary of a parsed page"""
+
+    title: Optional[str] = None
+    html_lang: Optional[str] = None
+    # Attribute dicts of every <meta> and <link> tag, in document order
+    metas: List[Dict[str, str]] = field(default_factory=list)
+    link_tags: List[Dict[str, str]] = field(default_factory=list)
+    # (tag, text) in document order
+    headings: List[Tuple[str, str]] = field(default_factory=list)
+    images: List[ImageInfo] = field(default_factory=list)
+    # (href, anchor text) for every <a href>
+    anchors: List[Tuple[str, str]] = field(default_factory=list)
+    json_ld: List[str] = field(default_factory=list)
+    style_has_media_queries: bool = False
+    microdata_count: int = 0
+    rdfa_count: int = 0
+    insecure_resource_count: int = 0
+
+    def find_meta(self, attr: str, value: str) -> Optional[Dict[str, str]]:
+        """First <meta> whose `attr` equals `value` (case-sensitive, like BeautifulSoup)"""
+        for meta in self.metas:
+            if meta.get(attr) == value:
+                return meta
+        return None
+
+    def find_link(self, rel: str) -> Optional[Dict[str, str]]:
+        """First <link> whose rel list contains `rel`"""
+        for link in self.find_links(rel):
+            return link
+        return None
+
+    def find_links(self, rel: str) -> List[Dict[str, str]]:
+        """All <link> tags whose rel list contains `rel`"""
+        rel = rel.lower()
+        return [
+            link for link in self.link_tags
+            if rel in link.get("rel", "").lower().split()
+        ]
+
+
+class PageIndexBuilder:
+    """lxml parser target that fills a PageIndex in one pass"""
+
+    def __init__(self):
+        self.index = PageIndex()
+        self._stack: List[str] = []
+        # Open text captures: (tag, buffer, payload)
+        self._captures: List[Tuple[str, List[str], object]] = []
+        self._title_seen = False
+
+    def start(self, tag, attrib):
+        if not isinstance(tag, str):
+            return
+        attrs = dict(attrib)
+        index = self.index
+
+        if "itemscope" in attrs:
+            index.microdata_count += 1
+        if "typeof" in attrs:
+            index.rdfa_count += 1
+        if attrs.get("src", "").startswith("http://") or attrs.get("href", "").startswith("http://"):
+            index.insecure_resource_count += 1
+
+        if tag == "meta":
+            index.metas.append(attrs)
+        elif tag == "link":
+            index.link_tags.append(attrs)
+        elif tag == "img":
+            index.images.append(
+                ImageInfo(
+                    src=attrs.get("src", ""),
+                    data_src=attrs.get("data-src", ""),
+                    alt=attrs.get("alt"),
+                    width=attrs.get("width"),
+                    height=attrs.get("height"),
+                    parent=self._stack[-1] if self._stack else None,
+                )
+            )
+        elif tag == "html":
+            if index.html_lang is None:
+                index.html_lang = attrs.get("lang")
+        elif tag in HEADING_TAGS:
+            self._captures.append((tag, [], None))
+        elif tag == "a":
+            if "href" in attrs:
+                self._captures.append((tag, [], attrs["href"]))
+        elif tag == "title":
+            if not self._title_seen:
+                self._captures.append((tag, [], None))
+        elif tag == "script":
+            if attrs.get("type") == "application/ld+json":
+                self._captures.append((tag, [], None))
+        elif tag == "style":
+            self._captures.append((tag, [], None))
+
+        self._stack.append(tag)
+
+    def end(self, tag):
+        if not isinstance(tag, str):
+            return
+        if self._stack and self._stack[-1] == tag:
+            self._stack.pop()
+        elif tag in self._stack:
+            # Unbalanced markup: unwind to the matching open tag
+            while self._stack and self._stack.pop() != tag:
+                pass
+
+        if not self._captures or self._captures[-1][0] != tag:
+            return
+        _, parts, payload = self._captures.pop()
+        index = self.index
+
+        if tag in HEADING_TAGS:
+            index.headings.append((tag, _join_stripped(parts)))
+        elif tag == "a":
+            index.anchors.append((payload, _join_stripped(parts)))
+        elif tag == "title":
+            self._title_seen = True
+            index.title = _join_stripped(parts)
+        elif tag == "script":
+            content = "".join(parts)
+            if content:
+                index.json_ld.append(content)
+        elif tag == "style":
+            if "@media" in "".join(parts):
+                index.style_has_media_queries = True
+
+    def data(self, data):
+        for _, parts, _ in self._captures:
+            parts.append(data)
+
+    def close(self) -> PageIndex:
+        return self.index
+
+
+def _join_stripped(parts: List[str]) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True)"""
+    return "".join(p.strip() for p in parts)
+
+
+def build_page_index(html: str) -> PageIndex:
+    """
+    Parse HTML once and return its PageIndex.
+
+    Args:
+        html: Raw HTML document
+
+    Returns:
+        PageIndex with headings, images, links, meta tags, scripts and styles
+    """
+    builder = PageIndexBuilder()
+    parser = etree.HTMLParser(target=builder, encoding="utf-8", recover=True)
+    parser.feed(html.encode("utf-8"))
+    return parser.close()
@@ -0,0 +1,186 @@
+"""
+Pipeline Executor
+Small dependency-graph runner used by the orchestrator. Each stage starts as soon
+as the stages it depends on have finished, so independent stages run concurrently
+and end-to-end latency follows the critical path instead of the sum of all stages.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from exceptions import DataValidationError
+
+logger = logging.getLogger(__name__)
+
+
+class StageStatus:
+    """Stage outcome labels reported in stage timings"""
+
+    OK = "ok"
+    SKIPPED = "skipped"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+
+
+@dataclass
+class PipelineStage:
+    """
+    A single unit of work in the pipeline.
+
+    Attributes:
+        name: Unique stage name
+        func: Coroutine function receiving the results of completed stages
+        depends_on: Names of stages that must finish first
+        timeout: Per-stage timeout in seconds (None = no timeout)
+        fallback: Produces a partial result from the inputs when the stage
+            is skipped, times out or fails
+        required: If True, a failure aborts the whole pipeline
+        enabled: Disabled stages are skipped and yield their fallback
+    """
+
+    name: str
+    func: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    fallback: Optional[Callable[[Dict[str, Any]], Any]] = None
+    required: bool = False
+    enabled: bool = True
+
+
+@dataclass
+class StageResult:
+    """Outcome and timing of a stage run"""
+
+    name: str
+    status: str
+    value: Any = None
+    started_at_ms: float = 0.0
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+
+    def timing(self) -> Dict[str, Any]:
+        timing = {
+            "status": self.status,
+            "started_at_ms": round(self.started_at_ms, 1),
+            "duration_ms": round(self.duration_ms, 1),
+        }
+        if self.error:
+            timing["error"] = self.error
+        return timing
+
+
+class Pipeline:
+    """Runs PipelineStages concurrently, respecting their dependencies"""
+
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise DataValidationError("Duplicate pipeline stage names")
+        self._validate()
+
+    def _validate(self):
+        """Reject unknown dependencies and cycles up front"""
+        for stage in self.stages.values():
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise DataValidationError(
+                        f"Stage '{stage.name}' depends on unknown stage '{dep}'"
+                    )
+
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise DataValidationError(f"Pipeline has a dependency cycle at '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    async def run(
+        self, on_stage_done: Optional[Callable[[StageResult], None]] = None
+    ) -> Dict[str, StageResult]:
+        """
+        Execute all stages.
+
+        Args:
+            on_stage_done: Called with each StageResult as soon as that stage
+                finishes (used to stream partial results)
+
+        Returns:
+            Mapping of stage name to StageResult
+
+        Raises:
+            The original exception if a required stage fails
+        """
+        pipeline_start = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: PipelineStage) -> StageResult:
+            result = await execute_stage(stage)
+            if on_stage_done is not None:
+                on_stage_done(result)
+            return result
+
+        async def execute_stage(stage: PipelineStage) -> StageResult:
+            dep_results = await asyncio.gather(*(tasks[d] for d in stage.depends_on))
+            inputs = {result.name: result.value for result in dep_results}
+
+            started = time.perf_counter()
+            started_at_ms = (started - pipeline_start) * 1000
+
+            def finish(status: str, value: Any, error: Optional[str] = None) -> StageResult:
+                return StageResult(
+                    name=stage.name,
+                    status=status,
+                    value=value,
+                    started_at_ms=started_at_ms,
+                    duration_ms=(time.perf_counter() - started) * 1000,
+                    error=error,
+                )
+
+            if not stage.enabled:
+                return finish(StageStatus.SKIPPED, self._fallback(stage, inputs))
+
+            try:
+                value = await asyncio.wait_for(stage.func(inputs), timeout=stage.timeout)
+                return finish(StageStatus.OK, value)
+            except asyncio.TimeoutError:
+                if stage.required:
+                    raise
+                logger.warning(f"Pipeline stage '{stage.name}' timed out after {stage.timeout}s")
+                return finish(
+                    StageStatus.TIMEOUT,
+                    self._fallback(stage, inputs),
+                    f"Timed out after {stage.timeout}s",
+                )
+            except Exception as e:
+                if stage.required:
+                    raise
+                logger.error(f"Pipeline stage '{stage.name}' failed: {e}")
+                return finish(StageStatus.ERROR, self._fallback(stage, inputs), str(e))
+
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+
+        try:
+            results = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        return {result.name: result for result in results}
+
+    @staticmethod
+    def _fallback(stage: PipelineStage, inputs: Dict[str, Any]) -> Any:
+        return stage.fallback(inputs) if stage.fallback else None
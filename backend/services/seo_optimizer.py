@@ -6,12 +6,14 @@ Logic for analyzing articles and providing SEO recommendations.
 import re
 import os
 import logging
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
 from bs4 import BeautifulSoup
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
 from schemas.seo_optimizer_schemas import SEOOptimizeRequest, SEOOptimizeResponse, SEOMetrics, InternalLinkRequest, InternalLinkResponse, SuggestedLink
 from config import settings
+from utils.llm_clients import get_llm_client_registry
+from utils.llm_gateway import get_llm_gateway
+from utils.process_pool import run_cpu_bound
 import json
 
 logger = logging.getLogger(__name__)
@@ -24,41 +26,65 @@ class SEOOptimizerService:
         """
         Analyze an article and return SEO metrics and recommendations.
         """
+        result = await self._score_article(request)
+        result.ai_insights = await self._generate_ai_insights(
+            request, result.metrics.word_count, result.metrics.keyword_density
+        )
+        return result
+
+    async def optimize_article_stream(self, request: SEOOptimizeRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Same analysis as optimize_article, as a stream of events: the score,
+        metrics and recommendations first (local computation only), then the AI
+        insights token by token, then a final `done` event with the full text.
+        """
+        result = await self._score_article(request)
+        yield {
+            "type": "metrics",
+            "seo_score": result.seo_score,
+            "metrics": result.metrics,
+            "recommendations": result.recommendations,
+        }
+
+        if not settings.gemini_api_key:
+            insights = "AI Insights are currently unavailable. Please configure the Gemini API key."
+            yield {"type": "ai_insights", "delta": insights}
+        else:
+            llm = get_llm_client_registry().chat_model(temperature=0.4)
+            prompt = self._ai_insights_prompt(
+                request, result.metrics.word_count, result.metrics.keyword_density
+            )
+            parts = []
+            try:
+                async for text in get_llm_gateway().astream(
+                    llm, [HumanMessage(content=prompt)], prompt_name="seo_ai_insights", use_cache=request.use_cache
+                ):
+                    parts.append(text)
+                    yield {"type": "ai_insights", "delta": text}
+            except Exception as e:
+                logger.error(f"Error streaming AI insights: {e}")
+                fallback = "Failed to generate AI insights. Using standard technical metrics only."
+                parts.append(fallback)
+                yield {"type": "ai_insights", "delta": fallback}
+            insights = "".join(parts)
+
+        yield {"type": "done", "ai_insights": insights}
+
+    async def _score_article(self, request: SEOOptimizeRequest) -> SEOOptimizeResponse:
+        """Deterministic part of the analysis: metrics, score and recommendations"""
         article_content = request.article
         keyword = request.keyword.lower()
         
-        # Parse HTML
-        soup = BeautifulSoup(article_content, "html.parser")
-        
-        # 1. Word Count
-        # Get text content without HTML tags for word count
-        text_content = soup.get_text()
-        words = text_content.split()
-        word_count = len(words)
-        
-        # 2. Keyword Density
-        # Count occurrences of keyword in text (case-insensitive)
-        keyword_count = len(re.findall(f'\\b{re.escape(keyword)}\\b', text_content.lower()))
-        density = (keyword_count / word_count * 100) if word_count > 0 else 0
-        
-        # 3. Heading Analysis
-        h1_tags = soup.find_all("h1")
-        h2_tags = soup.find_all("h2")
-        h3_tags = soup.find_all("h3")
-        
-        h1_count = len(h1_tags)
-        h2_count = len(h2_tags)
-        h3_count = len(h3_tags)
-        
-        # 4. Internal Links
-        # Count links starting with /blog/ or similar internal patterns
-        links = soup.find_all("a", href=True)
-        internal_links = sum(1 for a in links if a['href'].startswith(("/blog/", "/", "https://mysite.com/blog/")))
-        
-        # 5. Image SEO
-        images_tags = soup.find_all("img")
-        images_count = len(images_tags)
-        images_without_alt = sum(1 for img in images_tags if not img.get("alt"))
+        # Parse HTML and gather counts off the event loop
+        stats = await run_cpu_bound(self._extract_article_stats, article_content, keyword)
+        word_count = stats["word_count"]
+        density = stats["density"]
+        h1_count = stats["h1_count"]
+        h2_count = stats["h2_count"]
+        h3_count = stats["h3_count"]
+        internal_links = stats["internal_links"]
+        images_count = stats["images_count"]
+        images_without_alt = stats["images_without_alt"]
         
         # Calculate Score and Recommendations
         recommendations = []
@@ -123,9 +149,6 @@ class SEOOptimizerService:
         # Cap score
         score = min(100, score)
 
-        # Generate AI Insights
-        ai_insights = await self._generate_ai_insights(request, word_count, density)
-        
         metrics = SEOMetrics(
             word_count=word_count,
             keyword_density=round(density, 2),
@@ -140,10 +163,81 @@ class SEOOptimizerService:
         return SEOOptimizeResponse(
             seo_score=score,
             metrics=metrics,
-            recommendations=recommendations,
-            ai_insights=ai_insights
+            recommendations=recommendations
         )
 
+    @staticmethod
+    def _extract_article_stats(article_content: str, keyword: str) -> dict:
+        """
+        Parse the article HTML and count the on-page elements used for scoring.
+        Runs in the shared process pool.
+        """
+        # Parse HTML
+        soup = BeautifulSoup(article_content, "html.parser")
+        
+        # 1. Word Count
+        # Get text content without HTML tags for word count
+        text_content = soup.get_text()
+        words = text_content.split()
+        word_count = len(words)
+        
+        # 2. Keyword Density
+        # Count occurrences of keyword in text (case-insensitive)
+        keyword_count = len(re.findall(f'\\b{re.escape(keyword)}\\b', text_content.lower()))
+        density = (keyword_count / word_count * 100) if word_count > 0 else 0
+        
+        # 3. Heading Analysis
+        h1_count = len(soup.find_all("h1"))
+        h2_count = len(soup.find_all("h2"))
+        h3_count = len(soup.find_all("h3"))
+        
+        # 4. Internal Links
+        # Count links starting with /blog/ or similar internal patterns
+        links = soup.find_all("a", href=True)
+        internal_links = sum(1 for a in links if a['href'].startswith(("/blog/", "/", "https://mysite.com/blog/")))
+        
+        # 5. Image SEO
+        images_tags = soup.find_all("img")
+        
+        return {
+            "word_count": word_count,
+            "density": density,
+            "h1_count": h1_count,
+            "h2_count": h2_count,
+            "h3_count": h3_count,
+            "internal_links": internal_links,
+            "images_count": len(images_tags),
+            "images_without_alt": sum(1 for img in images_tags if not img.get("alt")),
+        }
+
+    @staticmethod
+    def _ai_insights_prompt(request: SEOOptimizeRequest, word_count: int, density: float) -> str:
+        """Prompt shared by the blocking and streaming AI insights"""
+        return f"""
+        You are a Senior SEO Content Strategist. Analyze the following blog post details and provide high-level, actionable AI insights beyond simple metrics.
+
+        Target Keyword: {request.keyword}
+        SEO Title: {request.title or 'Not provided'}
+        Meta Description: {request.meta_description or 'Not provided'}
+        Word Count: {word_count}
+        Keyword Density: {density:.2f}%
+
+        Article Content (Snippet):
+        {request.article[:2000]}
+
+        Provide your analysis in the following Markdown format:
+        ### 🎯 Semantic Opportunities
+        (Suggest 3-5 LSI/Semantic keywords to include)
+
+        ### ✍️ Content Quality & Flow
+        (Briefly comment on readability and expertise)
+
+        ### 💡 Advanced Strategy
+        (One high-level tip like internal link anchor text or featured snippet optimization)
+
+        Keep the response concise and professional.
+        """
+
     async def _generate_ai_insights(self, request: SEOOptimizeRequest, word_count: int, density: float) -> Optional[str]:
         """
         Generate qualitative AI insights using Gemini.
@@ -153,42 +247,13 @@ class SEOOptimizerService:
             return "AI Insights are currently unavailable. Please configure the Gemini API key."
 
         try:
-            llm = ChatGoogleGenerativeAI(
-                api_key=settings.gemini_api_key,
-                model=settings.gemini_model,
-                temperature=0.4
-            )
-
-            prompt = f"""
-            You are a Senior SEO Content Strategist. Analyze the following blog post details and provide high-level, actionable AI insights beyond simple metrics.
-            
-            Target Keyword: {request.keyword}
-            SEO Title: {request.title or 'Not provided'}
-            Meta Description: {request.meta_description or 'Not provided'}
-            Word Count: {word_count}
-            Keyword Density: {density:.2f}%
-            
-            Article Content (Snippet):
-            {request.article[:2000]}
-            
-            Provide your analysis in the following Markdown format:
-            ### 🎯 Semantic Opportunities
-            (Suggest 3-5 LSI/Semantic keywords to include)
-            
-            ### ✍️ Content Quality & Flow
-            (Briefly comment on readability and expertise)
-            
-            ### 💡 Advanced Strategy
-            (One high-level tip like internal link anchor text or featured snippet optimization)
-            
-            Keep the response concise and professional.
-            """
+            llm = get_llm_client_registry().chat_model(temperature=0.4)
+            prompt = self._ai_insights_prompt(request, word_count, density)
 
             message = HumanMessage(content=prompt)
-            # Use run_in_executor if the method is not natively async (but ChatGoogleGenerativeAI.invoke is sync)
-            import asyncio
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, lambda: llm.invoke([message]))
+            response = await get_llm_gateway().ainvoke(
+                llm, [message], prompt_name="seo_ai_insights", use_cache=request.use_cache
+            )
             
             return response.content
 
@@ -208,11 +273,7 @@ class SEOOptimizerService:
             return InternalLinkResponse(suggestions=[])
 
         try:
-            llm = ChatGoogleGenerativeAI(
-                api_key=settings.gemini_api_key,
-                model=settings.gemini_model,
-                temperature=0.2
-            )
+            llm = get_llm_client_registry().chat_model(temperature=0.2)
             
             # Format the titles as a bulleted list string
             titles_str = "\n".join([f"- {title}" for title in request.existing_titles])
@@ -248,9 +309,9 @@ class SEOOptimizerService:
             """
 
             message = HumanMessage(content=prompt)
-            import asyncio
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, lambda: llm.invoke([message]))
+            response = await get_llm_gateway().ainvoke(
+                llm, [message], prompt_name="internal_link_suggestions", use_cache=request.use_cache
+            )
             
             # Parse the JSON response
             content = response.content.strip()
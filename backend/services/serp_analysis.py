@@ -5,9 +5,13 @@ Fetches and analyzes Search Engine Results Pages using free SERP APIs.
 
 import aiohttp
 import asyncio
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 from config import settings
-from exceptions import APIKeyMissingError, APIRequestError, ServiceUnavailableError
+from utils.cache import get_cache_manager
+from utils.http_client import HTTPClientRegistry, PooledSessionMixin, get_http_client_registry
+from utils.single_flight import get_single_flight
+from exceptions import APIKeyMissingError, APIRateLimitError, APIRequestError, ServiceUnavailableError
+from services.serp_router import SERPProviderRouter, get_serp_provider_router
 from schemas.serp_schemas import (
     OrganicResult, SERPFeature, PeopleAlsoAsk, RelatedSearch,
     SERPAnalysisResponse, SERPFeatureType
@@ -18,26 +22,22 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class SERPAnalysisService:
+class SERPAnalysisService(PooledSessionMixin):
     """
     Service for analyzing Search Engine Results Pages.
-    Supports SerpAPI and ValueSERP (can add more providers).
+    Supports Serper.dev, SerpAPI and ValueSERP (can add more providers),
+    routed with failover by the SERP provider router.
     """
     
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.cache: Dict[str, SERPAnalysisResponse] = {}
-    
-    async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-    
+    def __init__(
+        self,
+        http_clients: Optional[HTTPClientRegistry] = None,
+        router: Optional[SERPProviderRouter] = None
+    ):
+        self.http_clients = http_clients or get_http_client_registry()
+        self.router = router or get_serp_provider_router()
+        self.cache = get_cache_manager().namespace("serp", SERPAnalysisResponse)
+
     async def analyze_serp(
         self,
         keyword: str,
@@ -62,32 +62,58 @@ class SERPAnalysisService:
         cache_key = f"{keyword}_{language}_{country}_{device}"
         
         # Check cache
-        if cache_key in self.cache:
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
             logger.info(f"Returning cached SERP analysis for: {keyword}")
-            cached = self.cache[cache_key]
             cached.cached = True
             return cached
         
-        # Determine which SERP API to use
+        # Identical lookups already running share that call's result
+        return await get_single_flight().do(
+            "serp",
+            cache_key,
+            lambda: self._fetch_serp(cache_key, keyword, language, country, device, num_results),
+        )
+    
+    async def _fetch_serp(
+        self,
+        cache_key: str,
+        keyword: str,
+        language: str,
+        country: str,
+        device: str,
+        num_results: int,
+        on_attempt: Optional[Callable[[str], None]] = None
+    ) -> SERPAnalysisResponse:
+        """
+        Fetch a SERP through the provider router and cache it.
+        on_attempt is called with the provider name for every request the router sends.
+        """
+        # Every configured SERP API is a candidate; the router picks and fails over
+        calls = {}
         if settings.serper_api_key:
-            result = await self._analyze_with_serper(
+            calls["serper"] = lambda: self._analyze_with_serper(
                 keyword, language, country, device, num_results
             )
-        elif settings.serpapi_key:
-            result = await self._analyze_with_serpapi(
+        if settings.serpapi_key:
+            calls["serpapi"] = lambda: self._analyze_with_serpapi(
                 keyword, language, country, device, num_results
             )
-        elif settings.valueserpapi_key:
-            result = await self._analyze_with_valueserp(
+        if settings.valueserpapi_key:
+            calls["valueserp"] = lambda: self._analyze_with_valueserp(
                 keyword, language, country, device, num_results
             )
-        else:
-            # No SERP API configured - return mock/limited data
+        
+        if not calls:
+            # No SERP API configured - return mock/limited data (never cached,
+            # so other workers don't serve it as real)
             logger.warning("No SERP API configured. Returning limited mock data.")
-            result = self._create_mock_serp_response(keyword)
+            return self._create_mock_serp_response(keyword)
+        
+        result = await self.router.fetch(calls, on_attempt)
         
         # Cache the result
-        self.cache[cache_key] = result
+        await self.cache.set(cache_key, result)
         
         return result
     
@@ -100,9 +126,6 @@ class SERPAnalysisService:
         num_results: int
     ) -> SERPAnalysisResponse:
         """Fetch SERP data from Serper.dev"""
-        if not self.session:
-            raise RuntimeError("Session not initialized")
-        
         url = "https://google.serper.dev/search"
         headers = {
             "X-API-KEY": settings.serper_api_key,
@@ -119,6 +142,8 @@ class SERPAnalysisService:
             async with self.session.post(url, headers=headers, json=payload) as response:
                 if response.status == 403:
                     raise APIKeyMissingError("Invalid Serper.dev API key")
+                elif response.status == 429:
+                    raise APIRateLimitError("Serper.dev rate limit exceeded")
                 elif response.status != 200:
                     raise APIRequestError(f"Serper.dev error: {response.status}")
                 
@@ -218,9 +243,6 @@ class SERPAnalysisService:
         num_results: int
     ) -> SERPAnalysisResponse:
         """Fetch SERP data from SerpAPI"""
-        if not self.session:
-            raise RuntimeError("Session not initialized")
-        
         url = "https://serpapi.com/search"
         params = {
             "q": keyword,
@@ -237,7 +259,7 @@ class SERPAnalysisService:
                 if response.status == 401:
                     raise APIKeyMissingError("Invalid SerpAPI key")
                 elif response.status == 429:
-                    raise APIRequestError("SerpAPI rate limit exceeded")
+                    raise APIRateLimitError("SerpAPI rate limit exceeded")
                 elif response.status != 200:
                     raise APIRequestError(f"SerpAPI error: {response.status}")
                 
@@ -256,9 +278,6 @@ class SERPAnalysisService:
         num_results: int
     ) -> SERPAnalysisResponse:
         """Fetch SERP data from ValueSERP"""
-        if not self.session:
-            raise RuntimeError("Session not initialized")
-        
         url = "https://api.valueserp.com/search"
         params = {
             "q": keyword,
@@ -274,6 +293,8 @@ class SERPAnalysisService:
             async with self.session.get(url, params=params) as response:
                 if response.status == 401:
                     raise APIKeyMissingError("Invalid ValueSERP key")
+                elif response.status == 429:
+                    raise APIRateLimitError("ValueSERP rate limit exceeded")
                 elif response.status != 200:
                     raise APIRequestError(f"ValueSERP error: {response.status}")
                 
@@ -0,0 +1,431 @@
+"""
+Bulk SERP Analysis
+Fetches SERPs for many keywords at once (rank tracking), streaming each result as
+soon as it is available.
+
+Keywords are deduplicated and cached SERPs are streamed first. Cache misses go to
+the cheapest bulk path that is configured:
+1. DataForSEO standard queue (task_post / tasks_ready / task_get), up to 100
+   keywords per request, for batches large enough to be worth the queue delay
+2. Serper.dev batch queries, up to 100 keywords per request
+3. A bounded concurrent fan-out through the SERP provider router
+
+Keywords a bulk path fails to return fall through to the next one. The final
+summary reports throughput, API calls and the per-keyword API cost.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import aiohttp
+
+from config import settings
+from exceptions import APIKeyMissingError, APIRateLimitError, APIRequestError
+from schemas.serp_schemas import (
+    BatchSERPAnalysisRequest, OrganicResult, PeopleAlsoAsk, RelatedSearch,
+    SERPAnalysisResponse, SERPFeature, SERPFeatureType
+)
+from services.keyword_suggestion import dataforseo_location_code
+from services.serp_analysis import SERPAnalysisService
+from utils.single_flight import get_single_flight
+
+logger = logging.getLogger(__name__)
+
+DATAFORSEO_SERP_URL = "https://api.dataforseo.com/v3/serp/google/organic"
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+# Both providers accept at most 100 keywords per bulk request
+BULK_CHUNK_SIZE = 100
+
+
+class _BatchRun:
+    """Per-request bookkeeping: which keywords are done, API calls and spend"""
+
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+        self.done: set = set()
+        self.api_calls = 0
+        self.fetched = 0
+        self.failed = 0
+        self.cost_by_provider: Dict[str, float] = defaultdict(float)
+
+    def charge(self, provider: str, requests: int = 1) -> None:
+        cost = settings.serp_provider_costs.get(provider, 0.0)
+        self.cost_by_provider[provider] += cost * requests
+
+    def record_call(self, provider: str) -> None:
+        """Count and charge one provider request (failed, failed-over and hedged ones too)"""
+        self.api_calls += 1
+        self.charge(provider)
+
+    async def result(self, keyword: str, serp: SERPAnalysisResponse, source: str) -> None:
+        if keyword in self.done:
+            return
+        self.done.add(keyword)
+        self.fetched += 1
+        await self.queue.put({"type": "result", "keyword": keyword, "source": source, "serp": serp})
+
+    async def error(self, keyword: str, error: str) -> None:
+        if keyword in self.done:
+            return
+        self.done.add(keyword)
+        self.failed += 1
+        await self.queue.put({"type": "error", "keyword": keyword, "error": error})
+
+
+class SERPBatchService:
+    """
+    Bulk SERP fetching on top of SERPAnalysisService (same cache, parsers and
+    provider router).
+    """
+
+    def __init__(self, serp_service: Optional[SERPAnalysisService] = None):
+        self.serp = serp_service or SERPAnalysisService()
+
+    async def analyze_batch(
+        self, request: BatchSERPAnalysisRequest
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Fetch SERPs for every keyword, yielding each as soon as it is available.
+
+        Yields:
+            {"type": "result", "keyword": ..., "source": ..., "serp": {...}} per keyword
+            ("cache", "dataforseo_task", "serper_batch" or "live"),
+            {"type": "error", "keyword": ..., "error": ...} per keyword that failed,
+            and a final {"type": "summary", ...} with throughput and API cost
+        """
+        start_time = time.perf_counter()
+
+        # Deduplicate (case- and whitespace-insensitive), keeping first spelling
+        unique: Dict[str, str] = {}
+        for keyword in request.keywords:
+            keyword = keyword.strip()
+            if keyword:
+                unique.setdefault(keyword.lower(), keyword)
+        keywords = list(unique.values())
+
+        queue: asyncio.Queue = asyncio.Queue()
+        run = _BatchRun(queue)
+
+        async with self.serp:
+            # Cache hits first, looked up in one batch (a single MGET on Redis)
+            misses = []
+            cache_hits = 0
+            found: Dict[str, SERPAnalysisResponse] = {}
+            if request.use_cache:
+                found = await self.serp.cache.get_many(
+                    [self._cache_key(keyword, request) for keyword in keywords]
+                )
+            for keyword in keywords:
+                cached = found.get(self._cache_key(keyword, request))
+                if cached is not None:
+                    cached.cached = True
+                    cache_hits += 1
+                    yield {"type": "result", "keyword": keyword, "source": "cache", "serp": cached}
+                else:
+                    misses.append(keyword)
+
+            producer = asyncio.create_task(self._fetch_misses(misses, request, run))
+            try:
+                for _ in range(len(misses)):
+                    yield await queue.get()
+            finally:
+                producer.cancel()
+
+        elapsed = time.perf_counter() - start_time
+        api_cost = sum(run.cost_by_provider.values())
+        yield {
+            "type": "summary",
+            "total_keywords": len(request.keywords),
+            "unique_keywords": len(keywords),
+            "duplicates": len(request.keywords) - len(keywords),
+            "cache_hits": cache_hits,
+            "fetched": run.fetched,
+            "failed": run.failed,
+            "api_calls": run.api_calls,
+            "api_cost_usd": round(api_cost, 6),
+            "cost_per_keyword_usd": round(api_cost / run.fetched, 6) if run.fetched else 0.0,
+            "cost_by_provider": {name: round(cost, 6) for name, cost in run.cost_by_provider.items()},
+            "elapsed_seconds": round(elapsed, 2),
+            "keywords_per_second": round(len(keywords) / elapsed, 2) if elapsed else 0.0,
+        }
+
+    def _cache_key(self, keyword: str, request: BatchSERPAnalysisRequest) -> str:
+        # Same key as SERPAnalysisService.analyze_serp, so single and bulk lookups share entries
+        return f"{keyword}_{request.language}_{request.country}_{request.device}"
+
+    async def _fetch_misses(
+        self, keywords: List[str], request: BatchSERPAnalysisRequest, run: _BatchRun
+    ) -> None:
+        """Try each bulk path on whatever the previous one didn't return"""
+        paths: List[Callable] = []
+        if settings.has_dataforseo() and len(keywords) >= settings.serp_batch_task_min_keywords:
+            paths.append(self._fetch_with_dataforseo_tasks)
+        if settings.has_serper():
+            paths.append(self._fetch_with_serper_batch)
+        paths.append(self._fetch_live)
+
+        try:
+            for path in paths:
+                remaining = [keyword for keyword in keywords if keyword not in run.done]
+                if not remaining:
+                    break
+                try:
+                    await path(remaining, request, run)
+                except Exception as e:
+                    logger.warning(f"Bulk SERP path {path.__name__} failed, falling back: {e}")
+        finally:
+            # Every keyword gets exactly one event, whatever happened above
+            for keyword in keywords:
+                if keyword not in run.done:
+                    await run.error(keyword, "No SERP provider returned results")
+
+    async def _store(
+        self,
+        keyword: str,
+        serp: SERPAnalysisResponse,
+        request: BatchSERPAnalysisRequest,
+        run: _BatchRun,
+        source: str
+    ) -> None:
+        await self.serp.cache.set(self._cache_key(keyword, request), serp)
+        await run.result(keyword, serp, source)
+
+    # ----- DataForSEO standard queue -----
+
+    async def _dataforseo_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+        auth = aiohttp.BasicAuth(settings.dataforseo_login, settings.dataforseo_password)
+        try:
+            async with self.serp.session.request(method, url, auth=auth, **kwargs) as response:
+                if response.status == 401:
+                    raise APIKeyMissingError("Invalid DataForSEO credentials")
+                elif response.status == 429:
+                    raise APIRateLimitError("DataForSEO rate limit exceeded")
+                elif response.status != 200:
+                    raise APIRequestError(f"DataForSEO API error: {response.status}")
+                data = await response.json()
+        except aiohttp.ClientError as e:
+            raise APIRequestError(f"Network error: {e}")
+
+        if data.get("status_code") != 20000:
+            raise APIRequestError(f"DataForSEO API error: {data.get('status_message')}")
+        return data
+
+    async def _fetch_with_dataforseo_tasks(
+        self, keywords: List[str], request: BatchSERPAnalysisRequest, run: _BatchRun
+    ) -> None:
+        """Queue keywords as DataForSEO tasks, then collect them as they become ready"""
+        device = request.device if request.device in ("desktop", "mobile") else "desktop"
+        task_keywords: Dict[str, str] = {}
+
+        for i in range(0, len(keywords), BULK_CHUNK_SIZE):
+            chunk = keywords[i:i + BULK_CHUNK_SIZE]
+            payload = [
+                {
+                    "keyword": keyword,
+                    "location_code": dataforseo_location_code(request.country),
+                    "language_code": request.language,
+                    "device": device,
+                    "depth": request.num_results,
+                }
+                for keyword in chunk
+            ]
+            data = await self._dataforseo_request("POST", f"{DATAFORSEO_SERP_URL}/task_post", json=payload)
+            run.api_calls += 1
+            # Tasks come back in the order they were posted
+            for keyword, task in zip(chunk, data.get("tasks") or []):
+                if task.get("status_code") == 20100:
+                    task_keywords[task["id"]] = keyword
+                    run.charge("dataforseo")
+                else:
+                    logger.warning(f"DataForSEO rejected SERP task for {keyword}: {task.get('status_message')}")
+
+        semaphore = asyncio.Semaphore(request.max_concurrency)
+
+        async def collect(task_id: str) -> None:
+            async with semaphore:
+                data = await self._dataforseo_request("GET", f"{DATAFORSEO_SERP_URL}/task_get/advanced/{task_id}")
+                run.api_calls += 1
+            keyword = task_keywords.pop(task_id)
+            task = (data.get("tasks") or [{}])[0]
+            result = (task.get("result") or [None])[0]
+            if result is None:
+                logger.warning(f"DataForSEO SERP task for {keyword} returned no result: {task.get('status_message')}")
+                return
+            await self._store(keyword, self._parse_dataforseo_result(keyword, result), request, run, "dataforseo_task")
+
+        deadline = time.monotonic() + settings.serp_batch_task_timeout_seconds
+        while task_keywords and time.monotonic() < deadline:
+            await asyncio.sleep(settings.serp_batch_poll_interval_seconds)
+            data = await self._dataforseo_request("GET", f"{DATAFORSEO_SERP_URL}/tasks_ready")
+            run.api_calls += 1
+            ready = [
+                item["id"]
+                for task in data.get("tasks") or []
+                for item in task.get("result") or []
+                if item.get("id") in task_keywords
+            ]
+            outcomes = await asyncio.gather(*(collect(task_id) for task_id in ready), return_exceptions=True)
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.warning(f"DataForSEO task_get failed: {outcome}")
+
+        if task_keywords:
+            logger.warning(f"{len(task_keywords)} DataForSEO SERP tasks not ready in time; fetching them live")
+
+    def _parse_dataforseo_result(self, keyword: str, result: Dict[str, Any]) -> SERPAnalysisResponse:
+        """Parse a DataForSEO task_get/advanced result into our schema"""
+        organic_results = []
+        features = []
+        people_also_ask = []
+        related_searches = []
+        local_results = []
+
+        for item in result.get("items") or []:
+            item_type = item.get("type")
+            try:
+                if item_type == "organic":
+                    organic_results.append(
+                        OrganicResult(
+                            position=item.get("rank_group") or len(organic_results) + 1,
+                            title=item.get("title") or "",
+                            url=item.get("url", ""),
+                            displayed_url=item.get("breadcrumb") or item.get("url", ""),
+                            snippet=item.get("description") or "",
+                            domain=item.get("domain") or self.serp._extract_domain(item.get("url", "")),
+                        )
+                    )
+                elif item_type == "featured_snippet":
+                    features.append(
+                        SERPFeature(
+                            feature_type=SERPFeatureType.FEATURED_SNIPPET,
+                            title=item.get("title"),
+                            snippet=item.get("description"),
+                            source_url=item.get("url"),
+                            source_domain=item.get("domain"),
+                        )
+                    )
+                elif item_type == "people_also_ask":
+                    for element in item.get("items") or []:
+                        expanded = (element.get("expanded_element") or [{}])[0]
+                        people_also_ask.append(
+                            PeopleAlsoAsk(
+                                question=element.get("title") or "",
+                                answer=expanded.get("description"),
+                                source_url=expanded.get("url"),
+                                source_domain=expanded.get("domain"),
+                            )
+                        )
+                elif item_type == "related_searches":
+                    for query in item.get("items") or []:
+                        related_searches.append(RelatedSearch(keyword=query))
+                elif item_type == "knowledge_graph":
+                    features.append(
+                        SERPFeature(
+                            feature_type=SERPFeatureType.KNOWLEDGE_PANEL,
+                            title=item.get("title"),
+                            data=item,
+                        )
+                    )
+                elif item_type == "local_pack":
+                    local_results.append(item)
+            except Exception as e:
+                logger.warning(f"Error parsing DataForSEO {item_type} item: {e}")
+
+        if local_results:
+            features.append(
+                SERPFeature(
+                    feature_type=SERPFeatureType.LOCAL_PACK,
+                    data={"local_results": local_results},
+                )
+            )
+
+        return SERPAnalysisResponse(
+            keyword=keyword,
+            total_results=result.get("se_results_count") or 0,
+            organic_results=organic_results,
+            features=features,
+            people_also_ask=people_also_ask,
+            related_searches=related_searches,
+            serp_api_used="dataforseo",
+        )
+
+    # ----- Serper.dev batch queries -----
+
+    async def _fetch_with_serper_batch(
+        self, keywords: List[str], request: BatchSERPAnalysisRequest, run: _BatchRun
+    ) -> None:
+        """Send up to 100 queries per Serper.dev request, chunks in parallel"""
+        headers = {
+            "X-API-KEY": settings.serper_api_key,
+            "Content-Type": "application/json"
+        }
+        semaphore = asyncio.Semaphore(request.max_concurrency)
+
+        async def post(chunk: List[str]) -> None:
+            payload = [
+                {"q": keyword, "gl": request.country, "hl": request.language, "num": request.num_results}
+                for keyword in chunk
+            ]
+            async with semaphore:
+                try:
+                    async with self.serp.session.post(SERPER_SEARCH_URL, headers=headers, json=payload) as response:
+                        if response.status == 403:
+                            raise APIKeyMissingError("Invalid Serper.dev API key")
+                        elif response.status == 429:
+                            raise APIRateLimitError("Serper.dev rate limit exceeded")
+                        elif response.status != 200:
+                            raise APIRequestError(f"Serper.dev error: {response.status}")
+                        data = await response.json()
+                except aiohttp.ClientError as e:
+                    raise APIRequestError(f"Network error: {e}")
+            run.api_calls += 1
+            # Serper bills each query in the batch
+            run.charge("serper", len(chunk))
+
+            # Results come back in query order
+            for keyword, item in zip(chunk, data if isinstance(data, list) else [data]):
+                await self._store(keyword, self.serp._parse_serper_results(keyword, item), request, run, "serper_batch")
+
+        chunks = [keywords[i:i + BULK_CHUNK_SIZE] for i in range(0, len(keywords), BULK_CHUNK_SIZE)]
+        outcomes = await asyncio.gather(*(post(chunk) for chunk in chunks), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.warning(f"Serper.dev batch request failed: {outcome}")
+
+    # ----- Per-keyword fan-out -----
+
+    async def _fetch_live(
+        self, keywords: List[str], request: BatchSERPAnalysisRequest, run: _BatchRun
+    ) -> None:
+        """One routed provider call per keyword, at most max_concurrency at a time"""
+        semaphore = asyncio.Semaphore(request.max_concurrency)
+
+        async def fetch(keyword: str) -> None:
+            cache_key = self._cache_key(keyword, request)
+            async with semaphore:
+                try:
+                    # Shares the call with a concurrent /serp/analyze for the same keyword;
+                    # only requests this batch actually sent are charged to it
+                    serp = await get_single_flight().do(
+                        "serp",
+                        cache_key,
+                        lambda: self.serp._fetch_serp(
+                            cache_key, keyword, request.language, request.country,
+                            request.device, request.num_results, on_attempt=run.record_call
+                        ),
+                    )
+                except Exception as e:
+                    logger.warning(f"Bulk SERP fetch failed for {keyword}: {e}")
+                    await run.error(keyword, str(e))
+                    return
+            await run.result(keyword, serp, "live")
+
+        await asyncio.gather(*(fetch(keyword) for keyword in keywords))
+
+
+def get_serp_batch_service() -> SERPBatchService:
+    """Factory function to create service instance"""
+    return SERPBatchService()
@@ -0,0 +1,318 @@
+"""
+SERP Provider Router
+Spreads SERP lookups across every configured provider (Serper.dev, SerpAPI,
+ValueSERP) instead of pinning to the first one by config precedence.
+
+Per provider the router tracks a rolling window of latency and errors plus the
+remaining request quota, and:
+- orders providers by a routing strategy (config precedence, cost, or health),
+- fails over to the next provider when one errors,
+- benches a provider for a cooldown after an auth or rate-limit error,
+- optionally hedges: when the primary hasn't answered within its own p95 latency,
+  a second request goes to the next provider and the first answer wins.
+
+The router only sees provider names and zero-argument call factories, so tests can
+route between local stub coroutines without any network.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from config import settings
+from exceptions import APIKeyMissingError, APIRateLimitError, ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ROUTING_STRATEGIES = ("priority", "cost", "health")
+
+
+class _ProviderHealth:
+    """Rolling latency/error window, quota and cooldown for one provider"""
+
+    def __init__(self, window: int, quota: Optional[int] = None):
+        # (latency seconds, succeeded) per completed request
+        self.outcomes: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self.requests = 0
+        self.failures = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.quota_remaining = quota
+        self.cooldown_until = 0.0
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.outcomes.append((latency, ok))
+        if not ok:
+            self.failures += 1
+
+    @property
+    def samples(self) -> int:
+        return sum(1 for _, ok in self.outcomes if ok)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        latencies = sorted(latency for latency, ok in self.outcomes if ok)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(percentile * (len(latencies) - 1))))
+        return latencies[index]
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for _, ok in self.outcomes if not ok) / len(self.outcomes)
+
+    def score(self) -> Tuple[float, float]:
+        """Lower is better: recent error rate first, then p95 latency"""
+        p95 = self.latency_percentile(0.95)
+        if p95 is None:
+            # Untried providers go first; ones that have only failed go last
+            p95 = float("inf") if self.outcomes else 0.0
+        return (self.error_rate(), p95)
+
+    def cooling_down(self, now: float) -> bool:
+        return now < self.cooldown_until
+
+    def out_of_quota(self) -> bool:
+        return self.quota_remaining is not None and self.quota_remaining <= 0
+
+
+class SERPProviderRouter:
+    """
+    Route a lookup across providers with failover, hedging and health scoring.
+
+    Usage:
+        result = await router.fetch({
+            "serper": lambda: service._analyze_with_serper(...),
+            "serpapi": lambda: service._analyze_with_serpapi(...),
+        })
+
+    The order of `calls` is the configured precedence, used by the "priority"
+    strategy and as the tie-breaker for the others.
+    """
+
+    def __init__(
+        self,
+        strategy: str = "health",
+        costs: Optional[Dict[str, float]] = None,
+        quotas: Optional[Dict[str, int]] = None,
+        max_cost_per_request: Optional[float] = None,
+        hedge: bool = True,
+        hedge_min_samples: int = 20,
+        cooldown_seconds: float = 60.0,
+        window: int = 100,
+    ):
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(f"Unknown SERP routing strategy: {strategy}")
+        self.strategy = strategy
+        self.costs = costs or {}
+        self.quotas = quotas or {}
+        self.max_cost_per_request = max_cost_per_request
+        self.hedge = hedge
+        self.hedge_min_samples = max(1, hedge_min_samples)
+        self.cooldown_seconds = cooldown_seconds
+        self.window = window
+        self._health: Dict[str, _ProviderHealth] = {}
+
+    def _provider(self, name: str) -> _ProviderHealth:
+        health = self._health.get(name)
+        if health is None:
+            health = _ProviderHealth(self.window, self.quotas.get(name))
+            self._health[name] = health
+        return health
+
+    def route(self, names: List[str]) -> List[str]:
+        """Providers to try, best first; benched providers go last, over-budget ones are dropped"""
+        now = time.monotonic()
+        candidates = [
+            name for name in names
+            if not self._provider(name).out_of_quota()
+            and (self.max_cost_per_request is None
+                 or self.costs.get(name, 0.0) <= self.max_cost_per_request)
+        ]
+
+        def sort_key(name: str):
+            health = self._provider(name)
+            if self.strategy == "cost":
+                rank = (self.costs.get(name, 0.0), *health.score())
+            elif self.strategy == "health":
+                rank = health.score()
+            else:
+                rank = ()
+            return (health.cooling_down(now), *rank, names.index(name))
+
+        return sorted(candidates, key=sort_key)
+
+    async def fetch(
+        self,
+        calls: Dict[str, Callable[[], Awaitable[T]]],
+        on_attempt: Optional[Callable[[str], None]] = None,
+    ) -> T:
+        """
+        Run the lookup on the best provider, failing over (and hedging) as needed.
+
+        Args:
+            calls: Zero-argument call factory per provider name, in configured precedence
+            on_attempt: Called with the provider name for every request sent -
+                failovers and hedges included, whether they succeed or not - so
+                callers can account for what the lookup actually cost
+
+        Raises:
+            The provider's own error when only one provider was tried, otherwise
+            ServiceUnavailableError listing every provider's failure
+        """
+        order = self.route(list(calls))
+        if not order:
+            raise ServiceUnavailableError("No SERP provider within quota and cost limits")
+
+        errors: Dict[str, Exception] = {}
+        index = 0
+        while index < len(order):
+            primary = order[index]
+            backup = order[index + 1] if index + 1 < len(order) else None
+            if backup and self._should_hedge(primary):
+                try:
+                    return await self._hedged(primary, backup, calls, errors, on_attempt)
+                except Exception:
+                    index += 2
+                    continue
+            try:
+                return await self._attempt(primary, calls[primary], on_attempt)
+            except Exception as e:
+                errors[primary] = e
+                index += 1
+            if index < len(order):
+                logger.warning(f"SERP provider {primary} failed ({errors[primary]}), failing over to {order[index]}")
+
+        if len(errors) == 1:
+            raise next(iter(errors.values()))
+        summary = "; ".join(f"{name}: {error}" for name, error in errors.items())
+        raise ServiceUnavailableError(f"All SERP providers failed: {summary}")
+
+    def _should_hedge(self, name: str) -> bool:
+        return self.hedge and self._provider(name).samples >= self.hedge_min_samples
+
+    async def _attempt(
+        self,
+        name: str,
+        call: Callable[[], Awaitable[T]],
+        on_attempt: Optional[Callable[[str], None]] = None,
+    ) -> T:
+        health = self._provider(name)
+        health.requests += 1
+        if health.quota_remaining is not None:
+            health.quota_remaining -= 1
+        if on_attempt is not None:
+            on_attempt(name)
+
+        start = time.perf_counter()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            # A losing hedge says nothing about the provider's health
+            raise
+        except Exception as e:
+            health.record(time.perf_counter() - start, ok=False)
+            if isinstance(e, (APIKeyMissingError, APIRateLimitError)):
+                health.cooldown_until = time.monotonic() + self.cooldown_seconds
+                logger.warning(f"SERP provider {name} benched for {self.cooldown_seconds:.0f}s: {e}")
+            raise
+        health.record(time.perf_counter() - start, ok=True)
+        return result
+
+    async def _hedged(
+        self,
+        primary: str,
+        backup: str,
+        calls: Dict[str, Callable[[], Awaitable[T]]],
+        errors: Dict[str, Exception],
+        on_attempt: Optional[Callable[[str], None]] = None,
+    ) -> T:
+        """Send the backup request once the primary runs past its p95; first success wins"""
+        tasks = {asyncio.ensure_future(self._attempt(primary, calls[primary], on_attempt)): primary}
+        delay = self._provider(primary).latency_percentile(0.95)
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+
+        if done:
+            task = done.pop()
+            if task.exception() is None:
+                return task.result()
+            # Failed before the hedge was due: plain failover to the backup
+            errors[primary] = task.exception()
+            logger.warning(f"SERP provider {primary} failed ({errors[primary]}), failing over to {backup}")
+            try:
+                return await self._attempt(backup, calls[backup], on_attempt)
+            except Exception as e:
+                errors[backup] = e
+                raise
+
+        self._provider(backup).hedges_sent += 1
+        logger.info(f"SERP provider {primary} slower than its p95 ({delay:.2f}s), hedging with {backup}")
+        tasks[asyncio.ensure_future(self._attempt(backup, calls[backup], on_attempt))] = backup
+
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if tasks[task] == backup:
+                            self._provider(backup).hedges_won += 1
+                        return task.result()
+                    errors[tasks[task]] = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise errors[primary] if primary in errors else errors[backup]
+
+    def metrics(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        providers = {}
+        for name, health in self._health.items():
+            p50 = health.latency_percentile(0.5)
+            p95 = health.latency_percentile(0.95)
+            providers[name] = {
+                "requests": health.requests,
+                "failures": health.failures,
+                "error_rate": round(health.error_rate(), 3),
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "quota_remaining": health.quota_remaining,
+                "cost_per_request": self.costs.get(name),
+                "cooling_down": health.cooling_down(now),
+                "hedges_sent": health.hedges_sent,
+                "hedges_won": health.hedges_won,
+            }
+        return {
+            "strategy": self.strategy,
+            "hedge": self.hedge,
+            "providers": providers,
+        }
+
+
+# Global router instance
+_serp_provider_router: Optional[SERPProviderRouter] = None
+
+
+def get_serp_provider_router() -> SERPProviderRouter:
+    """
+    Get or create the process-wide SERP provider router.
+
+    Returns:
+        SERPProviderRouter instance
+    """
+    global _serp_provider_router
+    if _serp_provider_router is None:
+        _serp_provider_router = SERPProviderRouter(
+            strategy=settings.serp_routing_strategy,
+            costs=settings.serp_provider_costs,
+            quotas=settings.serp_provider_quotas,
+            max_cost_per_request=settings.serp_max_cost_per_request,
+            hedge=settings.serp_hedge_requests,
+            hedge_min_samples=settings.serp_hedge_min_samples,
+            cooldown_seconds=settings.serp_provider_cooldown_seconds,
+        )
+    return _serp_provider_router
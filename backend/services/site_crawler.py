@@ -0,0 +1,364 @@
+"""
+Site Crawler Service
+Crawls a site from a seed URL (and optionally its sitemap), running the technical
+SEO audit on every page and producing a site-level rollup.
+
+Memory stays bounded for large sites: only the frontier, the set of scheduled
+URLs and a compact CrawledPageSummary per page are kept - never the HTML.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+from lxml import etree
+
+from schemas.technical_seo_schemas import (
+    CrawledPageSummary,
+    SiteCrawlRequest,
+    SiteCrawlSummary,
+    TechnicalSEOAuditRequest,
+)
+from services.technical_seo_service import TechnicalSEOService, get_technical_seo_service
+from utils.url_utils import is_html_candidate, normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class _CrawlState:
+    """Mutable bookkeeping for a single crawl"""
+
+    def __init__(self, request: SiteCrawlRequest, seed: str):
+        self.request = request
+        self.seed = seed
+        # Internal hosts: the seed's, plus wherever the seed redirects (example.com -> www.example.com)
+        self.hosts: Set[str] = {urlparse(seed).netloc}
+        self.scheduled: Set[str] = set()
+        self.sitemap_urls: Set[str] = set()
+        self.inbound: Dict[str, int] = defaultdict(int)
+        self.summaries: Dict[str, CrawledPageSummary] = {}
+        self.pages_failed = 0
+        self.blocked_by_robots = 0
+        self.budget_exhausted = False
+        self.robots: Optional[RobotFileParser] = None
+        self.crawl_delay = 0.0
+        self.next_fetch_at = 0.0
+
+
+class SiteCrawlerService:
+    """
+    Breadth-first site crawler built on TechnicalSEOService.
+    Yields one event per audited page followed by a site summary.
+    """
+
+    MAX_CHILD_SITEMAPS = 50
+    USER_AGENT = "SEOSuiteBot"
+
+    def __init__(self, audit_service: Optional[TechnicalSEOService] = None):
+        self.audit_service = audit_service or get_technical_seo_service()
+
+    async def crawl(self, request: SiteCrawlRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Crawl a site and stream results.
+
+        Args:
+            request: SiteCrawlRequest with seed URL and crawl limits
+
+        Yields:
+            {"type": "page", "url": ..., "audit": {...}} for each audited page,
+            {"type": "error", "url": ..., "error": ...} for pages that failed,
+            and a final {"type": "summary", "summary": {...}}
+        """
+        start_time = time.time()
+        seed = normalize_url(request.url)
+        state = _CrawlState(request, seed)
+        redirected = await self._resolve_redirects(seed)
+        if redirected:
+            state.hosts.add(urlparse(redirected).netloc)
+
+        if request.respect_robots:
+            state.robots = await self._load_robots(redirected or seed)
+
+        concurrency = request.max_concurrency
+        crawl_delay = state.robots.crawl_delay(self.USER_AGENT) if state.robots else None
+        if crawl_delay:
+            # Honor crawl-delay: one page at a time, crawl_delay seconds apart
+            concurrency = 1
+            state.crawl_delay = float(crawl_delay)
+
+        frontier: asyncio.Queue = asyncio.Queue()
+        # Bounded, so a slow consumer pauses the workers instead of buffering audits
+        events: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        self._schedule(state, frontier, seed)
+
+        if request.use_sitemap:
+            for url in await self._load_sitemap_urls(state, redirected or seed):
+                if self._schedule(state, frontier, url):
+                    state.sitemap_urls.add(url)
+
+        workers = [
+            asyncio.create_task(self._worker(state, frontier, events))
+            for _ in range(concurrency)
+        ]
+
+        async def close_when_done():
+            await frontier.join()
+            await events.put(None)
+
+        monitor = asyncio.create_task(close_when_done())
+
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            monitor.cancel()
+            for worker in workers:
+                worker.cancel()
+
+        summary = self._build_summary(state, seed, time.time() - start_time)
+        yield {"type": "summary", "summary": summary.model_dump(mode="json")}
+
+    def _schedule(self, state: _CrawlState, frontier: asyncio.Queue, url: str) -> bool:
+        """Add a normalized URL to the frontier if it is new, allowed and within budget"""
+        if url in state.scheduled:
+            return False
+        if urlparse(url).netloc not in state.hosts or not is_html_candidate(url):
+            return False
+        if state.robots and not state.robots.can_fetch(self.USER_AGENT, url):
+            state.blocked_by_robots += 1
+            return False
+        if len(state.scheduled) >= state.request.max_pages:
+            state.budget_exhausted = True
+            return False
+        state.scheduled.add(url)
+        frontier.put_nowait(url)
+        return True
+
+    async def _worker(
+        self, state: _CrawlState, frontier: asyncio.Queue, events: asyncio.Queue
+    ):
+        """Audit URLs from the frontier until cancelled"""
+        request = state.request
+        while True:
+            url = await frontier.get()
+            try:
+                if state.crawl_delay:
+                    wait = state.next_fetch_at - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    state.next_fetch_at = time.monotonic() + state.crawl_delay
+                audit_request = TechnicalSEOAuditRequest(
+                    url=url,
+                    check_broken_links=request.check_broken_links,
+                    max_links_to_check=request.max_links_to_check,
+                    check_all_links=request.check_all_links,
+                    timeout_seconds=request.timeout_seconds,
+                )
+                audit, page = await self.audit_service.audit_page(audit_request)
+                if url == state.seed:
+                    # Links on the seed page are relative to where it redirected
+                    state.hosts.add(urlparse(page.final_url).netloc)
+
+                # Follow internal links; count inbound links for orphan detection
+                linked_from_page: Set[str] = set()
+                for href, _ in page.index.anchors:
+                    target = normalize_url(urljoin(page.final_url, href))
+                    if target == url or target in linked_from_page:
+                        continue
+                    linked_from_page.add(target)
+                    self._schedule(state, frontier, target)
+                    if target in state.scheduled:
+                        state.inbound[target] += 1
+
+                final_url = normalize_url(page.final_url)
+                if final_url != url:
+                    # Avoid re-crawling the redirect target
+                    state.scheduled.add(final_url)
+
+                canonical = audit.canonical_tag.href
+                state.summaries[url] = CrawledPageSummary(
+                    url=url,
+                    final_url=final_url,
+                    title=audit.title_tag.content,
+                    meta_description=audit.meta_description.content,
+                    canonical=normalize_url(urljoin(page.final_url, canonical)) if canonical else None,
+                    overall_score=audit.overall_score,
+                    from_sitemap=url in state.sitemap_urls,
+                )
+                del page
+
+                await events.put(
+                    {"type": "page", "url": url, "audit": audit.model_dump(mode="json")}
+                )
+            except Exception as e:
+                logger.warning(f"Crawl failed for {url}: {e}")
+                state.pages_failed += 1
+                await events.put({"type": "error", "url": url, "error": str(e)})
+            finally:
+                frontier.task_done()
+
+    async def _fetch_text(self, url: str) -> Optional[str]:
+        """GET a small text resource (robots.txt, sitemap) with the shared audit client"""
+        try:
+            response = await self.audit_service.client.get(
+                url,
+                headers=self.audit_service.default_headers,
+                timeout=15,
+                follow_redirects=True,
+            )
+            if response.status_code != 200:
+                return None
+            return response.text
+        except Exception as e:
+            logger.debug(f"Failed to fetch {url}: {e}")
+            return None
+
+    async def _resolve_redirects(self, url: str) -> Optional[str]:
+        """Where the seed URL redirects to, if anywhere (HEAD, so no body is fetched)"""
+        try:
+            response = await self.audit_service.client.head(
+                url,
+                headers=self.audit_service.default_headers,
+                timeout=15,
+                follow_redirects=True,
+            )
+        except Exception as e:
+            logger.debug(f"Failed to resolve {url}: {e}")
+            return None
+        final_url = normalize_url(str(response.url))
+        return final_url if final_url != url else None
+
+    async def _load_robots(self, seed: str) -> Optional[RobotFileParser]:
+        """Fetch and parse robots.txt; a missing file allows everything"""
+        parsed = urlparse(seed)
+        robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+        content = await self._fetch_text(robots_url)
+        if content is None:
+            return None
+        robots = RobotFileParser(robots_url)
+        robots.parse(content.splitlines())
+        return robots
+
+    async def _load_sitemap_urls(self, state: _CrawlState, seed: str) -> List[str]:
+        """Collect page URLs from the sitemap(s), following one level of sitemap index"""
+        parsed = urlparse(seed)
+        if state.request.sitemap_url:
+            pending = [state.request.sitemap_url]
+        elif state.robots and state.robots.site_maps():
+            pending = list(state.robots.site_maps())
+        else:
+            pending = [f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"]
+
+        urls: List[str] = []
+        fetched = 0
+        while pending and fetched < self.MAX_CHILD_SITEMAPS and len(urls) < state.request.max_pages:
+            sitemap_url = pending.pop(0)
+            fetched += 1
+            content = await self._fetch_text(sitemap_url)
+            if not content:
+                continue
+            try:
+                root = etree.fromstring(
+                    content.encode("utf-8"), etree.XMLParser(recover=True)
+                )
+            except Exception as e:
+                logger.warning(f"Could not parse sitemap {sitemap_url}: {e}")
+                continue
+            if root is None:
+                continue
+
+            is_index = etree.QName(root).localname == "sitemapindex"
+            for loc in root.iter("{*}loc"):
+                if not loc.text:
+                    continue
+                if is_index:
+                    pending.append(loc.text.strip())
+                else:
+                    urls.append(normalize_url(loc.text))
+        return urls
+
+    def _build_summary(
+        self, state: _CrawlState, seed: str, elapsed: float
+    ) -> SiteCrawlSummary:
+        """Site-level rollup over the compact page summaries"""
+        titles: Dict[str, List[str]] = defaultdict(list)
+        descriptions: Dict[str, List[str]] = defaultdict(list)
+        for summary in state.summaries.values():
+            # Links usually point at the final URL; a redirected page (/a -> /a/) counts both
+            summary.inbound_links = state.inbound.get(summary.url, 0)
+            if summary.final_url != summary.url:
+                summary.inbound_links += state.inbound.get(summary.final_url, 0)
+            if summary.title:
+                titles[summary.title].append(summary.url)
+            if summary.meta_description:
+                descriptions[summary.meta_description].append(summary.url)
+
+        orphans = [
+            summary.url for summary in state.summaries.values()
+            if summary.url != seed and summary.inbound_links == 0
+        ]
+
+        scores = [summary.overall_score for summary in state.summaries.values()]
+
+        return SiteCrawlSummary(
+            seed_url=seed,
+            pages_crawled=len(state.summaries),
+            pages_failed=state.pages_failed,
+            blocked_by_robots=state.blocked_by_robots,
+            budget_exhausted=state.budget_exhausted,
+            average_score=round(sum(scores) / len(scores), 1) if scores else None,
+            duplicate_titles={t: urls for t, urls in titles.items() if len(urls) > 1},
+            duplicate_meta_descriptions={
+                d: urls for d, urls in descriptions.items() if len(urls) > 1
+            },
+            orphan_pages=orphans,
+            canonical_loops=self._find_canonical_loops(state.summaries),
+            crawl_time_seconds=round(elapsed, 2),
+        )
+
+    @staticmethod
+    def _find_canonical_loops(summaries: Dict[str, CrawledPageSummary]) -> List[List[str]]:
+        """Find cycles in the page -> canonical graph (self-references are fine)"""
+        canonical_of = {
+            url: s.canonical for url, s in summaries.items()
+            if s.canonical and s.canonical != url
+        }
+        loops: List[List[str]] = []
+        seen_in_loop: Set[str] = set()
+        for start in canonical_of:
+            path: List[str] = []
+            position: Dict[str, int] = {}
+            node = start
+            while node in canonical_of and node not in position and node not in seen_in_loop:
+                position[node] = len(path)
+                path.append(node)
+                node = canonical_of[node]
+            if node in position:
+                loop = path[position[node]:]
+                loops.append(loop)
+                seen_in_loop.update(loop)
+        return loops
+
+
+# Global service instance
+_site_crawler_service: Optional[SiteCrawlerService] = None
+
+
+def get_site_crawler_service() -> SiteCrawlerService:
+    """
+    Get or create the site crawler service singleton.
+
+    Returns:
+        SiteCrawlerService instance
+    """
+    global _site_crawler_service
+    if _site_crawler_service is None:
+        _site_crawler_service = SiteCrawlerService()
+    return _site_crawler_service
@@ -7,15 +7,20 @@ import logging
 import re
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse, urlunparse
 
 import httpx
 import asyncio
-from bs4 import BeautifulSoup
 from pydantic import HttpUrl
+from services.image_probe import get_image_prober
+from services.link_checker import get_link_checker
+from services.page_index import PageIndex, build_page_index
+from utils.http_client import HTTPClientRegistry, get_http_client_registry
+from utils.process_pool import run_cpu_bound
 from schemas.technical_seo_schemas import (
     AltTagCheck,
+    BatchAuditRequest,
     BrokenLink,
     CanonicalTagCheck,
     HeadingStructure,
@@ -55,12 +60,13 @@ class PageData:
 
     url: str
     final_url: str
-    html: str
-    soup: BeautifulSoup
     headers: Dict[str, str]
     status_code: int
     load_time: float
     content_size: int
+    # Built in the process-pool worker by _analyze_page. Back in the event loop
+    # it only carries the images and anchors (what the network checks need)
+    index: Optional[PageIndex] = None
 
 
 class TechnicalSEOService:
@@ -77,16 +83,29 @@ class TechnicalSEOService:
     META_DESC_MAX_LENGTH = 160
     META_DESC_OPTIMAL_MAX = 155
     MAX_IMAGE_SIZE_KB = 500  # Images larger than 500KB are flagged
+    MAX_IMAGE_SCALE_FACTOR = 2  # Intrinsic width over 2x the declared width is flagged
     CRITICAL_LOAD_TIME = 3.0  # seconds
 
-    def __init__(self):
-        # We'll create the httpx AsyncClient instances per request or manage them differently,
-        # but for simplicity, we can just use httpx.AsyncClient as an async context manager
-        # inside the fetch methods, or we can configure default headers here to be used later.
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
+        # Audits share the process-wide pooled client (TLS verification off so
+        # sites with broken certificates can still be audited).
+        self.http_clients = http_clients or get_http_client_registry()
         self.default_headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
 
+    def __getstate__(self):
+        # Pickled into process-pool workers to run the static checks; the
+        # pooled HTTP clients stay in the parent process.
+        state = self.__dict__.copy()
+        state.pop("http_clients", None)
+        return state
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled httpx client used for page, link and image fetches"""
+        return self.http_clients.httpx_client("audit", verify=False)
+
     async def audit_url(
         self, request: TechnicalSEOAuditRequest
     ) -> TechnicalSEOAuditResponse:
@@ -99,32 +118,49 @@ class TechnicalSEOService:
         Returns:
             TechnicalSEOAuditResponse with complete analysis
         """
-        start_time = time.time()
+        response, _ = await self.audit_page(request)
+        return response
+
+    async def audit_page(
+        self, request: TechnicalSEOAuditRequest
+    ) -> Tuple[TechnicalSEOAuditResponse, PageData]:
+        """
+        Audit a URL and also return the fetched PageData
+        (used by the site crawler to follow the page's links).
 
+        Args:
+            request: TechnicalSEOAuditRequest with URL and options
+
+        Returns:
+            Tuple of (TechnicalSEOAuditResponse, PageData)
+        """
         # Fetch the page
-        page_data = await self._fetch_page(request)
-
-        # Run all checks
-        title_check = self._check_title_tag(page_data)
-        meta_desc_check = self._check_meta_description(page_data)
-        headings_check = self._check_headings(page_data)
-        alt_tags_check = self._check_alt_tags(page_data)
-        canonical_check = self._check_canonical(page_data)
-        robots_check = self._check_robots_meta(page_data)
-        og_check = self._check_open_graph(page_data)
-        twitter_check = self._check_twitter_cards(page_data)
-        links_check = await self._check_internal_links(page_data, request)
-        image_size_check = await self._check_image_sizes(page_data)
-        structured_data_check = self._check_structured_data(page_data)
-        security_check = self._check_security(page_data)
-        mobile_check = self._check_mobile_friendly(page_data)
-        charset_check = self._check_charset(page_data)
-        viewport_check = self._check_viewport(page_data)
-        language_check = self._check_language(page_data)
-        url_structure_check = self._check_url_structure(page_data)
-
-        # Calculate load time (already measured during fetch, but can add rendering estimate)
-        load_time_check = self._check_load_time(page_data)
+        page_data, html = await self._fetch_page(request)
+
+        # Parsing and rule checks run in one process-pool call; the network-bound
+        # link and image checks then run concurrently on the event loop
+        static = await run_cpu_bound(self._analyze_page, page_data, html)
+        page_data.index = static["page_index"]
+        links_check, image_size_check = await asyncio.gather(
+            self._check_internal_links(page_data, request, static["internal_links"]),
+            self._check_image_sizes(page_data),
+        )
+        title_check = static["title"]
+        meta_desc_check = static["meta_description"]
+        headings_check = static["headings"]
+        alt_tags_check = static["alt_tags"]
+        canonical_check = static["canonical"]
+        robots_check = static["robots"]
+        og_check = static["open_graph"]
+        twitter_check = static["twitter_cards"]
+        structured_data_check = static["structured_data"]
+        security_check = static["security"]
+        mobile_check = static["mobile_friendly"]
+        charset_check = static["charset"]
+        viewport_check = static["viewport"]
+        language_check = static["language"]
+        url_structure_check = static["url_structure"]
+        load_time_check = static["load_time"]
 
         # Calculate overall score
         overall_score = self._calculate_overall_score(
@@ -172,7 +208,7 @@ class TechnicalSEOService:
             round(page_data.content_size / 1024, 2) if page_data.content_size else None
         )
 
-        return TechnicalSEOAuditResponse(
+        response = TechnicalSEOAuditResponse(
             url=request.url,
             final_url=page_data.final_url,
             title_tag=title_check,
@@ -203,6 +239,7 @@ class TechnicalSEOService:
             server=page_data.headers.get("Server"),
             html_size_kb=html_size_kb,
         )
+        return response, page_data
 
     async def quick_audit(self, request: QuickAuditRequest) -> QuickAuditResponse:
         """
@@ -220,15 +257,16 @@ class TechnicalSEOService:
             check_broken_links=False,  # Skip link checking for speed
         )
 
-        page_data = await self._fetch_page(audit_request)
+        page_data, html = await self._fetch_page(audit_request)
 
         # Run essential checks only
-        title_check = self._check_title_tag(page_data)
-        meta_desc_check = self._check_meta_description(page_data)
-        headings_check = self._check_headings(page_data)
-        canonical_check = self._check_canonical(page_data)
-        robots_check = self._check_robots_meta(page_data)
-        alt_tags_check = self._check_alt_tags(page_data)
+        static = await run_cpu_bound(self._analyze_page, page_data, html, True)
+        title_check = static["title"]
+        meta_desc_check = static["meta_description"]
+        headings_check = static["headings"]
+        canonical_check = static["canonical"]
+        robots_check = static["robots"]
+        alt_tags_check = static["alt_tags"]
 
         # Calculate score
         checks = [
@@ -261,15 +299,88 @@ class TechnicalSEOService:
             page_load_time_seconds=page_data.load_time,
         )
 
-    async def _fetch_page(self, request: TechnicalSEOAuditRequest) -> PageData:
+    async def audit_batch(
+        self, request: BatchAuditRequest
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Audit many URLs with a bounded worker pool, yielding each result as soon
+        as it finishes (completion order, not input order).
+
+        Args:
+            request: BatchAuditRequest with URLs and options
+
+        Yields:
+            {"type": "result", "index": i, "url": ..., "audit": {...}} per success,
+            {"type": "error", "index": i, "url": ..., "error": ...} per failure,
+            and a final {"type": "summary", ...} with counts and elapsed time
+        """
+        start_time = time.time()
+        pending: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(request.urls):
+            pending.put_nowait(item)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def worker():
+            while True:
+                try:
+                    index, url = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    audit = await self.audit_url(
+                        TechnicalSEOAuditRequest(
+                            url=url,
+                            check_broken_links=request.check_broken_links,
+                            max_links_to_check=request.max_links_to_check,
+                            check_all_links=request.check_all_links,
+                            timeout_seconds=request.timeout_seconds,
+                        )
+                    )
+                    await results.put(
+                        {"type": "result", "index": index, "url": url,
+                         "audit": audit.model_dump(mode="json")}
+                    )
+                except Exception as e:
+                    logger.warning(f"Batch audit failed for {url}: {e}")
+                    await results.put(
+                        {"type": "error", "index": index, "url": url, "error": str(e)}
+                    )
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(request.max_concurrency, len(request.urls)))
+        ]
+
+        succeeded = failed = 0
+        try:
+            for _ in range(len(request.urls)):
+                event = await results.get()
+                if event["type"] == "result":
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield event
+        finally:
+            for task in workers:
+                task.cancel()
+
+        yield {
+            "type": "summary",
+            "total": len(request.urls),
+            "succeeded": succeeded,
+            "failed": failed,
+            "elapsed_seconds": round(time.time() - start_time, 2),
+        }
+
+    async def _fetch_page(self, request: TechnicalSEOAuditRequest) -> Tuple[PageData, str]:
         """
-        Fetch the page and return parsed data.
+        Fetch the page (parsing happens later, in _analyze_page).
 
         Args:
             request: Audit request with URL
 
         Returns:
-            PageData with HTML, soup, and metadata
+            Tuple of (PageData with response metadata, page HTML)
 
         Raises:
             Exception if page cannot be fetched
@@ -277,29 +388,24 @@ class TechnicalSEOService:
         start_time = time.time()
 
         try:
-            async with httpx.AsyncClient(
+            response = await self.client.get(
+                request.url,
                 headers=self.default_headers,
                 follow_redirects=request.follow_redirects,
                 timeout=request.timeout_seconds,
-                verify=False, # Ignore SSL errors for audits
-            ) as client:
-                response = await client.get(request.url)
-                response.raise_for_status()
-                load_time = time.time() - start_time
-
-                html = response.text
-                soup = BeautifulSoup(html, "lxml")
-
-                return PageData(
-                    url=request.url,
-                    final_url=str(response.url),
-                    html=html,
-                    soup=soup,
-                    headers=dict(response.headers),
-                    status_code=response.status_code,
-                    load_time=load_time,
-                    content_size=len(html.encode("utf-8")),
-                )
+            )
+            response.raise_for_status()
+            load_time = time.time() - start_time
+
+            page_data = PageData(
+                url=request.url,
+                final_url=str(response.url),
+                headers=dict(response.headers),
+                status_code=response.status_code,
+                load_time=load_time,
+                content_size=len(response.content),
+            )
+            return page_data, response.text
 
         except httpx.RequestError as e:
             logger.error(f"Failed to fetch {request.url}: {e}")
@@ -308,10 +414,69 @@ class TechnicalSEOService:
             logger.error(f"HTTP error {e.response.status_code} when fetching {request.url}")
             raise Exception(f"HTTP error: {e.response.status_code}")
 
+    def _analyze_page(
+        self, page: PageData, html: str, essential_only: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Parse the page and run the static checks in a single process-pool call,
+        so only the HTML goes to the worker and the full index never comes back.
+
+        Args:
+            page: Fetched page data (without an index yet)
+            html: Page HTML
+            essential_only: Only run the checks used by the quick audit
+
+        Returns:
+            The static check results, plus "page_index": the images and anchors
+            the image check and the site crawler still need
+        """
+        page.index = build_page_index(html)
+        results = self._run_static_checks(page, essential_only)
+        results["page_index"] = PageIndex(images=page.index.images, anchors=page.index.anchors)
+        return results
+
+    def _run_static_checks(self, page: PageData, essential_only: bool = False) -> Dict[str, Any]:
+        """
+        Evaluate every check that needs only the page index (no network), and
+        resolve the internal links the broken-link check will probe.
+        Runs inside a process-pool worker, so it must stay free of I/O.
+
+        Args:
+            page: Fetched page data
+            essential_only: Only run the checks used by the quick audit
+
+        Returns:
+            Mapping of check name to its result model (plus "internal_links")
+        """
+        results = {
+            "title": self._check_title_tag(page),
+            "meta_description": self._check_meta_description(page),
+            "headings": self._check_headings(page),
+            "alt_tags": self._check_alt_tags(page),
+            "canonical": self._check_canonical(page),
+            "robots": self._check_robots_meta(page),
+        }
+        if essential_only:
+            return results
+
+        results.update(
+            internal_links=self._collect_internal_links(page),
+            open_graph=self._check_open_graph(page),
+            twitter_cards=self._check_twitter_cards(page),
+            structured_data=self._check_structured_data(page),
+            security=self._check_security(page),
+            mobile_friendly=self._check_mobile_friendly(page),
+            charset=self._check_charset(page),
+            viewport=self._check_viewport(page),
+            language=self._check_language(page),
+            url_structure=self._check_url_structure(page),
+            load_time=self._check_load_time(page),
+        )
+        return results
+
     def _check_title_tag(self, page: PageData) -> TitleTagCheck:
         """Check title tag for SEO best practices."""
-        title_tag = page.soup.find("title")
-        title = title_tag.get_text(strip=True) if title_tag else None
+        title = page.index.title
         length = len(title) if title else 0
 
         status = SEOStatus.PASS
@@ -339,7 +504,7 @@ class TechnicalSEOService:
 
     def _check_meta_description(self, page: PageData) -> MetaDescriptionCheck:
         """Check meta description for SEO best practices."""
-        meta_desc_tag = page.soup.find("meta", attrs={"name": "description"})
+        meta_desc_tag = page.index.find_meta("name", "description")
         content = meta_desc_tag.get("content", "").strip() if meta_desc_tag else None
         length = len(content) if content else 0
 
@@ -376,18 +541,15 @@ class TechnicalSEOService:
         headings = []
         hierarchy_issues = []
 
-        # Extract all headings
-        for level in range(1, 7):
-            tag_name = f"h{level}"
-            for i, tag in enumerate(page.soup.find_all(tag_name)):
-                text = tag.get_text(strip=True)
-                headings.append(
-                    HeadingStructure(
-                        tag=tag_name,
-                        text=text[:100],  # Limit text length
-                        order=len(headings) + 1,
-                    )
+        # Extract all headings (document order)
+        for tag_name, text in page.index.headings:
+            headings.append(
+                HeadingStructure(
+                    tag=tag_name,
+                    text=text[:100],  # Limit text length
+                    order=len(headings) + 1,
                 )
+            )
 
         h1_count = sum(1 for h in headings if h.tag == "h1")
         h2_count = sum(1 for h in headings if h.tag == "h2")
@@ -452,22 +614,22 @@ class TechnicalSEOService:
 
     def _check_alt_tags(self, page: PageData) -> AltTagCheck:
         """Check for images missing alt text."""
-        images = page.soup.find_all("img")
+        images = page.index.images
         total = len(images)
 
         missing_alt = []
         with_alt = 0
 
         for img in images:
-            alt = img.get("alt", "").strip()
-            src = img.get("src", "") or img.get("data-src", "") or "unknown"
+            alt = (img.alt or "").strip()
+            src = img.src or img.data_src or "unknown"
 
             if not alt:
                 missing_alt.append(
                     ImageWithoutAlt(
                         src=src[:200],
                         tag_type="img",
-                        context=img.parent.name if img.parent else None,
+                        context=img.parent,
                     )
                 )
             else:
@@ -504,7 +666,7 @@ class TechnicalSEOService:
 
     def _check_canonical(self, page: PageData) -> CanonicalTagCheck:
         """Check canonical tag."""
-        canonical_tag = page.soup.find("link", attrs={"rel": "canonical"})
+        canonical_tag = page.index.find_link("canonical")
         href = canonical_tag.get("href", "").strip() if canonical_tag else None
 
         present = bool(href)
@@ -540,7 +702,7 @@ class TechnicalSEOService:
 
     def _check_robots_meta(self, page: PageData) -> RobotsMetaCheck:
         """Check robots meta tag."""
-        robots_tag = page.soup.find("meta", attrs={"name": "robots"})
+        robots_tag = page.index.find_meta("name", "robots")
         content = robots_tag.get("content", "").lower() if robots_tag else ""
 
         present = bool(content)
@@ -575,12 +737,11 @@ class TechnicalSEOService:
         og_tags = []
 
         # Find all OG tags
-        for tag in page.soup.find_all(
-            "meta", property=lambda x: x and x.startswith("og:")
-        ):
+        for tag in page.index.metas:
             prop = tag.get("property", "")
-            content = tag.get("content", "")
-            og_tags.append(OpenGraphTag(property=prop, content=content))
+            if prop.startswith("og:"):
+                content = tag.get("content", "")
+                og_tags.append(OpenGraphTag(property=prop, content=content))
 
         # Check for essential tags
         has_title = any(t.property == "og:title" for t in og_tags)
@@ -631,12 +792,11 @@ class TechnicalSEOService:
         """Check Twitter Card tags."""
         twitter_tags = []
 
-        for tag in page.soup.find_all(
-            "meta", attrs={"name": lambda x: x and x.startswith("twitter:")}
-        ):
+        for tag in page.index.metas:
             name = tag.get("name", "")
-            content = tag.get("content", "")
-            twitter_tags.append(TwitterCardTag(name=name, content=content))
+            if name.startswith("twitter:"):
+                content = tag.get("content", "")
+                twitter_tags.append(TwitterCardTag(name=name, content=content))
 
         has_card = any(t.name == "twitter:card" for t in twitter_tags)
         has_title = any(t.name == "twitter:title" for t in twitter_tags)
@@ -665,67 +825,59 @@ class TechnicalSEOService:
             recommendations=recommendations,
         )
 
-    async def _check_internal_links(
-        self, page: PageData, request: TechnicalSEOAuditRequest
-    ) -> InternalLinksCheck:
-        """Check for broken internal links."""
+    def _collect_internal_links(self, page: PageData) -> List[Dict[str, str]]:
+        """Resolve every anchor and keep the ones on the page's own domain."""
         parsed_base = urlparse(page.final_url)
         base_domain = parsed_base.netloc
 
         # Find all links
-        links = page.soup.find_all("a", href=True)
         internal_links = []
 
-        for link in links:
-            href = link.get("href", "")
+        for href, anchor in page.index.anchors:
             full_url = urljoin(page.final_url, href)
             parsed_url = urlparse(full_url)
 
             # Only check internal links
             if parsed_url.netloc == base_domain:
-                internal_links.append(
-                    {"url": full_url, "anchor": link.get_text(strip=True)[:50]}
-                )
+                internal_links.append({"url": full_url, "anchor": anchor[:50]})
+
+        return internal_links
+
+    async def _check_internal_links(
+        self,
+        page: PageData,
+        request: TechnicalSEOAuditRequest,
+        internal_links: List[Dict[str, str]],
+    ) -> InternalLinksCheck:
+        """Check for broken internal links."""
+        # First anchor text seen for each URL
+        anchors_by_url: Dict[str, str] = {}
+        for link in internal_links:
+            anchors_by_url.setdefault(link["url"], link["anchor"])
 
-        unique_links = {link["url"] for link in internal_links}
         total_links = len(internal_links)
-        unique_count = len(unique_links)
+        unique_count = len(anchors_by_url)
 
         # Check for broken links if enabled
         broken_links = []
         if request.check_broken_links:
-            links_to_check = list(unique_links)[: request.max_links_to_check]
-
-            async def check_link(url: str, client: httpx.AsyncClient):
-                try:
-                    # Get anchor text for this URL
-                    anchor_text = next((l["anchor"] for l in internal_links if l["url"] == url), None)
-                    
-                    response = await client.head(url, timeout=10, follow_redirects=True)
-                    if response.status_code >= 400:
-                        # Try GET if HEAD fails
-                        response = await client.get(url, timeout=10, follow_redirects=True)
-                        if response.status_code >= 400:
-                            return BrokenLink(
-                                url=url,
-                                anchor_text=anchor_text,
-                                status_code=response.status_code,
-                                error=None,
-                            )
-                except Exception as e:
-                    anchor_text = next((l["anchor"] for l in internal_links if l["url"] == url), None)
-                    return BrokenLink(
-                        url=url,
-                        anchor_text=anchor_text,
-                        status_code=None,
-                        error=str(e),
-                    )
-                return None
+            links_to_check = list(anchors_by_url)
+            if not request.check_all_links:
+                links_to_check = links_to_check[: request.max_links_to_check]
 
-            async with httpx.AsyncClient(headers=self.default_headers, verify=False) as client:
-                tasks = [check_link(url, client) for url in links_to_check]
-                results = await asyncio.gather(*tasks)
-                broken_links = [r for r in results if r is not None]
+            statuses = await get_link_checker().check_many(
+                links_to_check, headers=self.default_headers
+            )
+            broken_links = [
+                BrokenLink(
+                    url=url,
+                    anchor_text=anchors_by_url[url],
+                    status_code=link_status.status_code if link_status.error is None else None,
+                    error=link_status.error,
+                )
+                for url, link_status in zip(links_to_check, statuses)
+                if link_status.is_broken
+            ]
 
         if broken_links:
             status = SEOStatus.ERROR
@@ -752,68 +904,112 @@ class TechnicalSEOService:
         )
 
     async def _check_image_sizes(self, page: PageData) -> ImageSizeCheck:
-        """Check image sizes and dimensions."""
-        images = page.soup.find_all("img")
-        oversized = []
+        """Check image file sizes, formats and intrinsic vs declared dimensions."""
+        images = page.index.images
         without_dimensions = []
-        
-        # We will collect tasks for images that actually have a source
-        image_sources = []
+
+        # Unique image URL -> (src as written, declared width, declared height)
+        image_sources: Dict[str, Tuple[str, Optional[int], Optional[int]]] = {}
 
         for img in images:
-            src = img.get("src", "") or img.get("data-src", "")
-            width = img.get("width")
-            height = img.get("height")
-            
-            full_url = urljoin(page.final_url, src)
+            src = img.src or img.data_src
+            width = img.width
+            height = img.height
 
             # Check for missing dimensions
             if not width or not height:
                 without_dimensions.append(src[:200] if src else "unknown")
 
             if src and not src.startswith("data:"):
-                image_sources.append({"src": src, "url": full_url, "width": width, "height": height})
-                
-        # Check actual file sizes concurrently
-        async def check_image_size(img_data: dict, client: httpx.AsyncClient):
-            try:
-                response = await client.head(img_data["url"], timeout=5, follow_redirects=True)
-                content_length = response.headers.get("Content-Length")
-                if content_length:
-                    size_kb = int(content_length) / 1024
-                    if size_kb > self.MAX_IMAGE_SIZE_KB:
-                        return ImageSizeIssue(
-                            src=img_data["src"],
-                            width=int(img_data["width"]) if img_data["width"] and str(img_data["width"]).isdigit() else None,
-                            height=int(img_data["height"]) if img_data["height"] and str(img_data["height"]).isdigit() else None,
+                full_url = urljoin(page.final_url, src)
+                image_sources.setdefault(
+                    full_url,
+                    (
+                        src,
+                        int(width) if width and str(width).isdigit() else None,
+                        int(height) if height and str(height).isdigit() else None,
+                    ),
+                )
+
+        # Measure each unique image once (cached across audits, throttled per CDN host)
+        urls = list(image_sources)
+        probes = await get_image_prober().probe_many(urls, headers=self.default_headers)
+
+        oversized = []
+        mismatched = []
+        legacy_format = []
+        total_bytes = 0
+        for url, probe in zip(urls, probes):
+            if probe.error:
+                continue
+            src, declared_width, declared_height = image_sources[url]
+            issue_fields = dict(
+                src=src,
+                width=declared_width,
+                height=declared_height,
+                intrinsic_width=probe.width,
+                intrinsic_height=probe.height,
+                format=probe.format,
+            )
+            size_kb = None
+            if probe.file_size_bytes is not None:
+                total_bytes += probe.file_size_bytes
+                size_kb = probe.file_size_bytes / 1024
+                if size_kb > self.MAX_IMAGE_SIZE_KB:
+                    oversized.append(
+                        ImageSizeIssue(
+                            **issue_fields,
                             file_size_kb=round(size_kb, 2),
-                            issue=f"Image size ({size_kb:.1f} KB) exceeds recommended maximum of {self.MAX_IMAGE_SIZE_KB} KB"
+                            issue=f"Image size ({size_kb:.1f} KB) exceeds recommended maximum of {self.MAX_IMAGE_SIZE_KB} KB",
                         )
-            except Exception as e:
-                logger.debug(f"Failed to check size for {img_data['url']}: {e}")
-            return None
-            
-        async with httpx.AsyncClient(headers=self.default_headers, verify=False) as client:
-            tasks = [check_image_size(img, client) for img in image_sources]
-            results = await asyncio.gather(*tasks)
-            oversized = [r for r in results if r is not None]
+                    )
+
+            if (
+                probe.width and declared_width
+                and probe.width > declared_width * self.MAX_IMAGE_SCALE_FACTOR
+            ):
+                mismatched.append(
+                    ImageSizeIssue(
+                        **issue_fields,
+                        file_size_kb=round(size_kb, 2) if size_kb is not None else None,
+                        issue=f"Image is {probe.width}x{probe.height}px but displayed at {declared_width}x{declared_height or '?'}px - serve a smaller version",
+                    )
+                )
+
+            if probe.is_raster and not probe.is_modern_format:
+                legacy_format.append(src[:200])
 
+        recommendations = []
         if oversized:
             status = SEOStatus.ERROR
-            recommendations = [f"Found {len(oversized)} oversized images (> {self.MAX_IMAGE_SIZE_KB}KB) - compress them for better performance"]
-        elif without_dimensions and len(images) > 0:
+            recommendations.append(f"Found {len(oversized)} oversized images (> {self.MAX_IMAGE_SIZE_KB}KB) - compress them for better performance")
+        elif without_dimensions or mismatched or legacy_format:
             status = SEOStatus.WARNING
-            recommendations = [
-                f"{len(without_dimensions)} images missing width/height attributes - add them to prevent layout shift"
-            ]
         else:
             status = SEOStatus.PASS
-            recommendations = ["Images have proper dimensions defined and are well-sized"]
+            recommendations.append("Images have proper dimensions defined and are well-sized")
+
+        if without_dimensions:
+            recommendations.append(
+                f"{len(without_dimensions)} images missing width/height attributes - add them to prevent layout shift"
+            )
+        if mismatched:
+            recommendations.append(
+                f"{len(mismatched)} images are much larger than their displayed size - resize them or use srcset"
+            )
+        if legacy_format:
+            recommendations.append(
+                f"{len(legacy_format)} images are not served as WebP/AVIF - convert them to cut image weight"
+            )
 
         return ImageSizeCheck(
             total_images=len(images),
             oversized_images=oversized,
             images_without_dimensions=without_dimensions[:10],
+            images_probed=len(urls),
+            total_image_weight_kb=round(total_bytes / 1024, 2) if urls else None,
+            dimension_mismatches=mismatched[:20],
+            legacy_format_images=legacy_format[:20],
             status=status,
             recommendations=recommendations,
         )
@@ -857,8 +1053,7 @@ class TechnicalSEOService:
         json_ld_scripts = []
         schema_types = []
 
-        for script in page.soup.find_all("script", type="application/ld+json"):
-            content = script.string
+        for content in page.index.json_ld:
             if content:
                 json_ld_scripts.append(content[:500])  # Store first 500 chars
                 # Try to extract @type
@@ -877,10 +1072,10 @@ class TechnicalSEOService:
                     pass
 
         # Check for microdata
-        microdata_items = len(page.soup.find_all(attrs={"itemscope": True}))
+        microdata_items = page.index.microdata_count
 
         # Check for RDFa
-        rdfa_items = len(page.soup.find_all(attrs={"typeof": True}))
+        rdfa_items = page.index.rdfa_count
 
         present = bool(json_ld_scripts or microdata_items or rdfa_items)
 
@@ -920,13 +1115,7 @@ class TechnicalSEOService:
         mixed_content = False
         if is_https:
             # Check for http:// resources
-            http_resources = page.soup.find_all(
-                src=lambda x: x and x.startswith("http://")
-            )
-            http_resources += page.soup.find_all(
-                href=lambda x: x and x.startswith("http://")
-            )
-            mixed_content = len(http_resources) > 0
+            mixed_content = page.index.insecure_resource_count > 0
 
         if not is_https:
             status = SEOStatus.ERROR
@@ -951,15 +1140,11 @@ class TechnicalSEOService:
 
     def _check_mobile_friendly(self, page: PageData) -> MobileFriendlyCheck:
         """Check mobile-friendly indicators."""
-        viewport = page.soup.find("meta", attrs={"name": "viewport"})
+        viewport = page.index.find_meta("name", "viewport")
         has_viewport = bool(viewport)
 
         # Check for media queries in style tags
-        media_queries = False
-        for style in page.soup.find_all("style"):
-            if style.string and "@media" in style.string:
-                media_queries = True
-                break
+        media_queries = page.index.style_has_media_queries
 
         if has_viewport:
             status = SEOStatus.PASS
@@ -979,11 +1164,16 @@ class TechnicalSEOService:
 
     def _check_charset(self, page: PageData) -> MetaCharsetCheck:
         """Check charset meta tag."""
-        charset_meta = page.soup.find("meta", charset=True)
+        charset_meta = next(
+            (meta for meta in page.index.metas if "charset" in meta), None
+        )
         if not charset_meta:
-            charset_meta = page.soup.find(
-                "meta",
-                attrs={"http-equiv": lambda x: x and x.lower() == "content-type"},
+            charset_meta = next(
+                (
+                    meta for meta in page.index.metas
+                    if meta.get("http-equiv", "").lower() == "content-type"
+                ),
+                None,
             )
 
         charset = None
@@ -1005,7 +1195,7 @@ class TechnicalSEOService:
 
     def _check_viewport(self, page: PageData) -> ViewportCheck:
         """Check viewport meta tag specifically."""
-        viewport = page.soup.find("meta", attrs={"name": "viewport"})
+        viewport = page.index.find_meta("name", "viewport")
 
         present = bool(viewport)
         content = viewport.get("content", "") if viewport else None
@@ -1018,12 +1208,11 @@ class TechnicalSEOService:
 
     def _check_language(self, page: PageData) -> LanguageCheck:
         """Check HTML lang attribute and hreflang tags."""
-        html_tag = page.soup.find("html")
-        lang = html_tag.get("lang") if html_tag else None
+        lang = page.index.html_lang
 
         # Find hreflang tags
         hreflangs = []
-        for link in page.soup.find_all("link", attrs={"rel": "alternate"}):
+        for link in page.index.find_links("alternate"):
             if link.get("hreflang"):
                 hreflangs.append(
                     {"hreflang": link.get("hreflang"), "href": link.get("href", "")}
@@ -2,17 +2,78 @@
 Volume & Competition Service
 Integrates with Google Ads API for search volume and competition data.
 Falls back to estimation when API is not configured.
+
+Keyword Planner calls are sharded into API-sized seed batches and run
+concurrently in a dedicated thread pool (the google-ads client is synchronous).
+Metrics are cached per (keyword, country, language) for a month, since Keyword
+Planner volumes only change monthly, so only cache misses are fetched.
 """
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any
 from config import settings
 from exceptions import APIKeyMissingError, APIRequestError
 from schemas.keyword_schemas import KeywordSuggestion, CompetitionLevel
+from services.volume_estimator import get_volume_estimator, neighbor_phrases
+from utils.cache import get_cache_manager
 import logging
 
 logger = logging.getLogger(__name__)
 
+# generate_keyword_ideas accepts at most 20 seed keywords per request
+GOOGLE_ADS_MAX_SEEDS = 20
+
+# Google Ads language constants for common language codes
+GOOGLE_ADS_LANGUAGE_IDS = {
+    "en": 1000,
+    "de": 1001,
+    "fr": 1002,
+    "es": 1003,
+    "it": 1004,
+    "ja": 1005,
+    "da": 1009,
+    "nl": 1010,
+    "fi": 1011,
+    "ko": 1012,
+    "no": 1013,
+    "pt": 1014,
+    "sv": 1015,
+    "zh": 1017,
+    "ar": 1019,
+    "hi": 1023,
+    "pl": 1030,
+    "ru": 1031,
+    "tr": 1037,
+}
+
+_google_ads_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_google_ads_executor() -> ThreadPoolExecutor:
+    """
+    Get or create the thread pool reserved for blocking Google Ads calls, so they
+    neither queue behind nor starve the default executor.
+
+    Returns:
+        ThreadPoolExecutor instance
+    """
+    global _google_ads_executor
+    if _google_ads_executor is None:
+        _google_ads_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.google_ads_max_concurrent_requests),
+            thread_name_prefix="google-ads",
+        )
+    return _google_ads_executor
+
+
+def shutdown_google_ads_executor() -> None:
+    """Stop the Google Ads threads (called on application shutdown)"""
+    global _google_ads_executor
+    if _google_ads_executor is not None:
+        _google_ads_executor.shutdown(wait=False, cancel_futures=True)
+        _google_ads_executor = None
+
 
 class VolumeCompetitionService:
     """
@@ -22,7 +83,9 @@ class VolumeCompetitionService:
     """
     
     def __init__(self):
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.metrics_cache = get_cache_manager().namespace(
+            "keyword_metrics", Dict[str, Any], settings.keyword_metrics_cache_ttl_seconds
+        )
         self.google_ads_client = None
         
         # Initialize Google Ads client if credentials are available
@@ -84,7 +147,7 @@ class VolumeCompetitionService:
                 logger.error(f"Google Ads API error: {e}. Falling back to estimation.")
         
         # Fallback to estimation
-        return await self._enrich_with_estimation(keywords)
+        return await self._enrich_with_estimation(keywords, language, country)
     
     async def _enrich_with_google_ads(
         self,
@@ -94,127 +157,172 @@ class VolumeCompetitionService:
     ) -> List[KeywordSuggestion]:
         """
         Fetch volume and competition from Google Ads Keyword Planner.
-        Runs in thread pool to avoid blocking.
+        Cached metrics are reused; misses are fetched in concurrent seed batches.
         """
-        # Extract keyword texts
-        keyword_texts = [kw.keyword for kw in keywords]
-        
-        # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        metrics_map = await loop.run_in_executor(
-            None,
-            self._fetch_google_ads_metrics,
-            keyword_texts,
-            country
-        )
+        unique = list(dict.fromkeys(kw.keyword.strip().lower() for kw in keywords))
+        cache_keys = {text: self._metrics_key(text, language, country) for text in unique}
+        
+        cached = await self.metrics_cache.get_many(list(cache_keys.values()))
+        metrics_map = {text: cached[key] for text, key in cache_keys.items() if key in cached}
+        misses = [text for text in unique if text not in metrics_map]
+        
+        if misses:
+            shards = [
+                misses[i:i + GOOGLE_ADS_MAX_SEEDS]
+                for i in range(0, len(misses), GOOGLE_ADS_MAX_SEEDS)
+            ]
+            logger.info(
+                f"Google Ads metrics: {len(metrics_map)} cached, fetching {len(misses)} "
+                f"keywords in {len(shards)} batches"
+            )
+            
+            loop = asyncio.get_running_loop()
+            executor = get_google_ads_executor()
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        executor, self._fetch_google_ads_metrics, shard, country, language
+                    )
+                    for shard in shards
+                ),
+                return_exceptions=True
+            )
+            
+            fetched = {}
+            for shard, result in zip(shards, results):
+                if isinstance(result, Exception):
+                    # Not cached, so the next request retries these keywords
+                    logger.error(f"Error fetching Google Ads metrics: {result}")
+                    continue
+                for text in shard:
+                    # Seeds Keyword Planner has no data for are cached as empty too
+                    fetched[text] = result.get(text, {})
+            
+            if not fetched and not metrics_map:
+                raise APIRequestError("All Google Ads metrics requests failed")
+            
+            await self.metrics_cache.set_many(
+                {cache_keys[text]: metrics for text, metrics in fetched.items()}
+            )
+            metrics_map.update(fetched)
         
         # Enrich keyword objects with fetched data
         enriched = []
         for kw in keywords:
-            metrics = metrics_map.get(kw.keyword, {})
+            metrics = metrics_map.get(kw.keyword.strip().lower(), {})
             
             kw.search_volume = metrics.get("search_volume", kw.search_volume)
             kw.competition = self._map_competition_level(metrics.get("competition"))
             kw.competition_score = metrics.get("competition_index", kw.competition_score)
             kw.cpc = metrics.get("cpc", kw.cpc)
+            if metrics:
+                kw.metrics_source = "google_ads"
             
             enriched.append(kw)
         
         return enriched
     
+    def _metrics_key(self, keyword: str, language: str, country: str) -> str:
+        return f"{country.lower()}_{language.lower()}_{keyword}"
+    
     def _fetch_google_ads_metrics(
         self,
         keywords: List[str],
-        country: str
+        country: str,
+        language: str = "en"
     ) -> Dict[str, Dict[str, Any]]:
         """
-        Fetch metrics from Google Ads API (synchronous).
-        This runs in a thread pool executor.
-        """
-        from google.ads.googleads.client import GoogleAdsClient
+        Fetch metrics for up to 20 seed keywords from Google Ads API (synchronous).
+        This runs in the Google Ads thread pool; errors propagate to the caller.
         
+        Returns:
+            Metrics keyed by lowercased keyword text
+        """
         if not self.google_ads_client:
             return {}
         
-        try:
-            keyword_plan_idea_service = self.google_ads_client.get_service(
-                "KeywordPlanIdeaService"
-            )
-            
-            # Create request
-            request = self.google_ads_client.get_type("GenerateKeywordIdeasRequest")
-            request.customer_id = settings.google_ads_customer_id
-            
-            # Set location (country)
-            location_ids = self._get_google_ads_location_id(country)
-            request.geo_target_constants.extend(
-                [f"geoTargetConstants/{loc_id}" for loc_id in location_ids]
-            )
-            
-            # Set language
-            request.language = f"languageConstants/1000"  # English default
-            
-            # Set keyword seed
-            request.keyword_seed.keywords.extend(keywords)
-            
-            # Fetch keyword ideas
-            response = keyword_plan_idea_service.generate_keyword_ideas(request=request)
-            
-            # Parse results
-            metrics_map = {}
-            for idea in response:
-                keyword_text = idea.text
-                metrics = idea.keyword_idea_metrics
-                
-                metrics_map[keyword_text] = {
-                    "search_volume": metrics.avg_monthly_searches,
-                    "competition": metrics.competition.name,
-                    "competition_index": metrics.competition_index / 100.0 if metrics.competition_index else None,
-                    "cpc": metrics.average_cpc_micros / 1_000_000.0 if metrics.average_cpc_micros else None,
-                }
-            
-            return metrics_map
+        keyword_plan_idea_service = self.google_ads_client.get_service(
+            "KeywordPlanIdeaService"
+        )
+        
+        # Create request
+        request = self.google_ads_client.get_type("GenerateKeywordIdeasRequest")
+        request.customer_id = settings.google_ads_customer_id
+        
+        # Set location (country)
+        location_ids = self._get_google_ads_location_id(country)
+        request.geo_target_constants.extend(
+            [f"geoTargetConstants/{loc_id}" for loc_id in location_ids]
+        )
+        
+        # Set language
+        request.language = f"languageConstants/{self._get_google_ads_language_id(language)}"
+        
+        # Set keyword seed
+        request.keyword_seed.keywords.extend(keywords)
+        
+        # Fetch keyword ideas
+        response = keyword_plan_idea_service.generate_keyword_ideas(request=request)
+        
+        # Parse results
+        metrics_map = {}
+        for idea in response:
+            keyword_text = idea.text.lower()
+            metrics = idea.keyword_idea_metrics
             
-        except Exception as e:
-            logger.error(f"Error fetching Google Ads metrics: {e}")
-            return {}
+            metrics_map[keyword_text] = {
+                "search_volume": metrics.avg_monthly_searches,
+                "competition": metrics.competition.name,
+                "competition_index": metrics.competition_index / 100.0 if metrics.competition_index else None,
+                "cpc": metrics.average_cpc_micros / 1_000_000.0 if metrics.average_cpc_micros else None,
+            }
+        
+        return metrics_map
     
     async def _enrich_with_estimation(
         self,
-        keywords: List[KeywordSuggestion]
+        keywords: List[KeywordSuggestion],
+        language: str = "en",
+        country: str = "us"
     ) -> List[KeywordSuggestion]:
         """
         Estimate volume and competition when API is unavailable.
-        Uses heuristics based on keyword characteristics.
+        Uses the deterministic volume model, anchored on cached Keyword Planner
+        volumes of the keyword itself or its close neighbors where available.
         """
-        for kw in keywords:
-            # Skip if already has volume data
-            if kw.search_volume and kw.search_volume > 0:
-                continue
-            
-            # Estimate based on keyword length and type
-            word_count = len(kw.keyword.split())
-            
-            # Shorter keywords typically have higher volume
-            if word_count <= 2:
-                estimated_volume = 5000 + (hash(kw.keyword) % 45000)
-                competition = CompetitionLevel.HIGH
-                competition_score = 0.7 + (hash(kw.keyword) % 30) / 100
-            elif word_count == 3:
-                estimated_volume = 1000 + (hash(kw.keyword) % 9000)
-                competition = CompetitionLevel.MEDIUM
-                competition_score = 0.4 + (hash(kw.keyword) % 30) / 100
-            else:
-                estimated_volume = 100 + (hash(kw.keyword) % 900)
-                competition = CompetitionLevel.LOW
-                competition_score = 0.1 + (hash(kw.keyword) % 30) / 100
-            
-            kw.search_volume = estimated_volume
-            kw.competition = competition
-            kw.competition_score = min(1.0, competition_score)
-            
-            # Estimate CPC (lower for longer tail)
-            kw.cpc = max(0.1, 5.0 - (word_count * 0.8))
+        # Skip keywords that already have volume data
+        pending = [kw for kw in keywords if not (kw.search_volume and kw.search_volume > 0)]
+        if not pending:
+            return keywords
+        
+        texts = [kw.keyword.strip().lower() for kw in pending]
+        lookups = list(dict.fromkeys(
+            phrase for text in texts for phrase in [text, *neighbor_phrases(text)]
+        ))
+        cached = await self.metrics_cache.get_many(
+            [self._metrics_key(phrase, language, country) for phrase in lookups]
+        )
+        real_metrics = {}
+        for phrase in lookups:
+            metrics = cached.get(self._metrics_key(phrase, language, country)) or {}
+            if metrics.get("search_volume"):
+                real_metrics[phrase] = metrics
+        
+        estimates = get_volume_estimator().estimate(
+            texts, {phrase: metrics["search_volume"] for phrase, metrics in real_metrics.items()}
+        )
+        levels = estimates.competition_levels()
+        
+        for i, kw in enumerate(pending):
+            # Real Keyword Planner data cached for the keyword itself wins
+            real = real_metrics.get(texts[i], {})
+            kw.search_volume = int(real.get("search_volume") or estimates.search_volume[i])
+            kw.competition = (
+                self._map_competition_level(real["competition"]) if real.get("competition") else levels[i]
+            )
+            kw.competition_score = real.get("competition_index") or float(estimates.competition_score[i])
+            kw.cpc = real.get("cpc") or float(estimates.cpc[i])
+            kw.metrics_source = "google_ads" if real else "estimate"
         
         return keywords
     
@@ -241,6 +349,10 @@ class VolumeCompetitionService:
             "in": [2356],  # India
         }
         return location_map.get(country.lower(), [2840])  # Default to US
+    
+    def _get_google_ads_language_id(self, language: str) -> int:
+        """Map language code to Google Ads language constant ID"""
+        return GOOGLE_ADS_LANGUAGE_IDS.get(language.lower().split("-")[0], 1000)  # Default to English
 
 
 def get_volume_competition_service() -> VolumeCompetitionService:
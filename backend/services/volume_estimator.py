@@ -0,0 +1,308 @@
+"""
+Volume Estimation Model
+Deterministic search volume / competition / CPC estimates for keywords without
+Keyword Planner data.
+
+Estimates are a linear model over batch features computed with numpy:
+- word count (1..6+, one-hot)
+- modifier class (informational / commercial / transactional / navigational)
+- character length
+plus a per-keyword jitter seeded from a stable xxhash of the keyword, so every
+worker and every restart gives the same keyword the same numbers. When a close
+neighbor (the keyword minus its first or last word) has a real cached volume,
+the estimate is pulled towards that volume, scaled down for the extra words.
+
+The coefficients start from hand-set defaults and can be calibrated offline
+against cached Google Ads metrics (see calibrate_volume_model.py); calibrated
+coefficients are loaded from data/volume_model.json.
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import xxhash
+
+from config import settings
+from schemas.keyword_schemas import CompetitionLevel, SearchIntent
+from services.intent_classifier import INTENT_LEXICON
+
+logger = logging.getLogger(__name__)
+
+MAX_WORDS = 6
+MODIFIER_CLASSES = ["none"] + [intent.value for intent in INTENT_LEXICON]
+FEATURE_NAMES = (
+    ["intercept"]
+    + [f"words_{count}" for count in range(1, MAX_WORDS + 1)]
+    + [f"modifier_{name}" for name in MODIFIER_CLASSES]
+    + ["chars"]
+)
+
+_MODIFIER_PATTERNS = [
+    (MODIFIER_CLASSES.index(intent.value), re.compile("|".join(patterns)))
+    for intent, patterns in INTENT_LEXICON.items()
+]
+
+DEFAULT_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "volume_model.json"
+)
+
+
+def _coefficients(words: Sequence[float], modifiers: Dict[str, float], chars: float = 0.0) -> List[float]:
+    return [0.0, *words, *(modifiers.get(name, 0.0) for name in MODIFIER_CLASSES), chars]
+
+
+@dataclass
+class VolumeModel:
+    """Coefficients over FEATURE_NAMES for log10(volume), competition and log10(cpc)"""
+
+    volume: List[float] = field(default_factory=lambda: _coefficients(
+        [4.3, 4.3, 3.5, 2.5, 2.4, 2.3],
+        {SearchIntent.TRANSACTIONAL.value: -0.2, SearchIntent.NAVIGATIONAL.value: 0.2},
+    ))
+    competition: List[float] = field(default_factory=lambda: _coefficients(
+        [0.85, 0.85, 0.55, 0.25, 0.22, 0.2],
+        {
+            SearchIntent.TRANSACTIONAL.value: 0.15,
+            SearchIntent.COMMERCIAL.value: 0.1,
+            SearchIntent.INFORMATIONAL.value: -0.1,
+            SearchIntent.NAVIGATIONAL.value: -0.05,
+        },
+    ))
+    cpc: List[float] = field(default_factory=lambda: _coefficients(
+        [0.62, 0.53, 0.41, 0.26, 0.0, -0.3],
+        {
+            SearchIntent.TRANSACTIONAL.value: 0.2,
+            SearchIntent.COMMERCIAL.value: 0.15,
+            SearchIntent.INFORMATIONAL.value: -0.2,
+        },
+    ))
+    # Half-widths of the hash-seeded jitter (log10 volume, competition score)
+    volume_noise: float = 0.5
+    competition_noise: float = 0.15
+    # A keyword with one more word than its neighbor gets ~10^-1 of its volume
+    neighbor_tail_log10: float = -1.0
+    neighbor_weight: float = 0.7
+    calibrated_on: int = 0
+
+    @classmethod
+    def load(cls, path: str) -> "VolumeModel":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("features") != FEATURE_NAMES:
+            raise ValueError("Volume model features do not match this version")
+        data.pop("features")
+        return cls(**data)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"features": FEATURE_NAMES, **asdict(self)}, f, indent=2)
+
+
+@dataclass
+class VolumeEstimates:
+    """Estimates for a batch of keywords, in input order"""
+
+    search_volume: np.ndarray
+    competition_score: np.ndarray
+    cpc: np.ndarray
+
+    def competition_levels(self) -> List[CompetitionLevel]:
+        levels = np.select(
+            [self.competition_score >= 0.67, self.competition_score >= 0.34], [2, 1], 0
+        )
+        mapping = [CompetitionLevel.LOW, CompetitionLevel.MEDIUM, CompetitionLevel.HIGH]
+        return [mapping[level] for level in levels]
+
+
+def neighbor_phrases(keyword: str) -> List[str]:
+    """Close neighbors of a keyword: itself minus its last word, then minus its first"""
+    words = keyword.split()
+    if len(words) < 2:
+        return []
+    return [" ".join(words[:-1]), " ".join(words[1:])]
+
+
+def _stable_unit(keywords: Sequence[str], seed: int) -> np.ndarray:
+    """Per-keyword value in [-1, 1) from a stable (unsalted) hash"""
+    hashes = np.fromiter(
+        (xxhash.xxh64_intdigest(keyword.encode("utf-8"), seed=seed) for keyword in keywords),
+        dtype=np.uint64, count=len(keywords),
+    )
+    return (hashes >> np.uint64(11)).astype(np.float64) / float(1 << 53) * 2.0 - 1.0
+
+
+class VolumeEstimator:
+    """
+    Batch volume estimator.
+
+    Usage:
+        estimates = get_volume_estimator().estimate(["seo tools", "best seo tools 2025"])
+    """
+
+    def __init__(self, model: Optional[VolumeModel] = None):
+        self.model = model or VolumeModel()
+
+    def features(self, keywords: Sequence[str]) -> np.ndarray:
+        """Design matrix (len(keywords) x len(FEATURE_NAMES))"""
+        n = len(keywords)
+        word_counts = np.fromiter((len(k.split()) for k in keywords), dtype=np.int64, count=n)
+        chars = np.fromiter((len(k) for k in keywords), dtype=np.float64, count=n)
+        modifiers = np.fromiter(
+            (next((index for index, pattern in _MODIFIER_PATTERNS if pattern.search(k)), 0) for k in keywords),
+            dtype=np.int64, count=n,
+        )
+
+        matrix = np.zeros((n, len(FEATURE_NAMES)))
+        rows = np.arange(n)
+        matrix[:, 0] = 1.0
+        matrix[rows, np.clip(word_counts, 1, MAX_WORDS)] = 1.0
+        matrix[rows, 1 + MAX_WORDS + modifiers] = 1.0
+        matrix[:, -1] = chars
+        return matrix
+
+    def estimate(
+        self,
+        keywords: Sequence[str],
+        neighbor_volumes: Optional[Dict[str, int]] = None,
+    ) -> VolumeEstimates:
+        """
+        Estimate metrics for a batch of (normalized, lowercase) keywords.
+
+        Args:
+            keywords: Keyword texts
+            neighbor_volumes: Real volumes of known keywords (e.g. cached Keyword
+                Planner data); used for neighbors found by neighbor_phrases()
+
+        Returns:
+            VolumeEstimates with one entry per keyword
+        """
+        model = self.model
+        if not keywords:
+            empty = np.zeros(0)
+            return VolumeEstimates(empty.astype(np.int64), empty, empty)
+
+        matrix = self.features(keywords)
+        volume_jitter = _stable_unit(keywords, seed=0)
+        competition_jitter = _stable_unit(keywords, seed=1)
+
+        log_volume = matrix @ np.asarray(model.volume) + model.volume_noise * volume_jitter
+
+        if neighbor_volumes:
+            neighbor_log = np.full(len(keywords), np.nan)
+            for i, keyword in enumerate(keywords):
+                for neighbor in neighbor_phrases(keyword):
+                    volume = neighbor_volumes.get(neighbor)
+                    if volume:
+                        neighbor_log[i] = np.log10(volume) + model.neighbor_tail_log10
+                        break
+            known = ~np.isnan(neighbor_log)
+            log_volume[known] = (
+                model.neighbor_weight * neighbor_log[known]
+                + (1 - model.neighbor_weight) * log_volume[known]
+            )
+
+        competition = np.clip(
+            matrix @ np.asarray(model.competition) + model.competition_noise * competition_jitter,
+            0.01, 1.0,
+        )
+        cpc = np.maximum(0.1, 10 ** (matrix @ np.asarray(model.cpc) + 0.1 * volume_jitter))
+
+        return VolumeEstimates(
+            search_volume=np.maximum(10, np.round(10 ** log_volume)).astype(np.int64),
+            competition_score=np.round(competition, 3),
+            cpc=np.round(cpc, 2),
+        )
+
+    def calibrate(
+        self,
+        keywords: Sequence[str],
+        search_volumes: Sequence[float],
+        competition_scores: Sequence[Optional[float]],
+        cpcs: Sequence[Optional[float]],
+        ridge: float = 1.0,
+    ) -> VolumeModel:
+        """
+        Fit the coefficients to real Keyword Planner metrics.
+
+        A ridge fit on the residuals from the current model, so features with
+        little or no data keep their current coefficients. The jitter widths are
+        set from the residual spread. Returns (and installs) the new model.
+        """
+        matrix = self.features(keywords)
+        penalty = ridge * np.eye(matrix.shape[1])
+        penalty[0, 0] = 0.0  # the intercept is not shrunk
+        current = self.model
+
+        def fit(target: np.ndarray, mask: np.ndarray, prior: List[float]) -> np.ndarray:
+            prior = np.asarray(prior)
+            if not mask.any():
+                return prior
+            x = matrix[mask]
+            residual = target[mask] - x @ prior
+            return prior + np.linalg.solve(x.T @ x + penalty, x.T @ residual)
+
+        volumes = np.asarray(search_volumes, dtype=np.float64)
+        log_volume = np.log10(np.maximum(volumes, 10))
+        has_volume = volumes > 0
+        volume = fit(log_volume, has_volume, current.volume)
+
+        competition_target = np.array([np.nan if c is None else c for c in competition_scores], dtype=np.float64)
+        has_competition = ~np.isnan(competition_target)
+        competition = fit(competition_target, has_competition, current.competition)
+
+        cpc_target = np.array([np.nan if c is None or c <= 0 else np.log10(c) for c in cpcs], dtype=np.float64)
+        has_cpc = ~np.isnan(cpc_target)
+        cpc = fit(cpc_target, has_cpc, current.cpc)
+
+        volume_noise = current.volume_noise
+        if has_volume.sum() > 1:
+            # Uniform jitter of half-width w has std w / sqrt(3)
+            spread = np.std(log_volume[has_volume] - matrix[has_volume] @ volume)
+            volume_noise = float(min(1.0, spread * np.sqrt(3)))
+        competition_noise = current.competition_noise
+        if has_competition.sum() > 1:
+            spread = np.std(competition_target[has_competition] - matrix[has_competition] @ competition)
+            competition_noise = float(min(0.3, spread * np.sqrt(3)))
+
+        self.model = VolumeModel(
+            volume=volume.round(4).tolist(),
+            competition=competition.round(4).tolist(),
+            cpc=cpc.round(4).tolist(),
+            volume_noise=round(volume_noise, 4),
+            competition_noise=round(competition_noise, 4),
+            neighbor_tail_log10=current.neighbor_tail_log10,
+            neighbor_weight=current.neighbor_weight,
+            calibrated_on=int(has_volume.sum()),
+        )
+        return self.model
+
+
+# Global estimator instance
+_volume_estimator: Optional[VolumeEstimator] = None
+
+
+def get_volume_estimator() -> VolumeEstimator:
+    """
+    Get or create the process-wide volume estimator, loading calibrated
+    coefficients when a model file exists.
+
+    Returns:
+        VolumeEstimator instance
+    """
+    global _volume_estimator
+    if _volume_estimator is None:
+        path = settings.volume_model_path or DEFAULT_MODEL_PATH
+        model = None
+        if os.path.exists(path):
+            try:
+                model = VolumeModel.load(path)
+                logger.info(f"Loaded volume model calibrated on {model.calibrated_on} keywords")
+            except Exception as e:
+                logger.warning(f"Could not load volume model from {path}: {e}. Using defaults.")
+        _volume_estimator = VolumeEstimator(model)
+    return _volume_estimator
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Run from anywhere: the backend modules import each other as top-level packages
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings require a Gemini key even though these tests never call the LLM
+os.environ.setdefault("GEMINI_API_KEY", "test")
@@ -0,0 +1,112 @@
+"""Browser pool slot handling against fake browsers (no Chromium needed)"""
+
+import asyncio
+
+import pytest
+
+from utils.browser_pool import BrowserPool, _Slot
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        return object()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, connected=True):
+        self.connected = connected
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+
+def make_pool(browser, pages=2):
+    pool = BrowserPool(browsers=1, pages_per_browser=pages, blocked_resource_types=[])
+    launched = []
+
+    async def launch():
+        await asyncio.sleep(0.01)
+        launched.append(FakeBrowser())
+        return launched[-1]
+
+    pool._launch = launch
+    pool._browsers = [browser]
+    pool._relaunch_locks = [asyncio.Lock()]
+    pool._slots = asyncio.Queue()
+    for _ in range(pages):
+        pool._slots.put_nowait(_Slot(0))
+    return pool, launched
+
+
+def test_dead_browser_is_relaunched_once():
+    async def run():
+        pool, launched = make_pool(FakeBrowser(connected=False))
+
+        async def borrow():
+            async with pool.page():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(borrow(), borrow())
+        return pool, launched
+
+    pool, launched = asyncio.run(run())
+    assert len(launched) == 1
+    assert pool._stats["browser_restarts"] == 1
+
+
+def test_every_borrow_gets_a_fresh_context():
+    browser = FakeBrowser()
+
+    async def run():
+        pool, _ = make_pool(browser, pages=1)
+        for _ in range(2):
+            async with pool.page():
+                pass
+
+    asyncio.run(run())
+    assert len(browser.contexts) == 2
+    assert all(context.closed for context in browser.contexts)
+
+
+def test_close_waits_for_borrowed_pages():
+    browser = FakeBrowser()
+
+    async def run():
+        pool, _ = make_pool(browser)
+        events = []
+
+        async def borrow():
+            async with pool.page():
+                await asyncio.sleep(0.02)
+                events.append("returned")
+
+        task = asyncio.ensure_future(borrow())
+        await asyncio.sleep(0)
+        await pool.aclose()
+        events.append("closed")
+        await task
+        with pytest.raises(RuntimeError):
+            async with pool.page():
+                pass
+        return events
+
+    assert asyncio.run(run()) == ["returned", "closed"]
+    assert not browser.connected
@@ -0,0 +1,62 @@
+"""Shared cache layer against the in-memory backend"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from utils.cache import KEY_PREFIX, CacheBackend, CacheManager, InMemoryCache, RedisCache
+
+
+def test_backend_must_implement_abstract_methods():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_explicit_zero_ttl_is_not_replaced_by_default():
+    manager = CacheManager(InMemoryCache(), default_ttl=3600)
+    assert manager.namespace("uncached", int, ttl=0).ttl == 0
+    assert manager.namespace("default", int).ttl == 3600
+
+    async def run():
+        cache = manager.namespace("values", int)
+        await cache.set("kept", 1)
+        await cache.set("skipped", 2, ttl=0)
+        return await cache.get("kept"), await cache.get("skipped")
+
+    assert asyncio.run(run()) == (1, None)
+
+
+def test_namespace_rejects_conflicting_registration():
+    manager = CacheManager(InMemoryCache(), default_ttl=3600)
+    assert manager.namespace("values", int) is manager.namespace("values", int, ttl=3600)
+    with pytest.raises(ValueError):
+        manager.namespace("values", int, ttl=60)
+    with pytest.raises(ValueError):
+        manager.namespace("values", str)
+
+
+def test_redis_backend_round_trip():
+    fakeredis = pytest.importorskip("fakeredis")
+    manager = CacheManager(RedisCache(fakeredis.FakeAsyncRedis()), default_ttl=3600)
+
+    async def run():
+        cache = manager.namespace("values", List[int])
+        await cache.set("one", [1])
+        await cache.set_many({"two": [2], "three": [3]})
+        single = await cache.get("one")
+        many = await cache.get_many(["one", "two", "three", "missing"])
+        ttl = await manager.backend.client.ttl(f"{KEY_PREFIX}:values:two")
+        await cache.delete("one")
+        deleted = await cache.get("one")
+        await manager.backend.clear()
+        cleared = await cache.get_many(["two", "three"])
+        await manager.aclose()
+        return single, many, deleted, cleared, ttl
+
+    single, many, deleted, cleared, ttl = asyncio.run(run())
+    assert single == [1]
+    assert many == {"one": [1], "two": [2], "three": [3]}
+    assert deleted is None
+    assert cleared == {}
+    assert 0 < ttl <= 3600
@@ -0,0 +1,137 @@
+"""LLM gateway against a local fake chat model (no provider calls)"""
+
+import asyncio
+from typing import Any, List
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_none
+
+from utils.cache import CacheManager, InMemoryCache, set_cache_manager
+from utils.llm_gateway import LLMGateway, is_retryable_llm_error
+
+
+class ProviderError(Exception):
+    status_code = 503
+
+
+class FakeModel(GenericFakeChatModel):
+    """GenericFakeChatModel that can fail first, answer slowly and stall mid-stream"""
+
+    failures: int = 0
+    delay: float = 0.0
+    stall_after_first_chunk: bool = False
+    active: int = 0
+    peak: int = 0
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise ProviderError("503 UNAVAILABLE")
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return self._generate(messages, stop=stop, **kwargs)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise ProviderError("503 UNAVAILABLE")
+        message = next(self.messages)
+        yield ChatGenerationChunk(message=AIMessageChunk(content=message.content[:5]))
+        if self.stall_after_first_chunk:
+            await asyncio.sleep(10)
+        yield ChatGenerationChunk(message=AIMessageChunk(content=message.content[5:]))
+
+
+def fake(*answers: str, **kwargs: Any) -> FakeModel:
+    return FakeModel(messages=iter([AIMessage(content=a) for a in answers]), **kwargs)
+
+
+@pytest.fixture
+def gateway():
+    set_cache_manager(CacheManager(InMemoryCache(), default_ttl=60))
+
+    def make(**kwargs: Any) -> LLMGateway:
+        gw = LLMGateway(**{"max_in_flight": 4, **kwargs})
+        # No backoff sleeps in tests
+        gw._retrying = lambda: AsyncRetrying(
+            retry=retry_if_exception(is_retryable_llm_error),
+            wait=wait_none(),
+            stop=stop_after_attempt(gw.max_attempts),
+            reraise=True,
+        )
+        return gw
+
+    yield make
+    set_cache_manager(None)
+
+
+def test_retryable_errors_are_retried(gateway):
+    gw = gateway(requests_per_minute=100)
+    model = fake("recovered", failures=2)
+
+    response = asyncio.run(gw.ainvoke(model, "hi", prompt_name="t", use_cache=False))
+
+    assert response.content == "recovered"
+    stats = gw.metrics()["prompts"]["t"]
+    assert stats["retries"] == 2 and stats["errors"] == 0
+    # Every attempt is charged to the rate budget
+    assert gw.metrics()["requests_last_minute"] == 3
+
+
+def test_in_flight_limit_is_enforced(gateway):
+    gw = gateway(max_in_flight=2)
+    model = fake(*["ok"] * 6, delay=0.02)
+
+    async def run():
+        return await asyncio.gather(
+            *(gw.ainvoke(model, f"prompt {i}", use_cache=False) for i in range(6))
+        )
+
+    assert [r.content for r in asyncio.run(run())] == ["ok"] * 6
+    assert model.peak == 2
+
+
+def test_identical_prompts_are_served_from_cache(gateway):
+    gw = gateway()
+    model = fake("first", "second")
+
+    async def run():
+        return [(await gw.ainvoke(model, "same prompt")).content for _ in range(2)]
+
+    assert asyncio.run(run()) == ["first", "first"]
+    assert gw.metrics()["prompts"]["default"]["cache_hits"] == 1
+
+
+def test_stream_retries_each_attempt_in_its_own_slot(gateway):
+    gw = gateway(max_in_flight=1, requests_per_minute=100)
+    model = fake("hello world", failures=1)
+
+    async def run():
+        return [text async for text in gw.astream(model, "hi", use_cache=False)]
+
+    assert "".join(asyncio.run(run())) == "hello world"
+    metrics = gw.metrics()
+    assert metrics["requests_last_minute"] == 2
+    assert metrics["in_flight"] == 0
+
+
+def test_stalled_stream_times_out(gateway):
+    gw = gateway(timeout_seconds=0.05)
+    model = fake("hello world", stall_after_first_chunk=True)
+
+    async def run():
+        chunks: List[str] = []
+        with pytest.raises(asyncio.TimeoutError):
+            async for text in gw.astream(model, "hi", use_cache=False):
+                chunks.append(text)
+        return chunks
+
+    assert asyncio.run(run()) == ["hello"]
+    assert gw.metrics()["in_flight"] == 0
@@ -0,0 +1,114 @@
+"""SERP provider routing against stub providers (no network)"""
+
+import asyncio
+
+import pytest
+
+from exceptions import APIRateLimitError, APIRequestError, ServiceUnavailableError
+from services.serp_router import SERPProviderRouter
+
+
+def stub(name, calls, fail=None, delay=0.0):
+    """Zero-argument call factory that records its name and returns or raises"""
+    async def call():
+        calls.append(name)
+        await asyncio.sleep(delay)
+        if fail is not None:
+            raise fail
+        return name
+    return lambda: call()
+
+
+def test_always_failing_provider_is_routed_last():
+    router = SERPProviderRouter(strategy="health", hedge=False)
+    calls = []
+
+    async def run():
+        for _ in range(50):
+            result = await router.fetch({
+                "broken": stub("broken", calls, fail=APIRequestError("HTTP 500")),
+                "healthy": stub("healthy", calls),
+            })
+            assert result == "healthy"
+
+    asyncio.run(run())
+    # Only the very first lookup tries the broken provider before failing over
+    assert calls.count("broken") == 1
+    assert router.route(["broken", "healthy"]) == ["healthy", "broken"]
+
+
+def test_error_rate_ranks_before_latency():
+    router = SERPProviderRouter(strategy="health", hedge=False)
+    calls = []
+
+    async def run():
+        await router.fetch({"fast": stub("fast", calls)})
+        await router.fetch({"slow": stub("slow", calls, delay=0.02)})
+        with pytest.raises(APIRequestError):
+            await router.fetch({"fast": stub("fast", calls, fail=APIRequestError("HTTP 500"))})
+
+    asyncio.run(run())
+    assert router.route(["fast", "slow"]) == ["slow", "fast"]
+
+
+def test_rate_limited_provider_is_benched():
+    router = SERPProviderRouter(strategy="priority", hedge=False, cooldown_seconds=60)
+    calls = []
+
+    async def run():
+        result = await router.fetch({
+            "primary": stub("primary", calls, fail=APIRateLimitError("429")),
+            "backup": stub("backup", calls),
+        })
+        assert result == "backup"
+
+    asyncio.run(run())
+    assert router.route(["primary", "backup"]) == ["backup", "primary"]
+
+
+def test_all_providers_failing_raises_service_unavailable():
+    router = SERPProviderRouter(hedge=False)
+    calls = []
+
+    async def run():
+        await router.fetch({
+            "a": stub("a", calls, fail=APIRequestError("HTTP 500")),
+            "b": stub("b", calls, fail=APIRequestError("HTTP 502")),
+        })
+
+    with pytest.raises(ServiceUnavailableError):
+        asyncio.run(run())
+    assert calls == ["a", "b"]
+
+
+def test_every_attempt_is_reported():
+    router = SERPProviderRouter(strategy="priority", hedge=False)
+    calls, attempts = [], []
+
+    async def run():
+        return await router.fetch(
+            {
+                "a": stub("a", calls, fail=APIRequestError("HTTP 500")),
+                "b": stub("b", calls),
+            },
+            on_attempt=attempts.append,
+        )
+
+    assert asyncio.run(run()) == "b"
+    assert attempts == ["a", "b"]
+
+
+def test_hedged_request_is_reported():
+    router = SERPProviderRouter(strategy="priority", hedge=True, hedge_min_samples=1)
+    calls, attempts = [], []
+
+    async def run():
+        await router.fetch({"slow": stub("slow", calls, delay=0.01)})
+        return await router.fetch(
+            {"slow": stub("slow", calls, delay=0.5), "fast": stub("fast", calls)},
+            on_attempt=attempts.append,
+        )
+
+    assert asyncio.run(run()) == "fast"
+    # The losing primary was still sent, so it still counts
+    assert attempts == ["slow", "fast"]
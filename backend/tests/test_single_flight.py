@@ -0,0 +1,63 @@
+"""Request coalescing: one call per key, isolated results per caller"""
+
+import asyncio
+
+from utils.http_client import PooledSessionMixin
+from utils.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call_but_not_the_result():
+    group = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"keywords": ["a", "b"]}
+
+    async def run():
+        return await asyncio.gather(*(group.do("test", "key", fetch) for _ in range(3)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result == {"keywords": ["a", "b"]} for result in results)
+
+    results[1]["keywords"].append("c")
+    assert results[0]["keywords"] == ["a", "b"]
+    assert results[2]["keywords"] == ["a", "b"]
+
+
+class _Registry:
+    def aiohttp_session(self):
+        return "pooled-session"
+
+
+class _Service(PooledSessionMixin):
+    def __init__(self, group):
+        self.http_clients = _Registry()
+        self.group = group
+
+    async def lookup(self):
+        async with self:
+            return await self.group.do("test", "key", self._fetch)
+
+    async def _fetch(self):
+        await asyncio.sleep(0.02)
+        return {"session": self.session}
+
+
+def test_cancelled_leader_does_not_break_followers():
+    group = SingleFlight()
+
+    async def run():
+        leader = asyncio.ensure_future(_Service(group).lookup())
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(_Service(group).lookup())
+        await asyncio.sleep(0.005)
+        leader.cancel()
+        result = await follower
+        assert leader.cancelled()
+        return result
+
+    # The shared call ran on the leader's service after that request had exited
+    assert asyncio.run(run()) == {"session": "pooled-session"}
@@ -0,0 +1,231 @@
+"""
+Headless Browser Pool
+Long-lived Chromium instances shared by screenshot capture and rendered page
+fetches. Launching a browser costs ~1 s and ~150 MB, so browsers are started once
+(in the app lifespan) and requests borrow a "slot" on one of them from a queue
+that also caps how many pages render at the same time. Each borrow gets a fresh
+browser context (a few ms), so no cookies or storage carry over between borrowers.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+]
+DEFAULT_VIEWPORT = {"width": 1280, "height": 800}
+# How long aclose() waits for borrowed pages to be returned
+CLOSE_DRAIN_TIMEOUT_SECONDS = 10.0
+
+
+class _Slot:
+    """Permission to render one page on a given browser"""
+
+    def __init__(self, browser_index: int):
+        self.browser_index = browser_index
+
+
+class BrowserPool:
+    """
+    Pool of long-lived headless Chromium browsers lending out fresh pages.
+
+    Usage:
+        async with get_browser_pool().page() as page:
+            await page.goto(url)
+    """
+
+    def __init__(
+        self,
+        browsers: int,
+        pages_per_browser: int,
+        blocked_resource_types: List[str],
+    ):
+        self.browser_count = max(1, browsers)
+        self.pages_per_browser = max(1, pages_per_browser)
+        self.blocked_resource_types = set(blocked_resource_types)
+
+        self._playwright = None
+        self._browsers: List[Any] = []
+        # One per browser, so concurrent slots on a dead browser relaunch it once
+        self._relaunch_locks: List[asyncio.Lock] = []
+        self._slots: Optional[asyncio.Queue] = None
+        self._closing = False
+        self._start_lock = asyncio.Lock()
+        self._stats = {"pages_served": 0, "browser_restarts": 0}
+
+    @property
+    def started(self) -> bool:
+        return self._slots is not None
+
+    async def start(self) -> None:
+        """Launch the browsers and fill the slot queue (idempotent)"""
+        async with self._start_lock:
+            if self.started:
+                return
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+            try:
+                self._browsers = [
+                    await self._launch() for _ in range(self.browser_count)
+                ]
+            except Exception:
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+            self._relaunch_locks = [asyncio.Lock() for _ in range(self.browser_count)]
+
+            slots: asyncio.Queue = asyncio.Queue()
+            for index in range(self.browser_count):
+                for _ in range(self.pages_per_browser):
+                    slots.put_nowait(_Slot(index))
+            self._slots = slots
+            self._closing = False
+            logger.info(
+                f"Browser pool started: {self.browser_count} browsers x "
+                f"{self.pages_per_browser} pages"
+            )
+
+    async def _launch(self):
+        return await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """
+        Borrow a page in a fresh context. Waits for a free slot when all pages are busy.
+
+        Yields:
+            playwright Page (viewport 1280x800, fonts/media blocked by default)
+
+        Raises:
+            RuntimeError: If the pool is shutting down
+        """
+        if self._closing:
+            raise RuntimeError("Browser pool is closed")
+        if not self.started:
+            await self.start()
+
+        # Hold on to this queue: aclose() may drop the pool's reference meanwhile
+        slots = self._slots
+        slot: _Slot = await slots.get()
+        context = None
+        try:
+            context = await self._new_context(slot)
+            page = await context.new_page()
+            yield page
+        finally:
+            if context is not None:
+                self._stats["pages_served"] += 1
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.debug(f"Failed to close browser context: {e}")
+            slots.put_nowait(slot)
+
+    async def _new_context(self, slot: _Slot):
+        """Open a context on the slot's browser, relaunching the browser if it died"""
+        index = slot.browser_index
+        browser = self._browsers[index]
+        if not browser.is_connected():
+            async with self._relaunch_locks[index]:
+                # Another slot on the same browser may have relaunched it already
+                browser = self._browsers[index]
+                if not browser.is_connected():
+                    logger.warning("Pooled browser disconnected, relaunching")
+                    self._stats["browser_restarts"] += 1
+                    try:
+                        # Reap the old process if it is still around
+                        await browser.close()
+                    except Exception:
+                        pass
+                    browser = await self._launch()
+                    self._browsers[index] = browser
+
+        context = await browser.new_context(viewport=DEFAULT_VIEWPORT)
+        if self.blocked_resource_types:
+            await context.route("**/*", self._block_resources)
+        return context
+
+    async def _block_resources(self, route) -> None:
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "browsers": len(self._browsers),
+            "pages": self.browser_count * self.pages_per_browser,
+            "idle_pages": self._slots.qsize() if self._slots else 0,
+            **self._stats,
+        }
+
+    async def aclose(self) -> None:
+        """Stop lending pages, wait for borrowed ones to come back, then close every browser"""
+        self._closing = True
+        slots = self._slots
+        if slots is not None:
+            try:
+                # Taking every slot means no page is still in use
+                async with asyncio.timeout(CLOSE_DRAIN_TIMEOUT_SECONDS):
+                    for _ in range(self.browser_count * self.pages_per_browser):
+                        await slots.get()
+            except TimeoutError:
+                logger.warning("Closing browser pool with pages still in use")
+
+        for browser in self._browsers:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.debug(f"Failed to close browser: {e}")
+        self._browsers = []
+        self._slots = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+async def wait_until_settled(page, timeout_ms: int = 5000) -> None:
+    """
+    Wait for the page to settle instead of sleeping a fixed time: network idle
+    (bounded) and web fonts, then two animation frames so layout is painted.
+    """
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+    except Exception:
+        # Long-polling/analytics pages never go idle; render what we have
+        pass
+    await page.evaluate(
+        "() => (document.fonts ? document.fonts.ready : Promise.resolve())"
+        ".then(() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r))))"
+    )
+
+
+# Global browser pool instance
+_browser_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Get or create the process-wide browser pool (browsers launch on start()).
+
+    Returns:
+        BrowserPool instance
+    """
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(
+            browsers=settings.browser_pool_size,
+            pages_per_browser=settings.browser_pages_per_browser,
+            blocked_resource_types=settings.browser_blocked_resource_types,
+        )
+    return _browser_pool
@@ -0,0 +1,368 @@
+"""
+Shared Cache Layer
+Pluggable TTL cache used by the API-backed services (SERP, suggestions, backlinks,
+domain intelligence) so repeat queries survive per-request service instances.
+
+Backends:
+- InMemoryCache: process-local LRU with per-entry TTL (default, also used in tests)
+- RedisCache: shared across workers when settings.redis_url is configured
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Generic, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import TypeAdapter
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+KEY_PREFIX = "seo_suite"
+
+
+class CacheStats:
+    """Hit/miss counters per cache namespace"""
+
+    def __init__(self):
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def snapshot(self) -> Dict[str, Any]:
+        namespaces = sorted(set(self.hits) | set(self.misses) | set(self.errors))
+        result = {}
+        for ns in namespaces:
+            hits, misses = self.hits.get(ns, 0), self.misses.get(ns, 0)
+            total = hits + misses
+            result[ns] = {
+                "hits": hits,
+                "misses": misses,
+                "errors": self.errors.get(ns, 0),
+                "hit_rate": round(hits / total, 3) if total else 0.0,
+            }
+        return result
+
+
+class CacheBackend(ABC):
+    """Base class for byte-oriented cache backends"""
+
+    name = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        ...
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        ...
+
+    async def aclose(self) -> None:
+        pass
+
+    def size(self) -> Optional[int]:
+        return None
+
+    def size_bytes(self) -> Optional[int]:
+        return None
+
+
+class InMemoryCache(CacheBackend):
+    """
+    Process-local LRU cache with a TTL per entry.
+    Also serves as the in-memory stand-in for Redis in tests.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        # Large values (LLM responses, page payloads) are bounded by size, not just count
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self._bytes -= len(value)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.delete(key)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._bytes += len(value)
+        while len(self._data) > self.max_entries or (
+            self.max_bytes and self._bytes > self.max_bytes and len(self._data) > 1
+        ):
+            _, (_, evicted) = self._data.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    async def delete(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    async def clear(self) -> None:
+        self._data.clear()
+        self._bytes = 0
+
+    def size(self) -> Optional[int]:
+        return len(self._data)
+
+    def size_bytes(self) -> Optional[int]:
+        return self._bytes
+
+
+class RedisCache(CacheBackend):
+    """Redis-backed cache shared by every worker process"""
+
+    name = "redis"
+
+    def __init__(self, client: Any):
+        # Accepts any redis.asyncio-compatible client (including fakeredis)
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCache":
+        import redis.asyncio as redis
+
+        return cls(redis.from_url(url))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.client.set(key, value, ex=ttl)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return await self.client.mget(keys)
+
+    async def set_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        # One round trip instead of one per key
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, value, ex=ttl)
+            await pipe.execute()
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=f"{KEY_PREFIX}:*"):
+            await self.client.delete(key)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class TypedCache(Generic[T]):
+    """
+    Namespaced view over a CacheBackend that stores Pydantic-serializable values.
+    Values are stored as JSON, so callers always receive a fresh copy.
+    Backend errors are logged and treated as misses - caching never fails a request.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        namespace: str,
+        value_type: Type[T],
+        ttl: int,
+        stats: CacheStats,
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stats = stats
+        self._adapter = TypeAdapter(value_type)
+
+    def _key(self, key: str) -> str:
+        return f"{KEY_PREFIX}:{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[T]:
+        try:
+            raw = await self.backend.get(self._key(key))
+        except Exception as e:
+            logger.warning(f"Cache get failed ({self.namespace}): {e}")
+            self.stats.errors[self.namespace] += 1
+            raw = None
+
+        if raw is None:
+            self.stats.misses[self.namespace] += 1
+            return None
+
+        try:
+            value = self._adapter.validate_json(raw)
+        except Exception as e:
+            logger.warning(f"Discarding undecodable cache entry ({self.namespace}): {e}")
+            self.stats.errors[self.namespace] += 1
+            self.stats.misses[self.namespace] += 1
+            return None
+
+        self.stats.hits[self.namespace] += 1
+        return value
+
+    async def set(self, key: str, value: T, ttl: Optional[int] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            # A TTL of 0 means "don't cache"
+            return
+        try:
+            await self.backend.set(self._key(key), self._adapter.dump_json(value), ttl)
+        except Exception as e:
+            logger.warning(f"Cache set failed ({self.namespace}): {e}")
+            self.stats.errors[self.namespace] += 1
+
+    async def get_many(self, keys: List[str]) -> Dict[str, T]:
+        """Look up several keys at once; only hits are returned"""
+        try:
+            raws = await self.backend.get_many([self._key(key) for key in keys])
+        except Exception as e:
+            logger.warning(f"Cache get_many failed ({self.namespace}): {e}")
+            self.stats.errors[self.namespace] += 1
+            raws = [None] * len(keys)
+
+        values: Dict[str, T] = {}
+        for key, raw in zip(keys, raws):
+            if raw is None:
+                continue
+            try:
+                values[key] = self._adapter.validate_json(raw)
+            except Exception as e:
+                logger.warning(f"Discarding undecodable cache entry ({self.namespace}): {e}")
+                self.stats.errors[self.namespace] += 1
+        self.stats.hits[self.namespace] += len(values)
+        self.stats.misses[self.namespace] += len(keys) - len(values)
+        return values
+
+    async def set_many(self, items: Dict[str, T], ttl: Optional[int] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if not items or ttl <= 0:
+            return
+        try:
+            await self.backend.set_many(
+                {self._key(key): self._adapter.dump_json(value) for key, value in items.items()},
+                ttl,
+            )
+        except Exception as e:
+            logger.warning(f"Cache set_many failed ({self.namespace}): {e}")
+            self.stats.errors[self.namespace] += 1
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.backend.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"Cache delete failed ({self.namespace}): {e}")
+
+
+class CacheManager:
+    """Owns the configured backend and hands out typed, namespaced caches"""
+
+    def __init__(self, backend: CacheBackend, default_ttl: int):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self._namespaces: Dict[str, TypedCache] = {}
+        self._value_types: Dict[str, Any] = {}
+
+    def namespace(
+        self, name: str, value_type: Type[T], ttl: Optional[int] = None
+    ) -> TypedCache[T]:
+        """
+        Get the typed cache for a namespace.
+
+        Raises:
+            ValueError: If the namespace already exists with a different value type or TTL
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        # Reuse the TypedCache (and its TypeAdapter) across per-request service instances
+        cache = self._namespaces.get(name)
+        if cache is None:
+            cache = TypedCache(self.backend, name, value_type, ttl, self.stats)
+            self._namespaces[name] = cache
+            self._value_types[name] = value_type
+        elif self._value_types[name] != value_type or cache.ttl != ttl:
+            raise ValueError(
+                f"Cache namespace '{name}' already registered with "
+                f"{self._value_types[name]!r} (ttl={cache.ttl}), got {value_type!r} (ttl={ttl})"
+            )
+        return cache
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "default_ttl_seconds": self.default_ttl,
+            "entries": self.backend.size(),
+            "bytes": self.backend.size_bytes(),
+            "namespaces": self.stats.snapshot(),
+        }
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
+
+
+def _create_backend() -> CacheBackend:
+    """Pick Redis when configured and importable, otherwise the in-memory LRU"""
+    if settings.redis_url:
+        try:
+            backend = RedisCache.from_url(settings.redis_url)
+            logger.info("Using Redis cache backend")
+            return backend
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is not installed. Using in-memory cache.")
+        except Exception as e:
+            logger.warning(f"Could not connect Redis cache ({e}). Using in-memory cache.")
+    return InMemoryCache(
+        max_entries=settings.cache_max_entries, max_bytes=settings.cache_max_bytes
+    )
+
+
+# Global cache manager instance
+_cache_manager: Optional[CacheManager] = None
+
+
+def get_cache_manager() -> CacheManager:
+    """
+    Get or create the process-wide cache manager.
+
+    Returns:
+        CacheManager instance
+    """
+    global _cache_manager
+    if _cache_manager is None:
+        _cache_manager = CacheManager(_create_backend(), settings.cache_ttl_seconds)
+    return _cache_manager
+
+
+def set_cache_manager(manager: Optional[CacheManager]) -> None:
+    """Swap the global cache manager (e.g. an InMemoryCache-backed one in tests)"""
+    global _cache_manager
+    _cache_manager = manager
@@ -0,0 +1,300 @@
+"""
+Shared HTTP Client Registry
+Process-wide pooled HTTP clients (httpx + aiohttp) reused by every service.
+Created lazily on first use and closed in the FastAPI app lifespan.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+import aiohttp
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that releases its per-host slot once closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps the pooled httpx transport with a per-host concurrency limit
+    and connection/request counters fed from httpcore trace events.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int, stats: "PoolStats"):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._stats = stats
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self._max_per_host)
+        return self._semaphores[host]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        semaphore = self._semaphore(host)
+        await semaphore.acquire()
+        self._stats.request_started(host)
+
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self._stats.request_finished(host)
+                semaphore.release()
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            if event_name == "connection.connect_tcp.complete":
+                self._stats.connection_opened(host)
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._stats.request_failed(host)
+            release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class PoolStats:
+    """Per-host request and connection counters shared by all pooled clients"""
+
+    def __init__(self):
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.failures: Dict[str, int] = defaultdict(int)
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.connections_opened: Dict[str, int] = defaultdict(int)
+
+    def request_started(self, host: str):
+        self.requests[host] += 1
+        self.in_flight[host] += 1
+
+    def request_finished(self, host: str):
+        self.in_flight[host] -= 1
+
+    def request_failed(self, host: str):
+        self.failures[host] += 1
+
+    def connection_opened(self, host: str):
+        self.connections_opened[host] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        total_requests = sum(self.requests.values())
+        total_connections = sum(self.connections_opened.values())
+        reused = max(0, total_requests - total_connections)
+        return {
+            "total_requests": total_requests,
+            "total_connections_opened": total_connections,
+            "connection_reuse_ratio": round(reused / total_requests, 3) if total_requests else 0.0,
+            "hosts": {
+                host: {
+                    "requests": self.requests[host],
+                    "failures": self.failures.get(host, 0),
+                    "in_flight": self.in_flight.get(host, 0),
+                    "connections_opened": self.connections_opened.get(host, 0),
+                }
+                for host in sorted(self.requests)
+            },
+        }
+
+
+class HTTPClientRegistry:
+    """
+    Registry of long-lived HTTP clients.
+
+    - httpx clients are keyed by name ("default" verifies TLS, "audit" does not,
+      since technical audits must still work on sites with broken certificates).
+    - a single aiohttp session serves the API integrations (SERP, DataForSEO, etc.).
+
+    All clients share per-host connection limits, keep-alive pooling and metrics.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 200,
+        max_connections_per_host: int = 20,
+        keepalive_expiry: float = 30.0,
+        dns_cache_ttl: int = 300,
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_expiry = keepalive_expiry
+        self.dns_cache_ttl = dns_cache_ttl
+        self.stats = PoolStats()
+        self._httpx_clients: Dict[str, httpx.AsyncClient] = {}
+        self._aiohttp_session: Optional[aiohttp.ClientSession] = None
+
+    def httpx_client(self, name: str = "default", verify: bool = True) -> httpx.AsyncClient:
+        """Get (or lazily create) a pooled httpx client"""
+        client = self._httpx_clients.get(name)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            )
+            transport = httpx.AsyncHTTPTransport(
+                verify=verify, http2=HTTP2_AVAILABLE, limits=limits, retries=1
+            )
+            client = httpx.AsyncClient(
+                transport=_HostLimitedTransport(
+                    transport, self.max_connections_per_host, self.stats
+                ),
+                verify=verify,
+                timeout=httpx.Timeout(30.0),
+            )
+            self._httpx_clients[name] = client
+            logger.info(f"Created pooled httpx client '{name}' (http2={HTTP2_AVAILABLE})")
+        return client
+
+    def aiohttp_session(self) -> aiohttp.ClientSession:
+        """Get (or lazily create) the pooled aiohttp session. Must be called inside the event loop."""
+        if self._aiohttp_session is None or self._aiohttp_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_expiry,
+            )
+            self._aiohttp_session = aiohttp.ClientSession(
+                connector=connector, trace_configs=[self._aiohttp_trace_config()]
+            )
+            logger.info("Created pooled aiohttp session")
+        return self._aiohttp_session
+
+    def _aiohttp_trace_config(self) -> aiohttp.TraceConfig:
+        """Feed aiohttp request/connection events into the shared stats"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            ctx.host = params.url.host or ""
+            self.stats.request_started(ctx.host)
+
+        async def on_request_end(session, ctx, params):
+            self.stats.request_finished(ctx.host)
+
+        async def on_request_exception(session, ctx, params):
+            self.stats.request_failed(ctx.host)
+            self.stats.request_finished(ctx.host)
+
+        async def on_connection_create_end(session, ctx, params):
+            self.stats.connection_opened(getattr(ctx, "host", ""))
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        return trace_config
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool metrics for the /metrics endpoint"""
+        return {
+            "http2_enabled": HTTP2_AVAILABLE,
+            "max_connections": self.max_connections,
+            "max_connections_per_host": self.max_connections_per_host,
+            "httpx_clients": sorted(self._httpx_clients),
+            "aiohttp_session_open": bool(
+                self._aiohttp_session and not self._aiohttp_session.closed
+            ),
+            **self.stats.snapshot(),
+        }
+
+    async def aclose(self):
+        """Close every pooled client (called on app shutdown)"""
+        for name, client in self._httpx_clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing httpx client '{name}': {e}")
+        self._httpx_clients.clear()
+
+        if self._aiohttp_session and not self._aiohttp_session.closed:
+            await self._aiohttp_session.close()
+        self._aiohttp_session = None
+
+
+class PooledSessionMixin:
+    """
+    Async context manager for services that call APIs through the pooled aiohttp
+    session. The service must set `self.http_clients` (an HTTPClientRegistry).
+
+    `session` always resolves to the shared session instead of per-request state,
+    so a call shared through single-flight keeps working after the request that
+    started it has exited (or been cancelled).
+    """
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return self.http_clients.aiohttp_session()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # The pooled session is closed in the app lifespan, not per request
+        pass
+
+
+# Global registry instance
+_http_client_registry: Optional[HTTPClientRegistry] = None
+
+
+def get_http_client_registry() -> HTTPClientRegistry:
+    """
+    Get or create the process-wide HTTP client registry.
+
+    Returns:
+        HTTPClientRegistry instance
+    """
+    global _http_client_registry
+    if _http_client_registry is None:
+        _http_client_registry = HTTPClientRegistry(
+            max_connections=settings.http_max_connections,
+            max_connections_per_host=settings.http_max_connections_per_host,
+            keepalive_expiry=settings.http_keepalive_expiry,
+            dns_cache_ttl=settings.http_dns_cache_ttl,
+        )
+    return _http_client_registry
@@ -0,0 +1,83 @@
+"""
+Shared LLM Client Registry
+Process-wide Gemini chat clients, one per (model, temperature). Building a
+ChatGoogleGenerativeAI client validates settings and creates a new google-genai
+client with its own connection pool (~90 ms), so clients are created lazily on
+first use, reused by every request and closed in the FastAPI app lifespan.
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMClientRegistry:
+    """
+    Registry of long-lived chat model clients keyed by (model, temperature).
+
+    Usage:
+        llm = get_llm_client_registry().chat_model(temperature=0.3)
+    """
+
+    def __init__(self, api_key: Optional[str], default_model: str):
+        self.api_key = api_key
+        self.default_model = default_model
+        self._clients: Dict[Tuple[str, float], Any] = {}
+
+    def chat_model(self, temperature: float, model: Optional[str] = None):
+        """Get (or lazily create) the shared client for a model and temperature"""
+        key = (model or self.default_model, float(temperature))
+        client = self._clients.get(key)
+        if client is None:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            client = ChatGoogleGenerativeAI(
+                model=key[0],
+                google_api_key=self.api_key,
+                temperature=key[1],
+                max_retries=0,  # the LLM gateway owns retries and backoff
+            )
+            self._clients[key] = client
+            logger.info(f"Created shared LLM client {key[0]} (temperature={key[1]})")
+        return client
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "clients": [f"{model}@{temperature}" for model, temperature in sorted(self._clients)],
+        }
+
+    async def aclose(self) -> None:
+        """Close the underlying google-genai clients (called on app shutdown)"""
+        for key, chat_model in self._clients.items():
+            client = getattr(chat_model, "client", None)
+            if client is None:
+                continue
+            try:
+                await client.aio.aclose()
+                client.close()
+            except Exception as e:
+                logger.warning(f"Error closing LLM client {key}: {e}")
+        self._clients.clear()
+
+
+# Global registry instance
+_llm_client_registry: Optional[LLMClientRegistry] = None
+
+
+def get_llm_client_registry() -> LLMClientRegistry:
+    """
+    Get or create the process-wide LLM client registry.
+
+    Returns:
+        LLMClientRegistry instance
+    """
+    global _llm_client_registry
+    if _llm_client_registry is None:
+        _llm_client_registry = LLMClientRegistry(
+            api_key=settings.gemini_api_key,
+            default_model=settings.gemini_model,
+        )
+    return _llm_client_registry
@@ -0,0 +1,476 @@
+"""
+LLM Gateway
+Single choke point for every LLM call in the process. Calls use LangChain's native
+async API (ainvoke) instead of a blocking invoke in the default thread pool, and
+the gateway enforces:
+
+- a process-wide cap on in-flight requests (backpressure instead of an unbounded
+  executor queue),
+- a rolling 60 s requests-per-minute and tokens-per-minute budget, so bursts wait
+  locally rather than being rejected upstream with 429s,
+- retries with jittered exponential backoff for rate-limit, server and timeout errors,
+
+and records per-prompt call counts, latency and token usage for /metrics.
+
+Responses are cached content-addressed: the key is a hash of the model, its
+temperature, the prompt template and the rendered variables (or the message list
+for bare chat models), so identical prompts are answered from the shared cache
+backend without touching the provider, and concurrent identical prompts share one
+in-flight call. Callers can opt out per call.
+
+Any LangChain Runnable works (prompt | llm chains, chat models, fake chat models
+in tests). astream() yields text as the model produces it, under the same limits.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.runnables import RunnableSequence
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from config import settings
+from utils.cache import get_cache_manager
+from utils.single_flight import get_single_flight
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying (rate limited / transient server errors)
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Provider error strings that carry the same meaning when no status code is exposed
+RETRYABLE_MARKERS = ("429", "RESOURCE_EXHAUSTED", "UNAVAILABLE", "DEADLINE_EXCEEDED", "rate limit")
+
+# Rough characters-per-token ratio used to reserve budget before the call
+CHARS_PER_TOKEN = 4
+
+
+def is_retryable_llm_error(error: BaseException) -> bool:
+    """Rate-limit (429), 5xx and timeout errors are retried; anything else fails fast"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    for attr in ("status_code", "code", "status"):
+        code = getattr(error, attr, None)
+        if isinstance(code, int):
+            return code in RETRYABLE_STATUS_CODES
+    response = getattr(error, "response", None)
+    if isinstance(getattr(response, "status_code", None), int):
+        return response.status_code in RETRYABLE_STATUS_CODES
+    message = str(error)
+    return any(marker.lower() in message.lower() for marker in RETRYABLE_MARKERS)
+
+
+def _message_fingerprint(messages: Any) -> Any:
+    if isinstance(messages, list):
+        return [
+            {"type": getattr(m, "type", None), "content": getattr(m, "content", m)}
+            for m in messages
+        ]
+    return messages
+
+
+def llm_cache_key(runnable, payload: Any) -> Optional[str]:
+    """
+    Content address of an LLM call: model, temperature, prompt template and
+    rendered variables. Returns None for runnables whose output can't be keyed
+    (anything other than a chat model or a two-step prompt | chat model chain).
+    """
+    if isinstance(runnable, RunnableSequence) and len(runnable.steps) == 2:
+        prompt, model = runnable.steps
+        template = getattr(prompt, "template", None)
+        if template is None:
+            template = repr(prompt)
+        content = {"template": template, "variables": payload}
+    elif isinstance(runnable, BaseChatModel):
+        model = runnable
+        content = {"messages": _message_fingerprint(payload)}
+    else:
+        return None
+    if not isinstance(model, BaseChatModel):
+        return None
+
+    content.update(
+        model_class=type(model).__name__,
+        model=getattr(model, "model", None) or getattr(model, "model_name", None),
+        temperature=getattr(model, "temperature", None),
+    )
+    encoded = json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def estimate_tokens(payload: Any) -> int:
+    """Cheap prompt-size estimate used to reserve token budget before a call"""
+    if isinstance(payload, dict):
+        text = " ".join(str(value) for value in payload.values())
+    elif isinstance(payload, list):
+        text = " ".join(str(getattr(item, "content", item)) for item in payload)
+    else:
+        text = str(payload)
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class _RateBudget:
+    """Rolling one-minute window of request and token spend"""
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        # [timestamp, tokens] per request; tokens are corrected once usage is known
+        self._entries: Deque[List[float]] = deque()
+
+    def _expire(self, now: float) -> None:
+        while self._entries and now - self._entries[0][0] >= self.WINDOW_SECONDS:
+            self._entries.popleft()
+
+    def _fits(self, tokens: int) -> bool:
+        if self.requests_per_minute and len(self._entries) >= self.requests_per_minute:
+            return False
+        if self.tokens_per_minute and self._entries:
+            spent = sum(entry[1] for entry in self._entries)
+            # A single oversized request is let through once the window is empty
+            return spent + tokens <= self.tokens_per_minute
+        return True
+
+    async def acquire(self, tokens: int) -> List[float]:
+        """Wait until the request fits the budget, then record it"""
+        while True:
+            # Check and record run without an await in between, so they can't interleave
+            now = time.monotonic()
+            self._expire(now)
+            if self._fits(tokens):
+                entry = [now, float(tokens)]
+                self._entries.append(entry)
+                return entry
+            # The oldest entry leaving the window is the earliest anything can change
+            await asyncio.sleep(max(0.01, self.WINDOW_SECONDS - (now - self._entries[0][0])))
+
+    def usage(self) -> Dict[str, float]:
+        self._expire(time.monotonic())
+        return {
+            "requests_last_minute": len(self._entries),
+            "tokens_last_minute": int(sum(entry[1] for entry in self._entries)),
+        }
+
+
+class _PromptStats:
+    """Counters for one prompt name"""
+
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.retries = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record_latency(self, elapsed: float) -> None:
+        self.calls += 1
+        self.total_latency += elapsed
+        self.max_latency = max(self.max_latency, elapsed)
+
+    def record_usage(self, response: Any) -> None:
+        usage = getattr(response, "usage_metadata", None) or {}
+        self.input_tokens += usage.get("input_tokens", 0)
+        self.output_tokens += usage.get("output_tokens", 0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "errors": self.errors,
+            "retries": self.retries,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "avg_latency_ms": round(1000 * self.total_latency / self.calls, 1) if self.calls else 0.0,
+            "max_latency_ms": round(1000 * self.max_latency, 1),
+        }
+
+
+class LLMGateway:
+    """
+    Process-wide limiter, retry policy and metrics for LLM calls.
+
+    Usage:
+        response = await get_llm_gateway().ainvoke(
+            PROMPT | llm, {"keywords": text}, prompt_name="intent_classification"
+        )
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_attempts: int = 4,
+        timeout_seconds: Optional[float] = None,
+        cache_ttl: Optional[int] = None,
+    ):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_attempts = max(1, max_attempts)
+        self.timeout_seconds = timeout_seconds or None
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._budget = _RateBudget(requests_per_minute, tokens_per_minute)
+        self._stats: Dict[str, _PromptStats] = {}
+        # cache_ttl=0 disables the response cache entirely
+        self.cache = (
+            get_cache_manager().namespace("llm_response", AIMessage, cache_ttl)
+            if cache_ttl != 0
+            else None
+        )
+        self._in_flight = 0
+        self._waiting = 0
+
+    async def ainvoke(
+        self,
+        runnable,
+        payload: Any,
+        prompt_name: str = "default",
+        use_cache: bool = True,
+        **kwargs,
+    ) -> Any:
+        """
+        Invoke a LangChain runnable through the limiter, with retries.
+
+        Args:
+            runnable: Chat model or chain (anything with ainvoke)
+            payload: Prompt variables or message list
+            prompt_name: Label the call is reported under in metrics
+            use_cache: Serve and store the response in the LLM response cache
+
+        Returns:
+            The runnable's output (an AIMessage for chat models)
+        """
+        stats = self._stats.setdefault(prompt_name, _PromptStats())
+
+        cache_key = llm_cache_key(runnable, payload) if use_cache and self.cache else None
+        if cache_key:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                stats.cache_hits += 1
+                return cached
+            # Identical prompts already running share that call's response
+            return await get_single_flight().do(
+                "llm_response",
+                cache_key,
+                lambda: self._invoke(runnable, payload, stats, prompt_name, cache_key, **kwargs),
+            )
+
+        return await self._invoke(runnable, payload, stats, prompt_name, None, **kwargs)
+
+    async def _invoke(
+        self,
+        runnable,
+        payload: Any,
+        stats: _PromptStats,
+        prompt_name: str,
+        cache_key: Optional[str],
+        **kwargs,
+    ) -> Any:
+        """Call the runnable with retries and store a cacheable response"""
+        estimated_tokens = estimate_tokens(payload)
+        start = time.perf_counter()
+        try:
+            async for attempt in self._retrying():
+                with attempt:
+                    self._note_retry(attempt, stats, prompt_name)
+                    response = await self._call(runnable, payload, estimated_tokens, **kwargs)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.record_latency(time.perf_counter() - start)
+
+        stats.record_usage(response)
+        if cache_key and isinstance(response, AIMessage):
+            await self.cache.set(cache_key, response)
+        return response
+
+    async def astream(
+        self,
+        runnable,
+        payload: Any,
+        prompt_name: str = "default",
+        use_cache: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a LangChain runnable's text output through the limiter.
+
+        Failures before the first chunk are retried like ainvoke - each attempt
+        takes its own in-flight slot and rate-budget entry, and none is held during
+        backoff. Once text has been yielded a failure is raised to the caller. Every
+        chunk is subject to the gateway timeout. The assembled response is cached,
+        and a cache hit is yielded as a single chunk.
+
+        Args:
+            runnable: Chat model or chain (anything with astream)
+            payload: Prompt variables or message list
+            prompt_name: Label the call is reported under in metrics
+            use_cache: Serve and store the response in the LLM response cache
+
+        Yields:
+            Text chunks as the model produces them
+        """
+        stats = self._stats.setdefault(prompt_name, _PromptStats())
+
+        cache_key = llm_cache_key(runnable, payload) if use_cache and self.cache else None
+        if cache_key:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                stats.cache_hits += 1
+                yield cached.text
+                return
+
+        estimated_tokens = estimate_tokens(payload)
+        start = time.perf_counter()
+        message: Optional[AIMessageChunk] = None
+        # Slot and stream of the attempt that produced the first chunk
+        held: Optional[AsyncExitStack] = None
+        try:
+            async for attempt in self._retrying():
+                with attempt:
+                    self._note_retry(attempt, stats, prompt_name)
+                    resources = AsyncExitStack()
+                    try:
+                        entry = await resources.enter_async_context(self._slot(estimated_tokens))
+                        stream = runnable.astream(payload, **kwargs).__aiter__()
+                        resources.push_async_callback(self._close_stream, stream)
+                        # Errors before the first chunk (rate limits, 5xx) are retried
+                        chunk = await asyncio.wait_for(anext(stream, None), self.timeout_seconds)
+                    except BaseException:
+                        # Close the failed stream and free its slot before backing off
+                        await resources.aclose()
+                        raise
+                    held = resources
+
+            while chunk is not None:
+                message = chunk if message is None else message + chunk
+                text = chunk.text if isinstance(chunk, AIMessageChunk) else str(chunk)
+                if text:
+                    yield text
+                chunk = await asyncio.wait_for(anext(stream, None), self.timeout_seconds)
+
+            usage = getattr(message, "usage_metadata", None) or {}
+            if usage.get("total_tokens"):
+                entry[1] = float(usage["total_tokens"])
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.record_latency(time.perf_counter() - start)
+            if held is not None:
+                await held.aclose()
+
+        if message is None:
+            return
+        stats.record_usage(message)
+        if cache_key and isinstance(message, AIMessageChunk):
+            await self.cache.set(
+                cache_key,
+                AIMessage(
+                    content=message.content,
+                    response_metadata=message.response_metadata,
+                    usage_metadata=message.usage_metadata,
+                ),
+            )
+
+    @staticmethod
+    async def _close_stream(stream) -> None:
+        if hasattr(stream, "aclose"):
+            await stream.aclose()
+
+    def _retrying(self) -> AsyncRetrying:
+        return AsyncRetrying(
+            retry=retry_if_exception(is_retryable_llm_error),
+            wait=wait_random_exponential(multiplier=1, max=30),
+            stop=stop_after_attempt(self.max_attempts),
+            reraise=True,
+        )
+
+    def _note_retry(self, attempt, stats: "_PromptStats", prompt_name: str) -> None:
+        if attempt.retry_state.attempt_number > 1:
+            stats.retries += 1
+            logger.warning(
+                f"Retrying LLM call '{prompt_name}' "
+                f"(attempt {attempt.retry_state.attempt_number}/{self.max_attempts})"
+            )
+
+    @asynccontextmanager
+    async def _slot(self, estimated_tokens: int) -> AsyncIterator[List[float]]:
+        """Hold a rate-budget entry and an in-flight slot for one request"""
+        self._waiting += 1
+        try:
+            # Wait out the budget first so a rate-limited request doesn't sit on a slot
+            entry = await self._budget.acquire(estimated_tokens)
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._in_flight += 1
+        try:
+            yield entry
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    async def _call(self, runnable, payload: Any, estimated_tokens: int, **kwargs) -> Any:
+        async with self._slot(estimated_tokens) as entry:
+            response = await asyncio.wait_for(
+                runnable.ainvoke(payload, **kwargs), self.timeout_seconds
+            )
+            usage = getattr(response, "usage_metadata", None) or {}
+            if usage.get("total_tokens"):
+                # Replace the estimate with what the provider actually counted
+                entry[1] = float(usage["total_tokens"])
+            return response
+
+    def metrics(self) -> Dict[str, Any]:
+        hits = sum(stats.cache_hits for stats in self._stats.values())
+        lookups = hits + sum(stats.calls for stats in self._stats.values())
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            **self._budget.usage(),
+            "cache_enabled": self.cache is not None,
+            "cache_hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "prompts": {name: stats.as_dict() for name, stats in self._stats.items()},
+        }
+
+
+# Global gateway instance (the limits are process-wide)
+_llm_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """
+    Get or create the process-wide LLM gateway.
+
+    Returns:
+        LLMGateway instance
+    """
+    global _llm_gateway
+    if _llm_gateway is None:
+        _llm_gateway = LLMGateway(
+            max_in_flight=settings.llm_max_in_flight,
+            requests_per_minute=settings.llm_requests_per_minute,
+            tokens_per_minute=settings.llm_tokens_per_minute,
+            max_attempts=settings.llm_max_attempts,
+            timeout_seconds=settings.llm_timeout_seconds,
+            cache_ttl=settings.llm_cache_ttl_seconds,
+        )
+    return _llm_gateway
@@ -0,0 +1,86 @@
+"""
+Shared Process Pool
+CPU-bound work (HTML parsing, audit rule evaluation) runs here instead of on the
+event loop, so one large page no longer stalls every other in-flight request and
+a single uvicorn worker can use several cores.
+
+Functions submitted to the pool must be picklable (module-level functions,
+static methods or bound methods of picklable objects) and should return compact
+results such as dataclasses or pydantic models - never parser trees.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _pool_size() -> int:
+    workers = settings.process_pool_workers
+    if workers is None:
+        return os.cpu_count() or 1
+    return workers
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get or create the process-wide executor.
+
+    Returns:
+        ProcessPoolExecutor, or None when process_pool_workers is 0 (run inline)
+    """
+    global _process_pool
+    size = _pool_size()
+    if size <= 0:
+        return None
+    if _process_pool is None:
+        # The pool starts lazily, after threads (to_thread, the Google Ads executor,
+        # Playwright) exist; forking then can copy a held lock into the child and
+        # deadlock it, so workers come from a clean forkserver process instead
+        _process_pool = ProcessPoolExecutor(
+            max_workers=size, mp_context=multiprocessing.get_context("forkserver")
+        )
+        logger.info(f"Started process pool with {size} workers")
+    return _process_pool
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run func(*args) in the process pool and await the result.
+
+    Falls back to calling func inline when the pool is disabled.
+    """
+    global _process_pool
+    pool = get_process_pool()
+    if pool is None:
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a huge page); start a fresh pool for later calls
+        logger.error("Process pool broken, recreating it")
+        if _process_pool is pool:
+            _process_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+def shutdown_process_pool() -> None:
+    """Stop the worker processes (called on application shutdown)"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
@@ -1,33 +1,21 @@
-import asyncio
 import io
 from PIL import Image
-from playwright.async_api import async_playwright
+from utils.browser_pool import get_browser_pool, wait_until_settled
 
 async def capture_screenshot(url: str) -> Image.Image:
     """
     Captures a screenshot of a website and returns it as a PIL Image.
+    Uses a page from the shared browser pool (standard 1280x800 desktop viewport).
     """
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True,
-    args=[
-        "--no-sandbox",
-        "--disable-setuid-sandbox",
-        "--disable-dev-shm-usage"
-    ])
-        # Set a standard desktop viewport
-        page = await browser.new_page(viewport={"width": 1280, "height": 800})
+    async with get_browser_pool().page() as page:
+        await page.goto(url, wait_until="load", timeout=30000)
+        # Wait for network, fonts and paint to settle
+        await wait_until_settled(page)
         
-        try:
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            # Wait a bit for any animations to settle
-            await asyncio.sleep(2)
-            
-            screenshot_bytes = await page.screenshot(full_page=False)
-            image = Image.open(io.BytesIO(screenshot_bytes))
-            
-            return image
-        finally:
-            await browser.close()
+        screenshot_bytes = await page.screenshot(full_page=False)
+        image = Image.open(io.BytesIO(screenshot_bytes))
+        
+        return image
 
 async def get_website_screenshot(url: str) -> Image.Image:
     """
@@ -0,0 +1,86 @@
+"""
+Request Coalescing (single-flight)
+Concurrent lookups for the same key share one in-flight call instead of each
+hitting SerpAPI, DataForSEO or Gemini. The shared cache only helps once the first
+call has finished; this covers the window while it is still running.
+
+Keys are the services' existing cache keys, scoped by cache namespace.
+"""
+
+import asyncio
+import copy
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Process-wide group of in-flight calls keyed by (namespace, key).
+
+    Usage:
+        result = await get_single_flight().do("serp", cache_key, lambda: fetch())
+
+    The first caller (the leader) starts the call; callers arriving while it runs
+    await the same task and get the same outcome - every caller, the leader
+    included, gets its own deep copy of the result, so one caller mutating it (e.g.
+    flagging a response as cached) can't leak into another's. The task is shielded,
+    so a cancelled caller does not cancel the call for everyone else; func() must
+    therefore not depend on state the leader's request tears down.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "coalesced": 0}
+        )
+
+    async def do(self, namespace: str, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run func() once per key at a time and share its outcome with concurrent callers"""
+        flight_key = (namespace, key)
+        stats = self._stats[namespace]
+
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            stats["calls"] += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
+        else:
+            stats["coalesced"] += 1
+            logger.info(f"Coalesced {namespace} lookup for: {key}")
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def metrics(self) -> Dict[str, Any]:
+        namespaces = {}
+        for namespace, stats in self._stats.items():
+            total = stats["calls"] + stats["coalesced"]
+            namespaces[namespace] = {
+                **stats,
+                "coalesce_rate": round(stats["coalesced"] / total, 3) if total else 0.0,
+            }
+        return {
+            "in_flight": len(self._in_flight),
+            "namespaces": namespaces,
+        }
+
+
+# Global single-flight group
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Get or create the process-wide single-flight group.
+
+    Returns:
+        SingleFlight instance
+    """
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
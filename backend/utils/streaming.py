@@ -0,0 +1,56 @@
+"""
+Streaming Responses
+Shared encoding for endpoints that stream events as they become available, as
+newline-delimited JSON (application/x-ndjson) or server-sent events
+(text/event-stream). Every event is a dict with a "type" key.
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator, Dict
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+# Query-parameter pattern for endpoints that let the client pick the format
+STREAM_FORMAT_PATTERN = "^(ndjson|sse)$"
+
+
+def encode_event(event: Dict[str, Any], stream_format: str = "ndjson") -> str:
+    """Serialize one event (Pydantic models included) in the requested format"""
+    payload = json.dumps(jsonable_encoder(event))
+    if stream_format == "sse":
+        return f"event: {event['type']}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+def stream_events(
+    events: AsyncIterator[Dict[str, Any]], stream_format: str = "ndjson"
+) -> StreamingResponse:
+    """
+    Wrap an async iterator of events in a StreamingResponse.
+
+    A failure mid-stream can no longer change the status code, so it is reported
+    as a final `error` event instead.
+    """
+
+    async def body():
+        try:
+            async for event in events:
+                yield encode_event(event, stream_format)
+        except Exception as e:
+            logger.error(f"Event stream failed: {e}")
+            yield encode_event({"type": "error", "error": str(e)}, stream_format)
+
+    return StreamingResponse(
+        body(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        # Keep reverse proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,36 @@
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Link targets that are never HTML pages
+NON_HTML_EXTENSIONS = (
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".svg", ".ico",
+    ".pdf", ".zip", ".gz", ".rar", ".7z", ".exe", ".dmg",
+    ".mp3", ".mp4", ".avi", ".mov", ".webm", ".wav",
+    ".css", ".js", ".json", ".xml", ".txt", ".csv",
+    ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx",
+    ".woff", ".woff2", ".ttf", ".eot",
+)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for deduplication: lowercase scheme and host, drop default
+    ports and fragments, ensure a path and sort query parameters.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    port = parsed.port
+    netloc = host if port is None or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    path = parsed.path or "/"
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, netloc, path, parsed.params, query, ""))
+
+
+def is_html_candidate(url: str) -> bool:
+    """Whether a URL could be an HTML page worth crawling"""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https"):
+        return False
+    return not parsed.path.lower().endswith(NON_HTML_EXTENSIONS)